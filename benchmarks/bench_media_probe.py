@@ -0,0 +1,126 @@
+import os
+import sys
+import time
+import struct
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.media_probe import read_duration, ffprobe_duration, ffprobe_path
+
+# Benchmark da leitura de duração: cabeçalho lido em Python contra um ffprobe
+# por arquivo. O corpus é sintético (MP4 com moov no fim, MKV, AVI OpenDML),
+# com o conteúdo de vídeo substituído por bytes vazios; o ffprobe só é medido
+# se estiver instalado.
+# Uso: python benchmarks/bench_media_probe.py [arquivos_por_formato] [MB_por_arquivo]
+
+
+def mp4_box(box_type, payload):
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+
+def build_mp4(path, seconds, payload_size):
+    """MP4 sem faststart: ftyp, mdat e só depois moov/mvhd."""
+    timescale = 1000
+    mvhd = bytes(4) + struct.pack(">IIII", 0, 0, timescale, int(seconds * timescale)) + bytes(80)
+    with open(path, 'wb') as f:
+        f.write(mp4_box(b"ftyp", b"isom" + struct.pack(">I", 512) + b"isomiso2mp41"))
+        f.write(struct.pack(">I4s", 8 + payload_size, b"mdat"))
+        f.seek(payload_size, os.SEEK_CUR)
+        f.write(mp4_box(b"moov", mp4_box(b"mvhd", mvhd)))
+
+
+def ebml_size(size):
+    return bytes([0x08]) + size.to_bytes(4, "big") if size is not None else b"\x01\xff\xff\xff\xff\xff\xff\xff"
+
+
+def ebml_element(element_id, payload):
+    return element_id + ebml_size(len(payload)) + payload
+
+
+def build_mkv(path, seconds, payload_size):
+    """Matroska com segmento de tamanho desconhecido, SeekHead, Info e um Cluster."""
+    header = ebml_element(b"\x1a\x45\xdf\xa3", ebml_element(b"\x42\x82", b"matroska"))
+    info = ebml_element(b"\x15\x49\xa9\x66",
+                        ebml_element(b"\x2a\xd7\xb1", (1000000).to_bytes(3, "big"))
+                        + ebml_element(b"\x44\x89", struct.pack(">d", seconds * 1000)))
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.write(b"\x18\x53\x80\x67" + ebml_size(None))
+        f.write(ebml_element(b"\x11\x4d\x9b\x74", bytes(64)))
+        f.write(info)
+        f.write(b"\x1f\x43\xb6\x75" + ebml_size(payload_size))
+        f.seek(payload_size, os.SEEK_CUR)
+        f.truncate()
+
+
+def riff_chunk(chunk_id, payload):
+    return struct.pack("<4sI", chunk_id, len(payload)) + payload + bytes(len(payload) & 1)
+
+
+def riff_list(list_type, payload):
+    return riff_chunk(b"LIST", list_type + payload)
+
+
+def build_avi(path, seconds, payload_size):
+    """AVI OpenDML: o avih conta só o primeiro RIFF, o total fica no dmlh."""
+    frames = int(seconds * 25)
+    avih = struct.pack("<14I", 40000, 0, 0, 0, frames // 4, 0, 1, 0, 1920, 1080, 0, 0, 0, 0)
+    hdrl = riff_list(b"hdrl", riff_chunk(b"avih", avih)
+                     + riff_list(b"strl", riff_chunk(b"strh", bytes(56)))
+                     + riff_list(b"odml", riff_chunk(b"dmlh", struct.pack("<I", frames) + bytes(244))))
+    with open(path, 'wb') as f:
+        f.write(b"RIFF" + struct.pack("<I", 4 + len(hdrl) + 12 + payload_size) + b"AVI ")
+        f.write(hdrl)
+        f.write(b"LIST" + struct.pack("<I", 4 + payload_size) + b"movi")
+        f.seek(payload_size, os.SEEK_CUR)
+        f.truncate()
+
+
+BUILDERS = {".mp4": build_mp4, ".mkv": build_mkv, ".avi": build_avi}
+
+
+def build_corpus(folder, files_per_format, payload_size):
+    """Cria os arquivos e retorna [(caminho, duração esperada)]."""
+    corpus = []
+    for extension, builder in BUILDERS.items():
+        for index in range(files_per_format):
+            seconds = 3600 + index * 97.5
+            path = os.path.join(folder, f"filme_{index}{extension}")
+            builder(path, seconds, payload_size)
+            corpus.append((path, seconds))
+    return corpus
+
+
+def measure(function, corpus):
+    """Retorna (acertos, segundos por arquivo)."""
+    hits = 0
+    start = time.perf_counter()
+    for path, expected in corpus:
+        duration = function(path)
+        if duration is not None and abs(duration - expected) < 0.1:
+            hits += 1
+    return hits, (time.perf_counter() - start) / len(corpus)
+
+
+def main():
+    files_per_format = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    payload_size = int(float(sys.argv[2]) * 1024 * 1024) if len(sys.argv) > 2 else 8 * 1024 * 1024
+    folder = tempfile.mkdtemp(prefix="bench_media_probe_")
+    try:
+        corpus = build_corpus(folder, files_per_format, payload_size)
+        print(f"{len(corpus)} arquivos ({files_per_format} por formato, {payload_size // 1024 // 1024} MB cada)")
+        print(f"{'leitor':<12} {'acerto':>8} {'ms/arquivo':>12}")
+        readers = [("cabeçalho", read_duration)]
+        if ffprobe_path():
+            readers.append(("ffprobe", ffprobe_duration))
+        for name, function in readers:
+            hits, per_file = measure(function, corpus)
+            print(f"{name:<12} {hits / len(corpus):>8.0%} {per_file * 1e3:>12.3f}")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
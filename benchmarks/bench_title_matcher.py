@@ -0,0 +1,114 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.title_matcher import SCORERS
+
+# Benchmark dos pontuadores de título: acerto (o filme correto fica em primeiro
+# entre os candidatos) e vazão (comparações por segundo).
+# Uso: python benchmarks/bench_title_matcher.py [candidatos_por_busca]
+
+# (busca extraída do nome do arquivo, título traduzido, título original)
+LABELED = [
+    ("Clube dos Vandalos", "Clube dos Vândalos", "The Bikeriders"),
+    ("Interestelar", "Interestelar", "Interstellar"),
+    ("Interstelar", "Interestelar", "Interstellar"),
+    ("Planeta dos Macacos O Reinado", "Planeta dos Macacos: O Reinado", "Kingdom of the Planet of the Apes"),
+    ("Alien Romulus", "Alien: Romulus", "Alien: Romulus"),
+    ("Duna Parte Dois", "Duna: Parte Dois", "Dune: Part Two"),
+    ("Dune Part Two", "Duna: Parte Dois", "Dune: Part Two"),
+    ("Oppenheimer", "Oppenheimer", "Oppenheimer"),
+    ("Spider Man No Way Home", "Homem-Aranha: Sem Volta para Casa", "Spider-Man: No Way Home"),
+    ("Homem Aranha Sem Volta Para Casa", "Homem-Aranha: Sem Volta para Casa", "Spider-Man: No Way Home"),
+    ("Vingadores Ultimato", "Vingadores: Ultimato", "Avengers: Endgame"),
+    ("Avengers Endgame", "Vingadores: Ultimato", "Avengers: Endgame"),
+    ("O Poderoso Chefao", "O Poderoso Chefão", "The Godfather"),
+    ("Cidade de Deus", "Cidade de Deus", "Cidade de Deus"),
+    ("Tropa de Elite 2", "Tropa de Elite 2: O Inimigo Agora É Outro", "Tropa de Elite 2"),
+    ("Ainda Estou Aqui", "Ainda Estou Aqui", "Ainda Estou Aqui"),
+    ("Divertidamente 2", "Divertida Mente 2", "Inside Out 2"),
+    ("Deadpool e Wolverine", "Deadpool & Wolverine", "Deadpool & Wolverine"),
+    ("Gladiador II", "Gladiador II", "Gladiator II"),
+    ("Coringa Delirio a Dois", "Coringa: Delírio a Dois", "Joker: Folie à Deux"),
+    ("Senhor dos Aneis A Sociedade do Anel", "O Senhor dos Anéis: A Sociedade do Anel",
+     "The Lord of the Rings: The Fellowship of the Ring"),
+    ("Batman O Cavaleiro das Trevas", "Batman: O Cavaleiro das Trevas", "The Dark Knight"),
+    ("Matrix", "Matrix", "The Matrix"),
+    ("Matrix Reloaded", "Matrix Reloaded", "The Matrix Reloaded"),
+    ("Blade Runner 2049", "Blade Runner 2049", "Blade Runner 2049"),
+    ("Toy Story 3", "Toy Story 3", "Toy Story 3"),
+    ("O Auto da Compadecida", "O Auto da Compadecida", "O Auto da Compadecida"),
+    ("Parasita", "Parasita", "기생충"),
+    ("Pulp Fiction Tempo de Violencia", "Pulp Fiction: Tempo de Violência", "Pulp Fiction"),
+    ("Bastardos Inglorios", "Bastardos Inglórios", "Inglourious Basterds"),
+]
+
+# Títulos parecidos que competem com o correto na lista de resultados
+DISTRACTORS = [
+    "Matrix Revolutions", "The Matrix Resurrections", "Duna", "Dune", "Alien", "Aliens, O Resgate",
+    "Planeta dos Macacos: A Origem", "Planeta dos Macacos: A Guerra", "Toy Story", "Toy Story 2",
+    "Toy Story 4", "Tropa de Elite", "Divertida Mente", "Deadpool", "Deadpool 2", "Gladiador",
+    "Coringa", "Batman Begins", "Batman: O Cavaleiro das Trevas Ressurge", "Blade Runner, O Caçador de Andróides",
+    "O Poderoso Chefão: Parte II", "O Poderoso Chefão: Parte III", "Homem-Aranha: Longe de Casa",
+    "Homem-Aranha: De Volta ao Lar", "Vingadores: Guerra Infinita", "Os Vingadores",
+    "O Senhor dos Anéis: As Duas Torres", "O Senhor dos Anéis: O Retorno do Rei", "Cidade dos Homens",
+    "Interestelar: Os Bastidores", "O Auto da Compadecida 2", "Ainda Estou Aqui: Making Of",
+]
+
+
+def build_cases(candidates_per_query, seed=42):
+    """Monta as buscas com o filme correto no meio de candidatos embaralhados."""
+    rng = random.Random(seed)
+    cases = []
+    for query, title, original_title in LABELED:
+        expected = {"id": 0, "title": title, "original_title": original_title}
+        pool = [{"id": index + 1, "title": name, "original_title": name}
+                for index, name in enumerate(rng.sample(DISTRACTORS, min(candidates_per_query - 1, len(DISTRACTORS))))]
+        while len(pool) < candidates_per_query - 1:
+            other = rng.choice(LABELED)
+            suffix = " " + str(rng.randint(2, 9))
+            pool.append({"id": len(pool) + 1, "title": other[1] + suffix, "original_title": other[2] + suffix})
+        pool.append(expected)
+        rng.shuffle(pool)
+        cases.append((query, pool))
+    return cases
+
+
+def evaluate(scorer, cases):
+    """Retorna (acertos, comparações, segundos)."""
+    hits = 0
+    comparisons = 0
+    start = time.perf_counter()
+    for query, candidates in cases:
+        best = max(candidates, key=lambda movie: scorer.score_movie(query, movie))
+        comparisons += len(candidates)
+        if best["id"] == 0:
+            hits += 1
+    return hits, comparisons, time.perf_counter() - start
+
+
+def main():
+    candidates_per_query = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    cases = build_cases(candidates_per_query)
+    repeat = 20
+
+    print(f"{len(cases)} buscas x {candidates_per_query} candidatos x {repeat} repetições")
+    print(f"{'pontuador':<12} {'acerto':>8} {'µs/comparação':>15} {'comparações/s':>15}")
+    for name, scorer_class in SCORERS.items():
+        scorer = scorer_class()
+        hits, _, _ = evaluate(scorer, cases)
+        total_comparisons = 0
+        total_time = 0.0
+        for _ in range(repeat):
+            _, comparisons, elapsed = evaluate(scorer, cases)
+            total_comparisons += comparisons
+            total_time += elapsed
+        per_comparison = total_time / total_comparisons
+        print(f"{name:<12} {hits / len(cases):>8.0%} {per_comparison * 1e6:>15.1f} {1 / per_comparison:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
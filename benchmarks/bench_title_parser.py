@@ -0,0 +1,62 @@
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.title_parser import get_title_parser
+
+# Benchmark do parser de títulos contra a limpeza antiga por re.sub.
+# Uso: python benchmarks/bench_title_parser.py [arquivo_com_nomes.txt]
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "filenames.txt")
+
+
+def legacy_clean_movie_title(filename):
+    """Implementação anterior de BatchScanThread.clean_movie_title (referência)."""
+    name = os.path.splitext(filename)[0]
+    name = name.replace('.', ' ').replace('_', ' ').replace('-', ' ')
+    patterns = [
+        r'\b\d{4}\b',
+        r'\b(1080p|720p|480p|4K|UHD|HD|FHD)\b',
+        r'\b(BluRay|BRRip|WEBRip|HDTV|DVDRip|WEB-DL|HDRIP|WEB |DL|REPACK|-|JefePsb|CAMPRip|SF|Acesse|ORIGINAL|Dublagem|BKS|by|GmV|Pirate|Filmes|The|LAPUMiaAFiLMES|COM|By|jmsmarcelo|COMANDO LA|LA|LapumiaFilmes|TorrentDosFilmes|SE|NET|)\b',
+        r'\b(x264|x265|HEVC|XviD|h264|h265)\b',
+        r'\b(AAC|AC3|DTS|MP3|FLAC|DDP5.1|DDP|DD5.1|ÁUDIO|AUDIO|EAC3|6CH|CH|TDF|DL)\b',
+        r'\b(DUAL|DUBLADO|LEGENDADO|DUB|PT-BR|PT|BR|EN|ENG|PTBR)\b',
+        r'\b(5.1|7.1|2.0)\b',
+        r'\bwww\.[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b',
+        r'\b(EXTENDED|DIRECTORS.CUT|UNRATED|CAMPRip|Sem Cortes|JefePsb|REPACK|D4V1|D4VI|199991|REMASTERED|REMUX |SF|BLUDV|BY|LUAHARP|LuaHarper|JefPsB|LAPUMiA|CAMPRip|THEPIRATEFILMES|RICKSZ|COMANDOTORRENTS|WOLVERDONFILMES|NACIONAL|VERSAO|ESTENDIDA|STARCKFILMES|remasterizado|CAMPRip|VERSÃO|ToTTI9|jeffpsb|portugues|WWW|-)\b',
+        r'\[.*?\]|\(.*?\)',
+    ]
+    for pattern in patterns:
+        name = re.sub(pattern, '', name, flags=re.IGNORECASE)
+    return re.sub(r'\s+', ' ', name).strip()
+
+
+def load_corpus(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def main():
+    corpus = load_corpus(sys.argv[1] if len(sys.argv) > 1 else CORPUS_PATH)
+    parser = get_title_parser()
+    repeat = 200
+
+    legacy_time = timeit.timeit(lambda: [legacy_clean_movie_title(n) for n in corpus], number=repeat)
+    parser_time = timeit.timeit(lambda: [parser.parse(n) for n in corpus], number=repeat)
+    calls = repeat * len(corpus)
+
+    print(f"{len(corpus)} nomes x {repeat} repetições")
+    print(f"re.sub (antigo): {legacy_time / calls * 1e6:8.1f} µs/nome")
+    print(f"TitleParser:     {parser_time / calls * 1e6:8.1f} µs/nome")
+    print()
+    print(f"{'antigo':<40} | {'novo':<40} | ano")
+    for name in corpus:
+        info = parser.parse(name)
+        print(f"{legacy_clean_movie_title(name)[:40]:<40} | {info['title'][:40]:<40} | {info['year']}")
+
+
+if __name__ == "__main__":
+    main()
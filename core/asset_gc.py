@@ -0,0 +1,116 @@
+import os
+import time
+import threading
+
+from core.movie_assets import PREVIEW_CACHE_DIR
+
+# Coletor de imagens sem dono. Marca: as imagens em uso são as que têm
+# referência no AssetRegistry do MovieManager. Varredura: as pastas de imagens
+# são percorridas aos poucos, e cada arquivo sem referência é apagado. O
+# trabalho é feito em fatias com tempo máximo, com pausas entre elas, para
+# não disputar o disco com a interface.
+
+ASSET_DIRS = (
+    os.path.join("assets", "poster_images"),
+    os.path.join("assets", "backdrop_images"),
+    os.path.join("assets", "profile_images"),
+)
+
+# Arquivos mais novos que isso são poupados: podem ser imagens de um filme
+# que está sendo importado e ainda não entrou no catálogo
+MIN_AGE = 60 * 60
+
+
+class AssetCollector:
+    """
+    Varredura incremental das pastas de imagens.
+
+    Cada chamada a step() trabalha até o tempo limite e para onde estava; a
+    varredura continua na chamada seguinte. A pasta de pré-visualizações é
+    temporária, então tudo nela com mais de MIN_AGE é apagado.
+    """
+
+    def __init__(self, movie_manager, asset_dirs=ASSET_DIRS, preview_dir=PREVIEW_CACHE_DIR, min_age=MIN_AGE):
+        """
+        Args:
+            movie_manager: MovieManager com o registro de imagens em uso
+            asset_dirs: Pastas com imagens referenciadas pelo catálogo
+            preview_dir: Pasta de pré-visualizações (sem referências)
+            min_age: Idade mínima, em segundos, de um arquivo para ser apagado
+        """
+        self.movie_manager = movie_manager
+        self.min_age = min_age
+        self.scanned = 0
+        self.removed = 0
+        self.freed_bytes = 0
+        self._entries = self._walk(asset_dirs, preview_dir)
+        self.finished = False
+
+    def _walk(self, asset_dirs, preview_dir):
+        """Gera (DirEntry, é pré-visualização) de cada arquivo, uma pasta por vez."""
+        for directory, is_preview in [(path, False) for path in asset_dirs] + [(preview_dir, True)]:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        yield entry, is_preview
+            except OSError:
+                continue
+
+    def step(self, budget=0.02, now=None):
+        """
+        Processa arquivos até gastar o tempo limite.
+
+        Args:
+            budget: Tempo máximo desta fatia, em segundos
+
+        Returns:
+            bool: True quando a varredura terminou
+        """
+        deadline = time.monotonic() + budget
+        now = now or time.time()
+        for entry, is_preview in self._entries:
+            self.scanned += 1
+            self._collect(entry, is_preview, now)
+            if time.monotonic() >= deadline:
+                return False
+        self.finished = True
+        return True
+
+    def _collect(self, entry, is_preview, now):
+        try:
+            if not entry.is_file(follow_symlinks=False):
+                return
+            stat = entry.stat(follow_symlinks=False)
+        except OSError:
+            return
+        if now - stat.st_mtime < self.min_age:
+            return
+        if not is_preview and self.movie_manager.is_asset_referenced(entry.path):
+            return
+        try:
+            os.remove(entry.path)
+        except OSError:
+            return
+        self.removed += 1
+        self.freed_bytes += stat.st_size
+
+    def report(self):
+        """Resumo da varredura: arquivos verificados, apagados e bytes liberados."""
+        return {"scanned": self.scanned, "removed": self.removed, "freed_bytes": self.freed_bytes}
+
+    def run(self, budget=0.02, pause=0.1):
+        """Executa a varredura inteira em fatias de budget segundos, com pausas entre elas."""
+        while not self.step(budget):
+            time.sleep(pause)
+        report = self.report()
+        if report["removed"]:
+            print(f"Coleta de imagens: {report['removed']} arquivos sem uso apagados "
+                  f"({report['freed_bytes'] / 1024 / 1024:.1f} MB liberados, {report['scanned']} verificados)")
+        return report
+
+
+def collect_in_background(movie_manager, **options):
+    """Inicia uma varredura completa em uma thread separada e retorna o coletor."""
+    collector = AssetCollector(movie_manager, **options)
+    threading.Thread(target=collector.run, name="AssetCollector", daemon=True).start()
+    return collector
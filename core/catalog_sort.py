@@ -0,0 +1,126 @@
+import locale
+from bisect import bisect_left, insort
+
+from core.title_matcher import normalize_title
+
+# Ordenações da grade de filmes. As chaves de cada filme são calculadas uma
+# vez e as listas ordenadas são mantidas a cada alteração do catálogo, então
+# trocar a ordenação é só escolher outra lista: nada é reordenado nem gravado.
+# A ordenação é uma preferência de exibição; o catalog.json mantém a ordem
+# de inclusão.
+
+SORT_TITLE = "title"
+SORT_DATE_ADDED = "date_added"
+SORT_RATING = "vote_average"
+SORT_RELEASE_DATE = "release_date"
+
+
+def collation_key(text):
+    """
+    Chave de ordenação alfabética de um texto.
+
+    A primeira parte ignora acentos, caixa e pontuação ("Érica" fica junto de
+    "Erica"); a segunda desempata pela ordem do idioma do sistema
+    (locale.strxfrm).
+    """
+    text = text or ""
+    try:
+        collated = locale.strxfrm(text)
+    except (ValueError, OSError):
+        collated = text
+    return normalize_title(text), collated
+
+
+def rating_key(movie):
+    try:
+        return float(movie.get("vote_average") or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+# Nome da ordenação -> (função que calcula a chave, ordem decrescente)
+SORT_ORDERS = {
+    SORT_TITLE: (lambda movie: collation_key(movie.get("title")), False),
+    SORT_DATE_ADDED: (lambda movie: movie.get("date_added") or "", True),
+    SORT_RATING: (rating_key, True),
+    SORT_RELEASE_DATE: (lambda movie: movie.get("release_date") or "", True),
+}
+
+
+class SortIndex:
+    """
+    Listas ordenadas de ids de filmes, uma por ordenação.
+
+    Cada lista guarda pares (chave, id) em ordem crescente; o id desempata
+    filmes com a mesma chave. Alterações pontuais entram com busca binária
+    (apply); quando a lista de filmes muda sem passar por apply, os índices
+    são recriados na próxima consulta. Não é thread-safe: o MovieManager
+    só o acessa com o lock do catálogo.
+    """
+
+    # Acima disso, apply() descarta os índices em vez de atualizá-los um a um
+    MAX_INCREMENTAL_CHANGES = 64
+
+    def __init__(self):
+        self.movies = None
+        self.keys = {}
+        self.orders = {order: [] for order in SORT_ORDERS}
+
+    def rebuild(self, movies):
+        """Recalcula todas as chaves e listas a partir de uma lista de filmes."""
+        self.keys = {}
+        self.orders = {order: [] for order in SORT_ORDERS}
+        for movie in movies:
+            self.keys[movie.get("id")] = self.movie_keys(movie)
+        for order, entries in self.orders.items():
+            entries.extend((keys[order], movie_id) for movie_id, keys in self.keys.items())
+            entries.sort()
+        self.movies = movies
+
+    @staticmethod
+    def movie_keys(movie):
+        return {order: key(movie) for order, (key, reverse) in SORT_ORDERS.items()}
+
+    def apply(self, previous, movies, upserted=(), removed=()):
+        """
+        Registra uma alteração pontual do catálogo.
+
+        Args:
+            previous: Lista de filmes antes da alteração
+            movies: Lista de filmes publicada
+            upserted: Filmes incluídos ou alterados
+            removed: Filmes excluídos
+        """
+        if self.movies is not previous:
+            # Os índices já estavam desatualizados; serão recriados na consulta
+            return
+        if len(upserted) + len(removed) > self.MAX_INCREMENTAL_CHANGES:
+            # Alteração em lote: recriar tudo na próxima consulta sai mais barato
+            self.movies = None
+            return
+        for movie in removed:
+            self._remove(movie.get("id"))
+        for movie in upserted:
+            self._remove(movie.get("id"))
+            keys = self.movie_keys(movie)
+            self.keys[movie.get("id")] = keys
+            for order, entries in self.orders.items():
+                insort(entries, (keys[order], movie.get("id")))
+        self.movies = movies
+
+    def _remove(self, movie_id):
+        keys = self.keys.pop(movie_id, None)
+        if keys is None:
+            return
+        for order, entries in self.orders.items():
+            position = bisect_left(entries, (keys[order], movie_id))
+            if position < len(entries) and entries[position][1] == movie_id:
+                del entries[position]
+
+    def ordered_ids(self, order, movies):
+        """Ids dos filmes na ordenação pedida (recria os índices se estiverem desatualizados)."""
+        if self.movies is not movies:
+            self.rebuild(movies)
+        entries = self.orders[order]
+        reverse = SORT_ORDERS[order][1]
+        return [movie_id for key, movie_id in (reversed(entries) if reverse else entries)]
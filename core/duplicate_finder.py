@@ -0,0 +1,181 @@
+import os
+import hashlib
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+
+from core.fingerprint import CHUNK_SIZE
+
+# Busca de arquivos de vídeo repetidos nas pastas da biblioteca. A comparação
+# é feita em etapas, da mais barata para a mais cara: primeiro o tamanho (só
+# os metadados do sistema de arquivos), depois um hash do início e do fim de
+# cada arquivo e, só para quem continua empatado, o hash do arquivo inteiro.
+# As leituras das duas últimas etapas são feitas em paralelo.
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm')
+
+# Arquivos menores que isso não são filmes (amostras, trailers)
+MIN_SIZE = 50 * 1024 * 1024
+
+FULL_HASH_BLOCK = 1024 * 1024
+
+
+def library_roots(movies, extra_roots=()):
+    """
+    Pastas a percorrer: as pastas já escaneadas e as dos arquivos do catálogo.
+
+    Pastas dentro de outra da lista são descartadas, para que nenhum arquivo
+    seja visitado duas vezes.
+
+    Args:
+        movies: Filmes do catálogo
+        extra_roots: Pastas escaneadas anteriormente
+
+    Returns:
+        list: Pastas, sem repetições nem pastas aninhadas
+    """
+    folders = {os.path.normpath(root) for root in extra_roots if root}
+    for movie in movies:
+        for file_path in [movie.get("file_path")] + movie.get("alternate_paths", []):
+            if file_path:
+                folders.add(os.path.dirname(os.path.normpath(file_path)))
+    roots = []
+    for folder in sorted(folders, key=lambda path: (len(path), path)):
+        if not any(os.path.normcase(folder + os.sep).startswith(os.path.normcase(os.path.join(root, "")))
+                   for root in roots):
+            roots.append(folder)
+    return roots
+
+
+def partial_hash(file_path):
+    """Hash dos primeiros e dos últimos CHUNK_SIZE bytes do arquivo."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        digest.update(f.read(CHUNK_SIZE))
+        f.seek(max(size - CHUNK_SIZE, 0))
+        digest.update(f.read(CHUNK_SIZE))
+    return digest.hexdigest()
+
+
+def full_hash(file_path, control=None):
+    """Hash do arquivo inteiro (None se a tarefa foi cancelada no meio)."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(FULL_HASH_BLOCK), b""):
+            if control is not None and control.is_cancelled():
+                return None
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DuplicateFinder:
+    """Agrupa os arquivos de vídeo idênticos encontrados em várias pastas."""
+
+    def __init__(self, roots, min_size=MIN_SIZE, workers=4, control=None, progress=None):
+        """
+        Args:
+            roots: Pastas a percorrer
+            min_size: Tamanho mínimo, em bytes, de um arquivo comparado
+            workers: Leituras simultâneas nas etapas de hash
+            control: JobControl opcional (pausa e cancelamento entre etapas e arquivos)
+            progress: Função opcional chamada como progress(etapa, feitos, total)
+        """
+        self.roots = roots
+        self.min_size = min_size
+        self.workers = workers
+        self.control = control
+        self.progress = progress or (lambda stage, done, total: None)
+        self.sizes = {}
+
+    def _cancelled(self):
+        return self.control is not None and not self.control.checkpoint()
+
+    def list_files(self):
+        """Retorna {tamanho: [caminhos]} dos vídeos das pastas (sem seguir atalhos)."""
+        by_size = {}
+        seen = set()
+        for root in self.roots:
+            for folder, dirs, files in os.walk(root):
+                if self._cancelled():
+                    return by_size
+                for name in files:
+                    if not name.lower().endswith(VIDEO_EXTENSIONS):
+                        continue
+                    file_path = os.path.join(folder, name)
+                    key = os.path.normcase(os.path.realpath(file_path))
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    try:
+                        size = os.path.getsize(file_path)
+                    except OSError:
+                        continue
+                    if size >= self.min_size:
+                        self.sizes[file_path] = size
+                        by_size.setdefault(size, []).append(file_path)
+        return by_size
+
+    def _split(self, groups, hash_function, stage):
+        """
+        Divide cada grupo pelo hash calculado em paralelo.
+
+        Returns:
+            list: Grupos com mais de um arquivo e o mesmo hash
+        """
+        paths = [file_path for group in groups for file_path in group]
+        hashes = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {file_path: executor.submit(self._safe_hash, hash_function, file_path)
+                       for file_path in paths}
+            for done, (file_path, future) in enumerate(futures.items(), start=1):
+                hashes[file_path] = future.result()
+                self.progress(stage, done, len(paths))
+                if self.control is not None and self.control.is_cancelled():
+                    for pending in futures.values():
+                        pending.cancel()
+                    return []
+
+        split_groups = []
+        for group in groups:
+            by_hash = {}
+            for file_path in group:
+                if hashes.get(file_path) is not None:
+                    by_hash.setdefault(hashes[file_path], []).append(file_path)
+            split_groups.extend(same for same in by_hash.values() if len(same) > 1)
+        return split_groups
+
+    @staticmethod
+    def _safe_hash(hash_function, file_path):
+        try:
+            return hash_function(file_path)
+        except OSError as e:
+            print(f"Erro ao ler {file_path}: {e}")
+            return None
+
+    def find(self):
+        """
+        Executa as etapas e retorna os grupos de arquivos idênticos.
+
+        Returns:
+            list: Dicionários com 'size', 'paths' e 'wasted_bytes' (espaço
+                ocupado pelas cópias além da primeira), do maior desperdício
+                para o menor
+        """
+        groups = [paths for paths in self.list_files().values() if len(paths) > 1]
+        if groups and not self._cancelled():
+            groups = self._split(groups, partial_hash, "partial")
+        if groups and not self._cancelled():
+            groups = self._split(groups, partial(full_hash, control=self.control), "full")
+        if self.control is not None and self.control.is_cancelled():
+            return []
+
+        duplicates = []
+        for paths in groups:
+            size = self.sizes[paths[0]]
+            duplicates.append({
+                "size": size,
+                "paths": sorted(paths),
+                "wasted_bytes": size * (len(paths) - 1),
+            })
+        duplicates.sort(key=lambda group: group["wasted_bytes"], reverse=True)
+        return duplicates
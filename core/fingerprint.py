@@ -0,0 +1,49 @@
+import os
+import struct
+
+# Impressão digital do conteúdo de um arquivo de vídeo, no formato do
+# OpenSubtitles: o tamanho do arquivo somado (módulo 2^64) aos blocos de 8
+# bytes dos primeiros e dos últimos 64 KB. Lê só 128 KB por arquivo, então
+# serve para reencontrar um filme que mudou de pasta ou de unidade sem ler o
+# arquivo inteiro.
+
+CHUNK_SIZE = 64 * 1024
+_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+def _sum_chunk(data):
+    """Soma os blocos de 8 bytes (little-endian) de um trecho do arquivo."""
+    # Um trecho com tamanho fora do múltiplo de 8 é completado com zeros
+    if len(data) % 8:
+        data += b"\0" * (8 - len(data) % 8)
+    return sum(struct.unpack(f"<{len(data) // 8}Q", data))
+
+
+def compute_fingerprint(file_path):
+    """
+    Calcula a impressão digital de um arquivo.
+
+    Args:
+        file_path: Caminho do arquivo
+
+    Returns:
+        str: Hash de 16 dígitos hexadecimais, ou None se o arquivo não puder ser lido
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            value = size + _sum_chunk(f.read(CHUNK_SIZE))
+            f.seek(max(size - CHUNK_SIZE, 0))
+            value += _sum_chunk(f.read(CHUNK_SIZE))
+    except OSError as e:
+        print(f"Erro ao calcular impressão digital de {file_path}: {e}")
+        return None
+    return f"{value & _MASK:016x}"
+
+
+def file_size(file_path):
+    """Retorna o tamanho do arquivo em bytes (None se ele não existir)."""
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return None
@@ -0,0 +1,134 @@
+import os
+import json
+import time
+import threading
+from datetime import datetime
+
+# Fila persistente da adição automática de filmes. Cada arquivo encontrado em
+# uma pasta entra como pendente; os que falham ficam registrados com o motivo,
+# o número de tentativas e o horário da próxima tentativa (espera exponencial).
+# Arquivos adicionados com sucesso saem da fila.
+
+QUEUE_PATH = os.path.join("data", "import_queue.json")
+
+STATUS_PENDING = "pending"
+STATUS_FAILED = "failed"
+
+# Espera antes da próxima tentativa: 1h, 2h, 4h... até 7 dias
+BASE_RETRY_DELAY = 60 * 60
+MAX_RETRY_DELAY = 7 * 24 * 60 * 60
+
+
+class ImportQueue:
+    """Fila de arquivos pendentes e com falha, gravada em data/import_queue.json."""
+
+    def __init__(self, queue_path=QUEUE_PATH):
+        self.queue_path = queue_path
+        self.lock = threading.Lock()
+        self.items = self.load()
+
+    def load(self):
+        """Carrega a fila do disco (dicionário caminho -> item)."""
+        if not os.path.exists(self.queue_path):
+            return {}
+        try:
+            with open(self.queue_path, 'r', encoding='utf-8') as f:
+                return {item["file_path"]: item for item in json.load(f).get("items", [])}
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Erro ao carregar fila de importação: {e}")
+            return {}
+
+    def save(self):
+        """Grava a fila em um arquivo temporário e o troca pelo atual."""
+        with self.lock:
+            data = {"items": list(self.items.values())}
+            try:
+                os.makedirs(os.path.dirname(self.queue_path) or ".", exist_ok=True)
+                temp_path = self.queue_path + ".tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                os.replace(temp_path, self.queue_path)
+            except OSError as e:
+                print(f"Erro ao salvar fila de importação: {e}")
+
+    def __len__(self):
+        return len(self.items)
+
+    def enqueue(self, movie_files):
+        """
+        Acrescenta arquivos encontrados na varredura.
+
+        Arquivos que já estão na fila mantêm o histórico de tentativas.
+
+        Args:
+            movie_files: Lista de (título, caminho, metadados)
+        """
+        with self.lock:
+            for title, file_path, metadata in movie_files:
+                if file_path in self.items:
+                    continue
+                self.items[file_path] = {
+                    "file_path": file_path,
+                    "title": title,
+                    "year": metadata.get("year"),
+                    "duration": metadata.get("duration"),
+                    "status": STATUS_PENDING,
+                    "reason": None,
+                    "attempts": 0,
+                    "last_attempt": None,
+                    "next_attempt": 0,
+                }
+
+    def mark_done(self, file_path):
+        """Remove da fila um arquivo resolvido."""
+        with self.lock:
+            self.items.pop(file_path, None)
+
+    def mark_failed(self, file_path, reason, now=None):
+        """Registra uma falha e agenda a próxima tentativa com espera exponencial."""
+        now = now or time.time()
+        with self.lock:
+            item = self.items.get(file_path)
+            if item is None:
+                return
+            item["attempts"] += 1
+            item["status"] = STATUS_FAILED
+            item["reason"] = reason
+            item["last_attempt"] = datetime.fromtimestamp(now).isoformat()
+            delay = min(BASE_RETRY_DELAY * 2 ** (item["attempts"] - 1), MAX_RETRY_DELAY)
+            item["next_attempt"] = now + delay
+
+    def is_waiting(self, file_path, now=None):
+        """Indica se o arquivo falhou e ainda não chegou a hora de tentar de novo."""
+        item = self.items.get(file_path)
+        return bool(item) and item["status"] == STATUS_FAILED and item["next_attempt"] > (now or time.time())
+
+    def due_items(self, force=False, now=None):
+        """
+        Lista os itens prontos para processamento, no formato da varredura.
+
+        Args:
+            force: Ignora a espera entre tentativas (repetição pedida pelo usuário)
+
+        Returns:
+            list: (título, caminho, metadados) dos itens pendentes ou com falha vencida
+        """
+        now = now or time.time()
+        with self.lock:
+            return [
+                (item["title"], item["file_path"], {"year": item["year"], "duration": item["duration"]})
+                for item in self.items.values()
+                if force or item["status"] == STATUS_PENDING or item["next_attempt"] <= now
+            ]
+
+    def failed_items(self):
+        """Lista os itens que já falharam ao menos uma vez."""
+        return [item for item in self.items.values() if item["status"] == STATUS_FAILED]
+
+    def report(self):
+        """Resumo da fila: total de pendentes e falhas agrupadas por motivo."""
+        reasons = {}
+        for item in self.failed_items():
+            reasons[item["reason"]] = reasons.get(item["reason"], 0) + 1
+        pending = sum(1 for item in self.items.values() if item["status"] == STATUS_PENDING)
+        return {"pending": pending, "failed": sum(reasons.values()), "reasons": reasons}
@@ -0,0 +1,121 @@
+import time
+import threading
+
+# Controle de tarefas longas (varredura de pastas e importação em lote).
+# A interface pausa, retoma e cancela pelo JobControl; a thread de trabalho
+# chama checkpoint() entre um item e outro, então o item em andamento sempre
+# termina e nada fica pela metade.
+
+
+class JobControl:
+    """Estado de pausa e cancelamento compartilhado entre a interface e a thread."""
+
+    def __init__(self, gate=None):
+        """
+        Args:
+            gate: threading.Event opcional; enquanto estiver desligado, a tarefa
+                espera no checkpoint (ex: TaskRunner.interactive_idle, para ceder
+                a vez às tarefas interativas)
+        """
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+        self._gate = gate
+
+    def cancel(self):
+        """Pede o cancelamento (também libera uma tarefa pausada)."""
+        self._cancelled.set()
+        self._running.set()
+
+    def pause(self):
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def is_paused(self):
+        return not self._running.is_set() and not self._cancelled.is_set()
+
+    def checkpoint(self):
+        """
+        Ponto de parada da thread de trabalho.
+
+        Bloqueia enquanto a tarefa estiver pausada ou o gate estiver fechado.
+
+        Returns:
+            bool: False se a tarefa foi cancelada e deve parar
+        """
+        self._running.wait()
+        if self._gate is not None:
+            # Espera em intervalos curtos para perceber um cancelamento
+            while not self._gate.wait(0.2):
+                if self._cancelled.is_set():
+                    break
+        return not self._cancelled.is_set()
+
+
+class ProgressMeter:
+    """
+    Calcula a vazão e o tempo restante de uma tarefa.
+
+    A vazão é uma média móvel exponencial das amostras, então variações
+    pontuais (um filme lento na API) não fazem o tempo restante oscilar.
+    O tempo em pausa não conta.
+    """
+
+    def __init__(self, smoothing=0.2):
+        """
+        Args:
+            smoothing: Peso de cada nova amostra na média (0 a 1)
+        """
+        self.smoothing = smoothing
+        self.rate = None
+        self._last_time = time.monotonic()
+        self._last_done = 0
+        self._paused_at = None
+
+    def pause(self):
+        if self._paused_at is None:
+            self._paused_at = time.monotonic()
+
+    def resume(self):
+        if self._paused_at is not None:
+            # Desconta o tempo parado da amostra atual
+            self._last_time += time.monotonic() - self._paused_at
+            self._paused_at = None
+
+    def update(self, done, total, now=None):
+        """
+        Registra o progresso e retorna (itens por segundo, segundos restantes).
+
+        Qualquer um dos dois é None enquanto não há amostras suficientes.
+        """
+        now = now if now is not None else time.monotonic()
+        elapsed = now - self._last_time
+        if done > self._last_done and elapsed > 0:
+            sample = (done - self._last_done) / elapsed
+            if self.rate is None:
+                self.rate = sample
+            else:
+                self.rate = self.smoothing * sample + (1 - self.smoothing) * self.rate
+            self._last_time = now
+            self._last_done = done
+
+        if not self.rate:
+            return self.rate, None
+        return self.rate, max(total - done, 0) / self.rate
+
+
+def format_duration(seconds):
+    """Formata segundos como "1h 05min", "4min 20s" ou "35s"."""
+    seconds = int(round(seconds))
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if hours:
+        return f"{hours}h {minutes:02d}min"
+    if minutes:
+        return f"{minutes}min {seconds:02d}s"
+    return f"{seconds}s"
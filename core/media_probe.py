@@ -0,0 +1,421 @@
+import os
+import json
+import struct
+import shutil
+import subprocess
+
+# Leitura da duração de um vídeo direto do cabeçalho do contêiner, sem abrir
+# um processo externo: MP4/MOV (caixa moov/mvhd), Matroska/WebM (elemento
+# Segment/Info/Duration) e AVI (avih, ou dmlh nos arquivos OpenDML). Só os
+# cabeçalhos são lidos (alguns KB por arquivo); o conteúdo é pulado com seek.
+# Formatos não suportados (WMV, FLV, arquivos corrompidos) usam o ffprobe,
+# cuja disponibilidade é verificada uma única vez. Quando o ffprobe roda, é
+# uma só chamada em modo JSON, e todas as informações técnicas do arquivo
+# (media_info) são aproveitadas e gravadas no catálogo.
+
+# Maior lista de cabeçalhos (hdrl) de AVI aceita; acima disso o arquivo é tratado como inválido
+MAX_HEADER_SIZE = 16 * 1024 * 1024
+
+_ffprobe_path = False
+
+
+class ProbeError(Exception):
+    """Cabeçalho ausente, truncado ou em formato não reconhecido."""
+
+
+def _read_exact(f, size):
+    data = f.read(size)
+    if len(data) != size:
+        raise ProbeError("arquivo truncado")
+    return data
+
+
+# MP4 / MOV
+
+def _mp4_boxes(f, end):
+    """Gera (tipo, início do conteúdo, tamanho do conteúdo) das caixas até end."""
+    position = f.tell()
+    while position + 8 <= end:
+        f.seek(position)
+        size, box_type = struct.unpack(">I4s", _read_exact(f, 8))
+        header = 8
+        if size == 1:
+            size = struct.unpack(">Q", _read_exact(f, 8))[0]
+            header = 16
+        elif size == 0:
+            size = end - position
+        if size < header:
+            raise ProbeError("caixa MP4 inválida")
+        yield box_type, position + header, size - header
+        position += size
+
+
+def mp4_duration(f, file_size):
+    """Duração (segundos) pela caixa mvhd dentro de moov, onde quer que moov esteja."""
+    f.seek(0)
+    for box_type, start, size in _mp4_boxes(f, file_size):
+        if box_type != b"moov":
+            continue
+        f.seek(start)
+        for child_type, child_start, child_size in _mp4_boxes(f, start + size):
+            if child_type != b"mvhd":
+                continue
+            f.seek(child_start)
+            version = _read_exact(f, 4)[0]
+            if version == 1:
+                _, _, timescale, duration = struct.unpack(">QQIQ", _read_exact(f, 28))
+            else:
+                _, _, timescale, duration = struct.unpack(">IIII", _read_exact(f, 16))
+            if not timescale:
+                raise ProbeError("mvhd sem escala de tempo")
+            return duration / timescale
+        raise ProbeError("moov sem mvhd")
+    raise ProbeError("caixa moov não encontrada")
+
+
+# Matroska / WebM
+
+EBML_HEADER = 0x1A45DFA3
+MKV_SEGMENT = 0x18538067
+MKV_INFO = 0x1549A966
+MKV_CLUSTER = 0x1F43B675
+MKV_TIMECODE_SCALE = 0x2AD7B1
+MKV_DURATION = 0x4489
+
+
+def _read_vint(f, keep_marker):
+    """Lê um inteiro de tamanho variável do EBML (id com o marcador, tamanho sem)."""
+    first = _read_exact(f, 1)[0]
+    length = 1
+    mask = 0x80
+    while length <= 8 and not first & mask:
+        mask >>= 1
+        length += 1
+    if length > 8:
+        raise ProbeError("inteiro EBML inválido")
+    value = first if keep_marker else first & (mask - 1)
+    all_ones = value == mask - 1
+    for byte in _read_exact(f, length - 1):
+        value = (value << 8) | byte
+        all_ones = all_ones and byte == 0xFF
+    # Tamanho com todos os bits ligados: desconhecido (segmento gravado ao vivo)
+    if not keep_marker and all_ones:
+        return None
+    return value
+
+
+def _ebml_elements(f, end):
+    """Gera (id, início do conteúdo, tamanho ou None) dos elementos até end."""
+    while f.tell() < end:
+        element_id = _read_vint(f, True)
+        size = _read_vint(f, False)
+        start = f.tell()
+        yield element_id, start, size
+        if size is None:
+            # Só elementos mestres têm tamanho desconhecido; o conteúdo vem em seguida
+            continue
+        f.seek(start + size)
+
+
+def mkv_duration(f, file_size):
+    """Duração (segundos) pelo elemento Duration do bloco Info do segmento."""
+    f.seek(0)
+    elements = _ebml_elements(f, file_size)
+    element_id, _, _ = next(elements)
+    if element_id != EBML_HEADER:
+        raise ProbeError("cabeçalho EBML não encontrado")
+    for element_id, start, size in elements:
+        if element_id == MKV_SEGMENT:
+            break
+    else:
+        raise ProbeError("segmento Matroska não encontrado")
+
+    segment_end = start + size if size is not None else file_size
+    for element_id, start, size in _ebml_elements(f, segment_end):
+        if element_id == MKV_CLUSTER:
+            # Os dados começaram antes do Info: não vale a pena procurar mais
+            break
+        if element_id != MKV_INFO or size is None:
+            continue
+        timecode_scale = 1000000
+        duration = None
+        for child_id, child_start, child_size in _ebml_elements(f, start + size):
+            if child_size is None:
+                raise ProbeError("elemento de Info sem tamanho")
+            if child_id == MKV_TIMECODE_SCALE:
+                timecode_scale = int.from_bytes(_read_exact(f, child_size), "big")
+            elif child_id == MKV_DURATION:
+                data = _read_exact(f, child_size)
+                if child_size == 4:
+                    duration = struct.unpack(">f", data)[0]
+                elif child_size == 8:
+                    duration = struct.unpack(">d", data)[0]
+            f.seek(child_start + child_size)
+        if duration is None:
+            raise ProbeError("Info sem Duration")
+        return duration * timecode_scale / 1e9
+    raise ProbeError("Info não encontrado antes dos dados")
+
+
+# AVI
+
+def _riff_chunks(f, end):
+    """Gera (id, tipo de lista ou None, início do conteúdo, tamanho) dos blocos RIFF."""
+    position = f.tell()
+    while position + 8 <= end:
+        f.seek(position)
+        chunk_id, size = struct.unpack("<4sI", _read_exact(f, 8))
+        list_type = None
+        start = position + 8
+        if chunk_id == b"LIST":
+            list_type = _read_exact(f, 4)
+            start += 4
+            size -= 4
+        yield chunk_id, list_type, start, size
+        # Blocos têm tamanho par
+        position = start + size + (size & 1)
+
+
+def avi_duration(f, file_size):
+    """Duração (segundos) pelo avih do hdrl; arquivos OpenDML usam o total de quadros do dmlh."""
+    f.seek(0)
+    riff, _, form = struct.unpack("<4sI4s", _read_exact(f, 12))
+    if riff != b"RIFF" or form != b"AVI ":
+        raise ProbeError("cabeçalho AVI não encontrado")
+    for chunk_id, list_type, start, size in _riff_chunks(f, file_size):
+        if list_type != b"hdrl":
+            continue
+        if size > MAX_HEADER_SIZE:
+            raise ProbeError("hdrl grande demais")
+        micro_seconds_per_frame = total_frames = None
+        f.seek(start)
+        for child_id, child_list, child_start, child_size in _riff_chunks(f, start + size):
+            if child_id == b"avih":
+                f.seek(child_start)
+                values = struct.unpack("<5I", _read_exact(f, 20))
+                micro_seconds_per_frame = values[0]
+                total_frames = total_frames or values[4]
+            elif child_list == b"odml":
+                f.seek(child_start)
+                for odml_id, _, odml_start, _ in _riff_chunks(f, child_start + child_size):
+                    if odml_id == b"dmlh":
+                        f.seek(odml_start)
+                        total_frames = struct.unpack("<I", _read_exact(f, 4))[0] or total_frames
+        if not micro_seconds_per_frame or not total_frames:
+            raise ProbeError("avih sem taxa de quadros")
+        return micro_seconds_per_frame * total_frames / 1e6
+    raise ProbeError("hdrl não encontrado")
+
+
+PARSERS = {
+    ".mp4": mp4_duration,
+    ".m4v": mp4_duration,
+    ".mov": mp4_duration,
+    ".mkv": mkv_duration,
+    ".webm": mkv_duration,
+    ".avi": avi_duration,
+}
+
+
+def read_duration(file_path):
+    """
+    Lê a duração do cabeçalho do contêiner.
+
+    Args:
+        file_path: Caminho do vídeo
+
+    Returns:
+        float: Duração em segundos, ou None se o formato não for suportado ou
+            o cabeçalho não puder ser lido
+    """
+    parser = PARSERS.get(os.path.splitext(file_path)[1].lower())
+    if parser is None:
+        return None
+    try:
+        with open(file_path, 'rb') as f:
+            duration = parser(f, os.fstat(f.fileno()).st_size)
+    except (OSError, ProbeError, struct.error, StopIteration):
+        return None
+    return duration if duration > 0 else None
+
+
+def ffprobe_path():
+    """Caminho do ffprobe (procurado uma vez por execução; None se não estiver instalado)."""
+    global _ffprobe_path
+    if _ffprobe_path is False:
+        _ffprobe_path = shutil.which("ffprobe")
+        if _ffprobe_path is None:
+            print("FFprobe não encontrado no sistema; só os formatos lidos diretamente terão duração.")
+    return _ffprobe_path
+
+
+def _number(value, kind=float):
+    try:
+        return kind(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _hdr_format(stream):
+    """Formato HDR do fluxo de vídeo (None se for SDR)."""
+    for side_data in stream.get("side_data_list", []):
+        if "DOVI" in side_data.get("side_data_type", "") or "Dolby Vision" in side_data.get("side_data_type", ""):
+            return "Dolby Vision"
+    transfer = stream.get("color_transfer")
+    if transfer == "smpte2084":
+        return "HDR10"
+    if transfer == "arib-std-b67":
+        return "HLG"
+    return None
+
+
+def parse_ffprobe_output(data):
+    """
+    Monta as informações técnicas a partir do JSON do ffprobe.
+
+    Args:
+        data: Saída de ffprobe -print_format json -show_format -show_streams, já decodificada
+
+    Returns:
+        dict: media_info gravado no catálogo (ver read_media_info)
+    """
+    media_format = data.get("format", {})
+    media_info = {
+        "source": "ffprobe",
+        "duration": _number(media_format.get("duration")),
+        "bit_rate": _number(media_format.get("bit_rate"), int),
+        "width": None,
+        "height": None,
+        "video_codec": None,
+        "hdr": None,
+        "audio": [],
+        "subtitle_languages": [],
+    }
+    for stream in data.get("streams", []):
+        codec_type = stream.get("codec_type")
+        tags = stream.get("tags", {})
+        language = (tags.get("language") or "").lower() or None
+        # Capas anexadas aparecem como fluxos de vídeo; só o primeiro vídeo de verdade conta
+        if codec_type == "video" and media_info["video_codec"] is None \
+                and not stream.get("disposition", {}).get("attached_pic"):
+            media_info.update({
+                "width": stream.get("width"),
+                "height": stream.get("height"),
+                "video_codec": stream.get("codec_name"),
+                "hdr": _hdr_format(stream),
+            })
+        elif codec_type == "audio":
+            media_info["audio"].append({
+                "codec": stream.get("codec_name"),
+                "channels": stream.get("channels"),
+                "language": language,
+                "title": tags.get("title"),
+            })
+        elif codec_type == "subtitle" and language and language not in media_info["subtitle_languages"]:
+            media_info["subtitle_languages"].append(language)
+    return media_info
+
+
+def ffprobe_media_info(file_path):
+    """Informações técnicas com uma única chamada do ffprobe (None se ele não estiver disponível ou falhar)."""
+    executable = ffprobe_path()
+    if executable is None:
+        return None
+    cmd = [
+        executable,
+        '-v', 'error',
+        '-print_format', 'json',
+        '-show_format',
+        '-show_streams',
+        file_path
+    ]
+    try:
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                                encoding='utf-8', errors='replace')
+        if result.returncode != 0:
+            print(f"Erro ao executar ffprobe: {result.stderr}")
+            return None
+        return parse_ffprobe_output(json.loads(result.stdout))
+    except (OSError, ValueError) as e:
+        print(f"Erro ao ler informações do vídeo: {e}")
+        return None
+
+
+def ffprobe_duration(file_path):
+    """Duração pelo ffprobe (None se ele não estiver disponível ou falhar)."""
+    media_info = ffprobe_media_info(file_path)
+    return media_info.get("duration") if media_info else None
+
+
+def get_duration(file_path):
+    """Duração do vídeo em segundos: pelo cabeçalho e, se não der, pelo ffprobe."""
+    duration = read_duration(file_path)
+    if duration is None:
+        duration = ffprobe_duration(file_path)
+    return duration
+
+
+def read_media_info(file_path, full=True):
+    """
+    Informações técnicas do arquivo, no formato gravado no catálogo.
+
+    Com o ffprobe instalado e full=True, uma única chamada traz duração,
+    resolução, codecs, HDR, idiomas de áudio e legendas e taxa de bits. Sem
+    ele (ou com full=False, na varredura) só a duração é lida do cabeçalho, e
+    o ffprobe fica para os formatos que o cabeçalho não resolve.
+
+    Args:
+        file_path: Caminho do vídeo
+        full: Se deve preferir a leitura completa pelo ffprobe
+
+    Returns:
+        dict: Com 'source' ("ffprobe" ou "header") e 'duration' (None se
+            desconhecida); os demais campos só existem na leitura completa.
+            Se o ffprobe rodou e falhou, a leitura do cabeçalho leva
+            'probed': "ffprobe" e não é repetida (ver is_final)
+    """
+    if full:
+        media_info = ffprobe_media_info(file_path)
+        if media_info is not None:
+            return media_info
+    duration = read_duration(file_path)
+    if duration is None and not full:
+        media_info = ffprobe_media_info(file_path)
+        if media_info is not None:
+            return media_info
+    media_info = {"source": "header", "duration": duration}
+    if (full or duration is None) and ffprobe_path() is not None:
+        media_info["probed"] = "ffprobe"
+    return media_info
+
+
+def is_complete(media_info):
+    """Indica se as informações vieram do ffprobe (não precisam ser lidas de novo)."""
+    return bool(media_info) and media_info.get("source") == "ffprobe"
+
+
+def is_final(media_info):
+    """Indica se não adianta rodar o ffprobe de novo (leitura completa ou ffprobe já tentado)."""
+    return is_complete(media_info) or (bool(media_info) and media_info.get("probed") == "ffprobe")
+
+
+# Idiomas de áudio considerados português (códigos ISO 639 usados pelos contêineres)
+PORTUGUESE_LANGUAGES = {"por", "pt", "pt-br", "pt-pt", "pob"}
+
+
+def is_4k(media_info):
+    """Indica se o vídeo tem resolução 4K (UHD ou DCI, inclusive cortes de tela larga)."""
+    if not media_info:
+        return False
+    return (media_info.get("width") or 0) >= 3800 or (media_info.get("height") or 0) >= 2100
+
+
+def has_portuguese_audio(media_info):
+    """Indica se alguma faixa de áudio é em português (pelo idioma ou pelo título da faixa)."""
+    for track in (media_info or {}).get("audio", []):
+        if track.get("language") in PORTUGUESE_LANGUAGES:
+            return True
+        title = (track.get("title") or "").lower()
+        if "dublado" in title or "portugu" in title:
+            return True
+    return False
@@ -0,0 +1,154 @@
+import os
+import threading
+
+# Imagens baixadas para cada filme: poster, backdrop e fotos de diretores e
+# elenco. As fotos ficam em um arquivo por pessoa e papel, compartilhado por
+# todos os filmes em que ela aparece, então só podem ser apagadas quando
+# nenhum filme restante a referencia.
+
+# Pré-visualização da busca manual: só os detalhes e um poster pequeno, em uma
+# pasta temporária. Backdrop, poster grande e fotos do elenco são baixados
+# apenas quando o filme é adicionado (MovieFetcher.download_movie_assets).
+PREVIEW_CACHE_DIR = os.path.join("data", "preview_cache")
+
+
+def profile_image_path(role, person_id):
+    """Caminho da foto de uma pessoa ("director" ou "cast")."""
+    return f"assets/profile_images/{role}_{person_id}.jpg"
+
+
+def movie_asset_paths(movie):
+    """
+    Conjunto com os caminhos de todas as imagens locais de um filme.
+
+    Inclui os nomes padrão que a interface usa quando o catálogo não guarda o
+    caminho (entradas antigas sem backdrop_local_path: a página de detalhes
+    procura o backdrop pelo tmdb_id e, sem ele, pelo id local), para que essas
+    imagens também contem como referenciadas.
+    """
+    paths = set()
+    for key in ("local_poster_path", "backdrop_local_path"):
+        if movie.get(key):
+            paths.add(movie[key])
+    for movie_id in (movie.get("tmdb_id"), movie.get("id")):
+        if movie_id is not None:
+            paths.add(f"assets/backdrop_images/{movie_id}_backdrop.jpg")
+    if movie.get("tmdb_id") is not None:
+        paths.add(f"assets/poster_images/{movie['tmdb_id']}.jpg")
+    for role, people in (("director", movie.get("directors") or []), ("cast", movie.get("cast") or [])):
+        for person in people:
+            if person.get("profile_path") and person.get("id") is not None:
+                paths.add(profile_image_path(role, person["id"]))
+    return paths
+
+
+def normalize_asset_path(path):
+    """Forma canônica de um caminho, para comparar o catálogo com a listagem das pastas."""
+    return os.path.normcase(os.path.normpath(path))
+
+
+class AssetRegistry:
+    """
+    Contagem de referências das imagens do catálogo.
+
+    Cada imagem tem o número de filmes que a usam; quando um filme sai ou
+    troca de imagem, as que chegam a zero referências são devolvidas para
+    serem apagadas. O MovieManager atualiza o registro a cada alteração
+    publicada (apply); alterações sem detalhe (ex: validação) fazem o registro
+    ser recriado a partir do catálogo na próxima consulta. O coletor de
+    imagens sem dono (core.asset_gc) consulta o registro de outra thread,
+    por isso ele tem lock próprio.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.movies = None
+        self.counts = {}
+        self.movie_paths = {}
+
+    def _rebuild(self, movies):
+        self.counts = {}
+        self.movie_paths = {}
+        for movie in movies:
+            self._add(movie)
+        self.movies = movies
+
+    def _add(self, movie):
+        paths = {normalize_asset_path(path) for path in movie_asset_paths(movie)}
+        self.movie_paths[movie.get("id")] = paths
+        for path in paths:
+            self.counts[path] = self.counts.get(path, 0) + 1
+
+    def _remove(self, movie_id):
+        released = set()
+        for path in self.movie_paths.pop(movie_id, ()):
+            count = self.counts.get(path, 0) - 1
+            if count > 0:
+                self.counts[path] = count
+            else:
+                self.counts.pop(path, None)
+                released.add(path)
+        return released
+
+    def apply(self, previous, movies, upserted=(), removed=()):
+        """
+        Registra uma alteração do catálogo.
+
+        Args:
+            previous: Lista de filmes antes da alteração
+            movies: Lista de filmes publicada
+            upserted: Filmes incluídos ou alterados
+            removed: Filmes excluídos
+
+        Returns:
+            set: Imagens que deixaram de ser usadas por qualquer filme
+        """
+        with self.lock:
+            if self.movies is not previous:
+                self._rebuild(previous)
+            released = set()
+            for movie in removed:
+                released |= self._remove(movie.get("id"))
+            for movie in upserted:
+                released |= self._remove(movie.get("id"))
+                self._add(movie)
+            released -= set(self.counts)
+            self.movies = movies
+            return released
+
+    def is_referenced(self, path, movies):
+        """Indica se a imagem é usada por algum filme da lista de filmes atual."""
+        with self.lock:
+            if self.movies is not movies:
+                self._rebuild(movies)
+            return normalize_asset_path(path) in self.counts
+
+
+def remove_assets_in_background(paths):
+    """
+    Apaga imagens em uma thread separada.
+
+    Se o aplicativo fechar antes do fim, os arquivos que sobrarem são
+    recolhidos depois pelo coletor de imagens sem dono (core.asset_gc).
+    """
+    paths = list(paths)
+    if not paths:
+        return None
+
+    def run():
+        removed_count = 0
+        freed_bytes = 0
+        for path in paths:
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+            except OSError:
+                continue
+            removed_count += 1
+            freed_bytes += size
+        if removed_count:
+            print(f"Imagens removidas: {removed_count} arquivos ({freed_bytes / 1024 / 1024:.1f} MB)")
+
+    thread = threading.Thread(target=run, name="AssetCleanup", daemon=True)
+    thread.start()
+    return thread
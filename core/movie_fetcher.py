@@ -2,7 +2,8 @@ import os
 import requests
 import shutil
 import json
-from urllib.parse import quote
+from core.title_index import record_search_results
+from core.movie_assets import profile_image_path, PREVIEW_CACHE_DIR
 
 class MovieFetcher:
     """Classe para buscar informações de filmes via API do TMDB."""
@@ -17,24 +18,57 @@ class MovieFetcher:
         self.backdrop_720p_url = "https://image.tmdb.org/t/p/w1280"
         # URL base para fotos de perfil
         self.profile_base_url = "https://image.tmdb.org/t/p/w185"
+        # Poster pequeno usado apenas na pré-visualização
+        self.preview_poster_url = "https://image.tmdb.org/t/p/w185"
+        # Miniaturas da lista de resultados da busca
+        self.thumbnail_base_url = "https://image.tmdb.org/t/p/w92"
         
-    def search_movie(self, title):
-        """Busca um filme pelo título."""
+    def search_movie(self, title, year=None, limit=5):
+        """
+        Busca um filme pelo título.
+        
+        Se o ano for informado, a busca é restrita aos filmes lançados nesse ano
+        (primary_release_year), o que resolve títulos ambíguos em uma só chamada.
+        A adição em lote usa limit=None para ranquear a primeira página inteira.
+        """
+        results, total_pages = self.search_movie_page(title, year)
+        return results[:limit] if limit else results
+    
+    def search_movie_page(self, title, year=None, page=1, timeout=None):
+        """
+        Busca uma página de resultados (20 filmes por página no TMDB).
+        
+        Args:
+            title: Título buscado
+            year: Ano de lançamento (opcional)
+            page: Página desejada, a partir de 1
+            timeout: Tempo máximo de espera da resposta, em segundos (opcional)
+        
+        Returns:
+            tuple: (lista de resultados, total de páginas); ([], 0) em caso de erro
+        """
         endpoint = f"{self.base_url}/search/movie"
+        # O requests já codifica os parâmetros; quote() aqui codificaria duas vezes
         params = {
             "api_key": self.api_key,
-            "query": quote(title),
-            "language": "pt-BR"
+            "query": title,
+            "language": "pt-BR",
+            "page": page
         }
+        if year:
+            params["primary_release_year"] = year
         
-        response = requests.get(endpoint, params=params)
+        response = requests.get(endpoint, params=params, timeout=timeout)
         if response.status_code == 200:
-            results = response.json().get("results", [])
-            return results[:5] if results else []  # Retorna os primeiros 5 resultados
-        return []
+            data = response.json()
+            results = data.get("results", [])
+            # Registrar as respostas para o índice local de títulos
+            record_search_results(results)
+            return results, data.get("total_pages", 1)
+        return [], 0
     
-    def get_movie_details(self, movie_id):
-        """Obtém detalhes completos de um filme pelo ID."""
+    def get_movie_details(self, movie_id, timeout=None):
+        """Obtém detalhes completos de um filme pelo ID (timeout em segundos, opcional)."""
         endpoint = f"{self.base_url}/movie/{movie_id}"
         params = {
             "api_key": self.api_key,
@@ -42,7 +76,7 @@ class MovieFetcher:
             "append_to_response": "credits,videos,images"
         }
         
-        response = requests.get(endpoint, params=params)
+        response = requests.get(endpoint, params=params, timeout=timeout)
         if response.status_code == 200:
             return response.json()
         return None
@@ -65,6 +99,41 @@ class MovieFetcher:
             return local_path
         return None
     
+    def download_preview_poster(self, poster_path, movie_id, timeout=10):
+        """Baixa o poster pequeno para a pré-visualização (reaproveita o que já está em cache)."""
+        if not poster_path:
+            return None
+        
+        local_path = os.path.join(PREVIEW_CACHE_DIR, f"{movie_id}.jpg")
+        if os.path.exists(local_path):
+            return local_path
+        
+        os.makedirs(PREVIEW_CACHE_DIR, exist_ok=True)
+        response = requests.get(f"{self.preview_poster_url}{poster_path}", stream=True, timeout=timeout)
+        if response.status_code == 200:
+            # Grava em um temporário para que um download interrompido não fique no cache.
+            # iter_content (e não response.raw) converte a leitura parada em exceção do requests
+            temp_path = local_path + ".tmp"
+            with open(temp_path, 'wb') as f:
+                for chunk in response.iter_content(64 * 1024):
+                    f.write(chunk)
+            os.replace(temp_path, local_path)
+            return local_path
+        return None
+    
+    def fetch_thumbnail(self, poster_path, timeout=10):
+        """Baixa a miniatura (w92) de um poster e retorna os bytes da imagem, sem gravar em disco."""
+        if not poster_path:
+            return None
+        response = requests.get(f"{self.thumbnail_base_url}{poster_path}", timeout=timeout)
+        if response.status_code == 200:
+            return response.content
+        return None
+    
+    def clear_preview_cache(self):
+        """Apaga os posters da pré-visualização."""
+        shutil.rmtree(PREVIEW_CACHE_DIR, ignore_errors=True)
+    
     def download_backdrop(self, backdrop_path, movie_id):
         """Baixa a imagem de fundo do filme em resolução alta (1080p ou 720p) e salva localmente."""
         if not backdrop_path:
@@ -95,7 +164,7 @@ class MovieFetcher:
             return None
         
         profile_url = f"{self.profile_base_url}{profile_path}"
-        local_path = f"assets/profile_images/{role}_{person_id}.jpg"
+        local_path = profile_image_path(role, person_id)
         
         # Certifique-se de que o diretório existe
         os.makedirs(os.path.dirname(local_path), exist_ok=True)
@@ -122,11 +191,15 @@ class MovieFetcher:
         return None
         
     def extract_movie_info(self, movie_data):
-        """Extrai informações relevantes do filme."""
+        """Extrai informações relevantes do filme e baixa as imagens (backdrop e fotos do elenco)."""
+        movie_info = self.parse_movie_info(movie_data)
+        self.download_movie_assets(movie_info, include_poster=False)
+        return movie_info
+    
+    def parse_movie_info(self, movie_data):
+        """Extrai informações relevantes do filme, sem baixar nenhuma imagem."""
         directors = []
         cast = []
-        director_profiles = []
-        cast_profiles = []
         
         if "credits" in movie_data:
             # Extrai informações dos diretores
@@ -137,17 +210,6 @@ class MovieFetcher:
                         "name": person["name"],
                         "profile_path": person["profile_path"]
                     })
-                    
-                    if person["profile_path"]:
-                        # Baixa a foto do diretor
-                        profile_local_path = self.download_person_profile(
-                            person["profile_path"], person["id"], "director"
-                        )
-                        director_profiles.append({
-                            "id": person["id"],
-                            "name": person["name"],
-                            "local_path": profile_local_path
-                        })
             
             # Extrai informações do elenco (top 5)
             for person in movie_data["credits"].get("cast", [])[:5]:
@@ -157,17 +219,6 @@ class MovieFetcher:
                     "character": person.get("character", ""),
                     "profile_path": person["profile_path"]
                 })
-                
-                if person["profile_path"]:
-                    # Baixa a foto do ator/atriz
-                    profile_local_path = self.download_person_profile(
-                        person["profile_path"], person["id"], "cast"
-                    )
-                    cast_profiles.append({
-                        "id": person["id"],
-                        "name": person["name"],
-                        "local_path": profile_local_path
-                    })
         
         # Obter trailer do YouTube se disponível
         trailer_key = None
@@ -177,13 +228,6 @@ class MovieFetcher:
                     trailer_key = video["key"]
                     break
         
-        # Baixa o backdrop (imagem de fundo) se disponível
-        backdrop_local_path = None
-        if movie_data.get("backdrop_path"):
-            backdrop_local_path = self.download_backdrop(
-                movie_data["backdrop_path"], movie_data["id"]
-            )
-        
         return {
             "id": movie_data["id"],
             "title": movie_data["title"],
@@ -192,13 +236,48 @@ class MovieFetcher:
             "overview": movie_data["overview"],
             "poster_path": movie_data["poster_path"],
             "backdrop_path": movie_data.get("backdrop_path"),
-            "backdrop_local_path": backdrop_local_path,
+            "backdrop_local_path": None,
             "genres": [genre["name"] for genre in movie_data.get("genres", [])],
             "runtime": movie_data.get("runtime"),
             "vote_average": movie_data.get("vote_average"),
             "directors": directors,
-            "director_profiles": director_profiles,
+            "director_profiles": [],
             "cast": cast,
-            "cast_profiles": cast_profiles,
+            "cast_profiles": [],
             "trailer_key": trailer_key
-        }
\ No newline at end of file
+        }
+    
+    def download_movie_assets(self, movie_info, include_poster=True):
+        """
+        Baixa as imagens definitivas de um filme extraído com parse_movie_info.
+        
+        Args:
+            movie_info: Dicionário retornado por parse_movie_info (é atualizado)
+            include_poster: Também baixa o poster grande (local_poster_path)
+        
+        Returns:
+            dict: O próprio movie_info, com os caminhos locais preenchidos
+        """
+        if include_poster and movie_info.get("poster_path"):
+            movie_info["local_poster_path"] = self.download_poster(
+                movie_info["poster_path"], movie_info["id"]
+            )
+        
+        # Baixa o backdrop (imagem de fundo) se disponível
+        if movie_info.get("backdrop_path"):
+            movie_info["backdrop_local_path"] = self.download_backdrop(
+                movie_info["backdrop_path"], movie_info["id"]
+            )
+        
+        # Baixa as fotos dos diretores e do elenco
+        for people, profiles, role in ((movie_info["directors"], movie_info["director_profiles"], "director"),
+                                       (movie_info["cast"], movie_info["cast_profiles"], "cast")):
+            del profiles[:]
+            for person in people:
+                if person["profile_path"]:
+                    profiles.append({
+                        "id": person["id"],
+                        "name": person["name"],
+                        "local_path": self.download_person_profile(person["profile_path"], person["id"], role)
+                    })
+        return movie_info
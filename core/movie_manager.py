@@ -1,57 +1,401 @@
 import os
 import json
 import shutil
+import atexit
+import threading
 from datetime import datetime
 import mimetypes
 
+from core.catalog_sort import SortIndex
+from core.movie_assets import AssetRegistry, remove_assets_in_background
+from core.fingerprint import compute_fingerprint, file_size
+from core.media_probe import read_media_info, is_final, ffprobe_path
+
+# Eventos enviados aos ouvintes do catálogo: callback(evento, filme)
+MOVIE_ADDED = "added"
+MOVIE_UPDATED = "updated"
+MOVIE_REMOVED = "removed"
+# Mudança ampla (validação, correção de ids, exclusão em lote); o filme enviado é None
+CATALOG_RELOADED = "reloaded"
+
+# Filme cujo arquivo não foi encontrado na última validação. Ele continua no
+# catálogo (com imagens e detalhes) até o arquivo ser reencontrado pela
+# impressão digital em uma nova varredura, ou até o usuário excluí-lo.
+STATUS_MISSING = "missing"
+
+
+class CatalogWriter:
+    """
+    Grava o catálogo em disco a partir de uma única thread.
+    
+    Cada alteração só pede uma gravação; pedidos feitos enquanto uma gravação
+    está em andamento são agrupados em uma só. O arquivo é escrito em um
+    temporário e trocado com os.replace, então um fechamento no meio da
+    gravação nunca deixa o catalog.json truncado.
+    """
+    
+    def __init__(self, catalog_path, get_catalog):
+        """
+        Args:
+            catalog_path: Caminho do catalog.json
+            get_catalog: Função que retorna o catálogo atual (imutável) a gravar
+        """
+        self.catalog_path = catalog_path
+        self.get_catalog = get_catalog
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._requested = 0
+        self._written = 0
+        self._thread = None
+    
+    def request_save(self):
+        """Agenda uma gravação (retorna imediatamente)."""
+        with self._condition:
+            self._requested += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="CatalogWriter", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._written >= self._requested:
+                    self._condition.wait()
+            self.write_pending()
+    
+    def write_pending(self):
+        """Grava o catálogo se houver alteração ainda não gravada."""
+        with self._write_lock:
+            with self._condition:
+                target = self._requested
+            if self._written >= target:
+                return
+            
+            catalog = self.get_catalog()
+            temp_path = self.catalog_path + ".tmp"
+            try:
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(catalog, f, ensure_ascii=False, indent=2)
+                os.replace(temp_path, self.catalog_path)
+            except OSError as e:
+                print(f"Erro ao salvar catálogo: {e}")
+            
+            with self._condition:
+                self._written = target
+                self._condition.notify_all()
+    
+    def flush(self):
+        """Grava imediatamente, na thread que chamou, o que estiver pendente."""
+        self.write_pending()
+
+
+class CatalogIndex:
+    """
+    Índices de uma versão publicada da lista de filmes.
+    
+    Mapeiam id local, caminho do arquivo (inclusive as cópias) e tmdb_id para a posição do filme na
+    lista. Como a lista publicada nunca muda, o índice vale enquanto ela for a
+    atual e é recriado (sob demanda) depois da próxima alteração.
+    """
+    
+    def __init__(self, movies):
+        self.movies = movies
+        self.by_id = {}
+        self.by_file_path = {}
+        self.by_tmdb_id = {}
+        for position, movie in enumerate(movies):
+            self.by_id[movie.get("id")] = position
+            self.by_file_path.setdefault(movie.get("file_path"), position)
+            for file_path in movie.get("alternate_paths", ()):
+                self.by_file_path.setdefault(file_path, position)
+            self.by_tmdb_id.setdefault(movie.get("tmdb_id"), position)
+    
+    def get(self, mapping, key):
+        position = mapping.get(key)
+        return self.movies[position] if position is not None else None
+
+
 class MovieManager:
-    """Classe para gerenciar o catálogo de filmes."""
+    """
+    Classe para gerenciar o catálogo de filmes.
     
-    def __init__(self, catalog_path="data/catalog.json"):
+    Pode ser usada ao mesmo tempo pela interface e pelas threads de importação.
+    As alterações são serializadas por um lock e nunca modificam as listas e os
+    dicionários existentes: cada alteração monta uma nova lista de filmes
+    (cópia na escrita) e a publica de uma vez. Quem leu get_all_movies() ou
+    snapshot() continua com uma versão consistente, que não deve ser
+    modificada. A gravação em disco é feita em segundo plano pelo
+    CatalogWriter, e os ouvintes registrados com add_listener são avisados
+    de cada alteração.
+    """
+    
+    def __init__(self, catalog_path="data/catalog.json", validate_on_load=True):
         self.catalog_path = catalog_path
+        self.validate_on_load = validate_on_load
+        self.lock = threading.RLock()
+        self.listeners = []
+        self._index = None
+        self.sort_index = SortIndex()
+        self.assets = AssetRegistry()
+        self.writer = CatalogWriter(catalog_path, lambda: self.catalog)
+        # Garante que a última alteração chegue ao disco ao fechar o aplicativo
+        atexit.register(self.flush)
         self.catalog = self.load_catalog()
+    
+    def add_listener(self, callback):
+        """Registra uma função chamada como callback(evento, filme) a cada alteração."""
+        self.listeners.append(callback)
+    
+    def remove_listener(self, callback):
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+    
+    def notify(self, event, movie=None):
+        """Avisa os ouvintes (fora do lock, na thread que fez a alteração)."""
+        for callback in list(self.listeners):
+            try:
+                callback(event, movie)
+            except Exception as e:
+                print(f"Erro ao notificar alteração do catálogo: {e}")
+    
+    def publish(self, movies, upserted=(), removed=(), **fields):
+        """
+        Troca a lista de filmes por uma nova e agenda a gravação (chamar com o lock).
+        
+        Args:
+            movies: Nova lista de filmes
+            upserted: Filmes incluídos ou alterados, aplicados aos índices de ordenação
+            removed: Filmes excluídos, retirados dos índices de ordenação
+            **fields: Outros campos do catálogo a gravar junto (ex: next_id)
+        
+        Returns:
+            set: Imagens que nenhum filme usa mais (só com upserted/removed)
+        """
+        previous = self.snapshot()
+        self.catalog = {**self.catalog, "movies": movies, **fields}
+        released = set()
+        if upserted or removed:
+            self.sort_index.apply(previous, movies, upserted, removed)
+            released = self.assets.apply(previous, movies, upserted, removed)
+        self.save_catalog()
+        return released
+    
+    def is_asset_referenced(self, path):
+        """Indica se uma imagem local é usada por algum filme do catálogo."""
+        return self.assets.is_referenced(path, self.snapshot())
+    
+    def snapshot(self):
+        """Retorna a lista de filmes atual; ela não muda depois de publicada."""
+        return self.catalog.get("movies", [])
+    
+    def index(self):
+        """Retorna os índices da lista atual, recriando-os se ela mudou."""
+        movies = self.snapshot()
+        index = self._index
+        if index is None or index.movies is not movies:
+            index = CatalogIndex(movies)
+            self._index = index
+        return index
+    
+    def repair_ids(self):
+        """
+        Corrige ids locais repetidos ou inválidos e inicializa o next_id.
+        
+        Catálogos antigos usavam len(movies) + 1 como id, o que repete ids
+        depois de exclusões. A primeira ocorrência de cada id é mantida e as
+        repetidas recebem ids novos. O next_id gravado no catálogo nunca volta,
+        então um id nunca é reaproveitado.
+        
+        Returns:
+            int: Número de filmes que receberam um novo id
+        """
+        with self.lock:
+            movies = self.snapshot()
+            valid_ids = [movie.get("id") for movie in movies if type(movie.get("id")) is int]
+            next_id = max(self.catalog.get("next_id", 1), max(valid_ids, default=0) + 1)
+            
+            seen_ids = set()
+            repaired = []
+            repaired_count = 0
+            for movie in movies:
+                movie_id = movie.get("id")
+                if type(movie_id) is not int or movie_id in seen_ids:
+                    movie = {**movie, "id": next_id}
+                    next_id += 1
+                    repaired_count += 1
+                seen_ids.add(movie["id"])
+                repaired.append(movie)
+            
+            if repaired_count or self.catalog.get("next_id") != next_id:
+                self.publish(repaired, next_id=next_id)
+        
+        if repaired_count:
+            print(f"Catálogo: {repaired_count} filmes com id repetido ou inválido receberam um novo id.")
+        return repaired_count
 
     def validate_movie_files(self):
         """
         Verifica se os arquivos de todos os filmes do catálogo ainda existem.
-        Remove automaticamente os filmes cujos arquivos não são mais válidos.
+        
+        Filmes cujos arquivos sumiram não são removidos: ficam com o status
+        STATUS_MISSING, e voltam ao normal se o arquivo reaparecer no mesmo
+        caminho ou for reencontrado por relink_missing.
         
         Returns:
             dict: Um dicionário com informações sobre a validação:
                 - 'valid_count': Número de filmes com arquivos válidos
-                - 'removed_count': Número de filmes removidos
-                - 'removed_movies': Lista com os títulos dos filmes removidos
+                - 'missing_count': Número de filmes sem arquivo
+                - 'missing_movies': Lista com os títulos dos filmes sem arquivo
         """
-        movies = self.catalog.get("movies", [])
-        valid_movies = []
-        removed_movies = []
+        movies = self.snapshot()
+        changed = {}
+        missing_movies = []
         
         for movie in movies:
             file_path = movie.get("file_path")
             
             # Verifica se o caminho do arquivo existe e é um arquivo de vídeo válido
-            if file_path and os.path.exists(file_path) and self.is_video_file(file_path):
-                valid_movies.append(movie)
-            else:
-                removed_movies.append(movie)
-                
-                # Remover o poster se existir
-                if movie.get("local_poster_path") and os.path.exists(movie["local_poster_path"]):
-                    try:
-                        os.remove(movie["local_poster_path"])
-                    except:
-                        pass
-        
-        # Se algum filme foi removido, atualiza o catálogo
-        if len(removed_movies) > 0:
-            self.catalog["movies"] = valid_movies
-            self.save_catalog()
+            present = bool(file_path) and self.is_video_file(file_path)
+            if not present:
+                missing_movies.append(movie)
+            if present == (movie.get("status") == STATUS_MISSING):
+                changed[movie.get("id")] = STATUS_MISSING if not present else None
+        
+        # Atualiza só os filmes que mudaram de estado (mantendo os adicionados durante a validação)
+        if changed:
+            with self.lock:
+                movies = list(self.snapshot())
+                updated = []
+                for i, movie in enumerate(movies):
+                    if movie.get("id") in changed:
+                        movies[i] = self._with_status(movie, changed[movie.get("id")])
+                        updated.append(movies[i])
+                self.publish(movies, upserted=updated)
+            self.notify(CATALOG_RELOADED)
         
         return {
-            "valid_count": len(valid_movies),
-            "removed_count": len(removed_movies),
-            "removed_movies": [movie.get("title") for movie in removed_movies]
+            "valid_count": len(movies) - len(missing_movies),
+            "missing_count": len(missing_movies),
+            "missing_movies": [movie.get("title") for movie in missing_movies]
         }
+    
+    @staticmethod
+    def _with_status(movie, status):
+        """Cópia do filme com o status indicado (None retira o status)."""
+        movie = dict(movie)
+        if status is None:
+            movie.pop("status", None)
+        else:
+            movie["status"] = status
+        return movie
+    
+    @staticmethod
+    def is_missing(movie):
+        """Indica se o arquivo do filme não foi encontrado na última validação."""
+        return movie.get("status") == STATUS_MISSING
+    
+    def fill_file_details(self):
+        """
+        Calcula a impressão digital e as informações técnicas que faltam.
+        
+        Catálogos antigos não guardavam nenhuma das duas; elas são lidas uma
+        única vez por arquivo (128 KB e uma chamada do ffprobe) e gravadas com
+        uma só alteração do catálogo. Informações lidas só do cabeçalho são
+        completadas quando o ffprobe estiver instalado; arquivos em que ele
+        já falhou não são lidos de novo.
+        
+        Returns:
+            int: Número de filmes atualizados
+        """
+        can_probe = ffprobe_path() is not None
+        computed = {}
+        for movie in self.snapshot():
+            file_path = movie.get("file_path")
+            if self.is_missing(movie) or not file_path:
+                continue
+            details = {}
+            if not movie.get("fingerprint"):
+                fingerprint = compute_fingerprint(file_path)
+                if fingerprint:
+                    details.update(fingerprint=fingerprint, file_size=file_size(file_path))
+            media_info = movie.get("media_info")
+            if not media_info or (can_probe and not is_final(media_info)):
+                media_info = read_media_info(file_path)
+                if media_info != movie.get("media_info"):
+                    details["media_info"] = media_info
+            if details:
+                computed[movie.get("id")] = (file_path, details)
+        if not computed:
+            return 0
+        
+        with self.lock:
+            movies = list(self.snapshot())
+            updated = []
+            for i, movie in enumerate(movies):
+                entry = computed.get(movie.get("id"))
+                # Ignora filmes que trocaram de arquivo enquanto a leitura rodava
+                if entry and entry[0] == movie.get("file_path"):
+                    movies[i] = {**movie, **entry[1]}
+                    updated.append(movies[i])
+            if updated:
+                self.publish(movies, upserted=updated)
+        return len(updated)
+    
+    def relink_missing(self, file_paths):
+        """
+        Associa filmes sem arquivo aos arquivos encontrados em uma varredura.
+        
+        Só arquivos com o mesmo tamanho de um filme sem arquivo têm a
+        impressão digital calculada, então a maior parte da varredura não lê
+        nada além do tamanho. Nenhum acesso à rede é feito.
+        
+        Args:
+            file_paths: Caminhos de arquivos de vídeo encontrados
+        
+        Returns:
+            list: Filmes reassociados, já com o novo caminho
+        """
+        by_size = {}
+        for movie in self.snapshot():
+            if self.is_missing(movie) and movie.get("fingerprint") and movie.get("file_size"):
+                by_size.setdefault(movie["file_size"], []).append(movie)
+        if not by_size:
+            return []
+        
+        matches = {}
+        for file_path in file_paths:
+            candidates = by_size.get(file_size(file_path))
+            if not candidates or self.find_by_file_path(file_path) is not None:
+                continue
+            fingerprint = compute_fingerprint(file_path)
+            for movie in candidates:
+                if movie["fingerprint"] == fingerprint and movie.get("id") not in matches:
+                    matches[movie.get("id")] = file_path
+                    break
+        if not matches:
+            return []
+        
+        with self.lock:
+            movies = list(self.snapshot())
+            relinked = []
+            for i, movie in enumerate(movies):
+                file_path = matches.get(movie.get("id"))
+                if file_path and self.is_missing(movie):
+                    movies[i] = self._with_status({**movie, "file_path": file_path,
+                                                   "last_updated": datetime.now().isoformat()}, None)
+                    relinked.append(movies[i])
+            if relinked:
+                self.publish(movies, upserted=relinked)
+        
+        if len(relinked) == 1:
+            self.notify(MOVIE_UPDATED, relinked[0])
+        elif relinked:
+            self.notify(CATALOG_RELOADED)
+        if relinked:
+            print(f"Arquivos reencontrados pela impressão digital: {len(relinked)} filmes")
+        return relinked
+    
     def load_catalog(self):
         """Carrega o catálogo de filmes do arquivo JSON e valida os arquivos dos filmes."""
         if os.path.exists(self.catalog_path):
@@ -61,13 +405,16 @@ class MovieManager:
                     
                     # Armazena o catálogo carregado
                     self.catalog = catalog
+                    self.repair_ids()
+                    if not self.validate_on_load:
+                        return self.catalog
                     
                     # Valida os arquivos dos filmes
                     validation_result = self.validate_movie_files()
                     
                     # Log dos resultados da validação (opcional)
-                    if validation_result["removed_count"] > 0:
-                        print(f"Validação de filmes: {validation_result['removed_count']} filmes foram removidos porque os arquivos não existem mais.")
+                    if validation_result["missing_count"] > 0:
+                        print(f"Validação de filmes: {validation_result['missing_count']} filmes estão com o arquivo ausente.")
                     
                     return self.catalog
             except json.JSONDecodeError:
@@ -75,53 +422,103 @@ class MovieManager:
         return {"movies": []}
     
     def save_catalog(self):
-        """Salva o catálogo de filmes no arquivo JSON."""
-        with open(self.catalog_path, 'w', encoding='utf-8') as f:
-            json.dump(self.catalog, f, ensure_ascii=False, indent=2)
+        """Agenda a gravação do catálogo no arquivo JSON (feita em segundo plano)."""
+        self.writer.request_save()
+    
+    def flush(self):
+        """Grava imediatamente as alterações pendentes."""
+        self.writer.flush()
     
     def get_all_movies(self):
         """Retorna todos os filmes do catálogo."""
-        return self.catalog.get("movies", [])
+        return self.snapshot()
+    
+    def get_sorted_movies(self, order=None):
+        """
+        Retorna os filmes em uma das ordenações de core.catalog_sort.
+        
+        Usa os índices de ordenação mantidos a cada alteração, sem reordenar a
+        lista. A ordem do catálogo (de inclusão) não muda.
+        
+        Args:
+            order: Nome da ordenação (ex: "title"); None mantém a ordem do catálogo
+        """
+        if order is None:
+            return self.snapshot()
+        with self.lock:
+            index = self.index()
+            ordered_ids = self.sort_index.ordered_ids(order, index.movies)
+        return [index.movies[index.by_id[movie_id]] for movie_id in ordered_ids]
     
     def get_movie_by_id(self, movie_id):
         """Busca um filme pelo ID."""
-        for movie in self.catalog.get("movies", []):
-            if movie.get("id") == movie_id:
-                return movie
-        return None
+        index = self.index()
+        return index.get(index.by_id, movie_id)
+    
+    def find_by_file_path(self, file_path):
+        """Busca um filme pelo caminho do arquivo."""
+        index = self.index()
+        return index.get(index.by_file_path, file_path)
     
     def add_movie(self, movie_info, file_path):
         """Adiciona um novo filme ao catálogo."""
-        movies = self.catalog.get("movies", [])
+        # Lida fora do lock: são 128 KB do arquivo, feitos uma única vez
+        fingerprint = compute_fingerprint(file_path)
+        size = file_size(file_path)
+        with self.lock:
+            movie, event = self._add_movie_locked(movie_info, file_path, fingerprint, size)
+        self.notify(event, movie)
+        return movie
+    
+    def _add_movie_locked(self, movie_info, file_path, fingerprint=None, size=None):
+        index = self.index()
+        movies = list(index.movies)
         
         # Verifica se o filme já existe no catálogo
-        for i, movie in enumerate(movies):
-            if movie.get("tmdb_id") == movie_info.get("id"):
-                # Atualiza o filme existente
-                movies[i].update({
-                    "tmdb_id": movie_info.get("id"),
-                    "title": movie_info.get("title"),
-                    "original_title": movie_info.get("original_title"),
-                    "release_date": movie_info.get("release_date"),
-                    "overview": movie_info.get("overview"),
-                    "local_poster_path": movie_info.get("local_poster_path"),
-                    "backdrop_local_path": movie_info.get("backdrop_local_path"),
-                    "genres": movie_info.get("genres", []),
-                    "runtime": movie_info.get("runtime"),
-                    "vote_average": movie_info.get("vote_average"),
-                    "directors": movie_info.get("directors", []),
-                    "cast": movie_info.get("cast", []),
-                    "trailer_key": movie_info.get("trailer_key"),
-                    "file_path": file_path,
-                    "date_added": datetime.now().isoformat(),
-                    "last_updated": datetime.now().isoformat(),
-                })
-                self.save_catalog()
-                return movies[i]
-        
-        # Adiciona um novo filme
+        i = index.by_tmdb_id.get(movie_info.get("id"))
+        if i is not None:
+            movie = movies[i]
+            # Atualiza o filme existente (em uma cópia)
+            updates = {
+                "tmdb_id": movie_info.get("id"),
+                "title": movie_info.get("title"),
+                "original_title": movie_info.get("original_title"),
+                "release_date": movie_info.get("release_date"),
+                "overview": movie_info.get("overview"),
+                "local_poster_path": movie_info.get("local_poster_path"),
+                "backdrop_local_path": movie_info.get("backdrop_local_path"),
+                "genres": movie_info.get("genres", []),
+                "runtime": movie_info.get("runtime"),
+                "vote_average": movie_info.get("vote_average"),
+                "directors": movie_info.get("directors", []),
+                "cast": movie_info.get("cast", []),
+                "trailer_key": movie_info.get("trailer_key"),
+                "file_path": file_path,
+                "fingerprint": fingerprint,
+                "file_size": size,
+                "media_info": movie_info.get("media_info"),
+                "date_added": datetime.now().isoformat(),
+                "last_updated": datetime.now().isoformat(),
+            }
+            current_path = movie.get("file_path")
+            if current_path and current_path != file_path and not self.is_missing(movie) \
+                    and os.path.exists(current_path):
+                # Outro arquivo do mesmo filme (cópia em outra pasta ou outra versão):
+                # o arquivo principal continua e o novo fica registrado como cópia
+                alternate_paths = list(movie.get("alternate_paths", []))
+                if file_path not in alternate_paths:
+                    alternate_paths.append(file_path)
+                for key in ("file_path", "fingerprint", "file_size", "media_info", "date_added"):
+                    del updates[key]
+                updates["alternate_paths"] = alternate_paths
+            movies[i] = self._with_status({**movie, **updates}, None)
+            self.publish(movies, upserted=(movies[i],))
+            return movies[i], MOVIE_UPDATED
+        
+        # Adiciona um novo filme com o próximo id local (nunca reaproveitado)
+        new_id = self.catalog.get("next_id", 1)
         new_movie = {
-            "id": len(movies) + 1,  # ID local
+            "id": new_id,
             "tmdb_id": movie_info.get("id"),
             "title": movie_info.get("title"),
             "original_title": movie_info.get("original_title"),
@@ -136,42 +533,69 @@ class MovieManager:
             "cast": movie_info.get("cast", []),
             "trailer_key": movie_info.get("trailer_key"),
             "file_path": file_path,
+            "fingerprint": fingerprint,
+            "file_size": size,
+            "media_info": movie_info.get("media_info"),
             "date_added": datetime.now().isoformat(),
             "last_updated": datetime.now().isoformat(),
         }
         movies.append(new_movie)
-        self.catalog["movies"] = movies
-        self.save_catalog()
-        return new_movie
+        self.publish(movies, upserted=(new_movie,), next_id=new_id + 1)
+        return new_movie, MOVIE_ADDED
     
     def update_movie(self, movie_id, updated_info):
         """Atualiza as informações de um filme existente."""
-        movies = self.catalog.get("movies", [])
-        for i, movie in enumerate(movies):
-            if movie.get("id") == movie_id:
-                movies[i].update(updated_info)
-                movies[i]["last_updated"] = datetime.now().isoformat()
-                self.save_catalog()
-                return movies[i]
-        return None
+        with self.lock:
+            index = self.index()
+            i = index.by_id.get(movie_id)
+            if i is None:
+                return None
+            movies = list(index.movies)
+            updated = {**movies[i], **updated_info, "last_updated": datetime.now().isoformat()}
+            movies[i] = updated
+            self.publish(movies, upserted=(updated,))
+        self.notify(MOVIE_UPDATED, updated)
+        return updated
     
     def delete_movie(self, movie_id):
         """Remove um filme do catálogo."""
-        movies = self.catalog.get("movies", [])
-        for i, movie in enumerate(movies):
-            if movie.get("id") == movie_id:
-                removed = movies.pop(i)
-                self.catalog["movies"] = movies
-                self.save_catalog()
-                
-                # Remover o poster se existir
-                if removed.get("local_poster_path") and os.path.exists(removed["local_poster_path"]):
-                    try:
-                        os.remove(removed["local_poster_path"])
-                    except:
-                        pass
-                return True
-        return False
+        return bool(self.delete_many([movie_id]))
+    
+    def delete_many(self, movie_ids):
+        """
+        Remove vários filmes com uma única alteração (e gravação) do catálogo.
+        
+        As imagens que ficam sem referência são apagadas em segundo plano; as
+        fotos de pessoas que aparecem em outros filmes são mantidas.
+        
+        Args:
+            movie_ids: Ids locais dos filmes a remover
+        
+        Returns:
+            list: Filmes removidos (ids inexistentes são ignorados)
+        """
+        movie_ids = set(movie_ids)
+        with self.lock:
+            movies = []
+            removed = []
+            for movie in self.snapshot():
+                (removed if movie.get("id") in movie_ids else movies).append(movie)
+            if not removed:
+                return []
+            released = self.publish(movies, removed=removed)
+        
+        # Um filme sai da interface de forma incremental; muitos, com uma recarga só
+        if len(removed) == 1:
+            self.notify(MOVIE_REMOVED, removed[0])
+        else:
+            self.notify(CATALOG_RELOADED)
+        
+        remove_assets_in_background(released)
+        return removed
+    
+    def delete_all(self):
+        """Remove todos os filmes do catálogo."""
+        return self.delete_many([movie.get("id") for movie in self.snapshot()])
     
     def is_video_file(self, file_path):
         """Verifica se o arquivo é um vídeo."""
@@ -0,0 +1,42 @@
+import os
+import json
+import threading
+
+# Preferências de exibição (ex: ordenação da grade), gravadas à parte do
+# catálogo em data/preferences.json.
+
+PREFERENCES_PATH = os.path.join("data", "preferences.json")
+
+_lock = threading.Lock()
+
+
+def load_preferences(path=PREFERENCES_PATH):
+    """Carrega as preferências salvas (dicionário vazio se não houver)."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            preferences = json.load(f)
+        return preferences if isinstance(preferences, dict) else {}
+    except (OSError, ValueError) as e:
+        print(f"Erro ao carregar preferências: {e}")
+        return {}
+
+
+def get_preference(key, default=None, path=PREFERENCES_PATH):
+    return load_preferences(path).get(key, default)
+
+
+def set_preference(key, value, path=PREFERENCES_PATH):
+    """Grava uma preferência (arquivo temporário trocado pelo atual)."""
+    with _lock:
+        preferences = load_preferences(path)
+        preferences[key] = value
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            temp_path = path + ".tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(preferences, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Erro ao salvar preferências: {e}")
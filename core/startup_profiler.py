@@ -0,0 +1,43 @@
+import os
+import sys
+import time
+
+# Perfil de inicialização. Ative com a variável de ambiente PIPOCA_PROFILE_STARTUP=1
+# para imprimir o tempo de cada etapa até o primeiro frame. Para o detalhamento
+# por módulo importado, rode também com: python -X importtime main.py 2> importtime.log
+
+ENABLED = os.environ.get("PIPOCA_PROFILE_STARTUP") == "1"
+
+_start_time = time.perf_counter()
+_marks = []
+_reported = False
+
+
+def mark(label):
+    """Registra o instante em que uma etapa da inicialização terminou."""
+    if ENABLED:
+        _marks.append((label, time.perf_counter()))
+
+
+def report(output=None):
+    """
+    Imprime o relatório de inicialização (uma única vez por execução).
+
+    Para cada etapa mostra o tempo acumulado desde o início do processo e a
+    duração da própria etapa, além do número de módulos carregados.
+    """
+    global _reported
+    if not ENABLED or _reported:
+        return
+    _reported = True
+
+    output = output or sys.stderr
+    print("Relatório de inicialização (ms):", file=output)
+    print(f"{'etapa':<40} {'total':>10} {'etapa':>10}", file=output)
+    previous = _start_time
+    for label, timestamp in _marks:
+        total_ms = (timestamp - _start_time) * 1000
+        step_ms = (timestamp - previous) * 1000
+        print(f"{label:<40} {total_ms:>10.1f} {step_ms:>10.1f}", file=output)
+        previous = timestamp
+    print(f"Módulos carregados: {len(sys.modules)}", file=output)
@@ -0,0 +1,374 @@
+import os
+import sys
+import gzip
+import json
+import mmap
+import heapq
+import threading
+
+from core.title_matcher import normalize_title, get_scorer
+
+# Índice local de títulos (título normalizado + ano -> tmdb_id), usado para
+# identificar filmes sem chamar a busca do TMDB.
+#
+# O índice é um arquivo de texto ordenado, uma entrada por linha:
+#     chave \t ano \t tmdb_id \t título
+# lido por memória mapeada e pesquisado por busca binária, sem carregar o
+# arquivo inteiro. As fontes são o export diário de IDs do TMDB
+# (movie_ids_MM_DD_YYYY.json.gz, só título original e sem ano), o diário de
+# respostas da busca gravado pelo MovieFetcher e o próprio catálogo.
+
+INDEX_PATH = os.path.join("data", "title_index.txt")
+JOURNAL_PATH = os.path.join("data", "title_index_journal.jsonl")
+
+# Ano desconhecido (entradas do export do TMDB)
+UNKNOWN_YEAR = 0
+
+# O diário é incorporado ao arquivo ordenado quando passa deste número de linhas
+COMPACT_THRESHOLD = 500
+
+_journal_lock = threading.Lock()
+
+
+def make_entry(title, year, tmdb_id):
+    """Cria uma entrada (chave, ano, id, título) ou None se o título for vazio."""
+    key = normalize_title(title)
+    if not key or not tmdb_id:
+        return None
+    return (key, int(year or UNKNOWN_YEAR), int(tmdb_id), " ".join(title.split()))
+
+
+def movie_entries(movie):
+    """Entradas de um filme no formato do TMDB (título traduzido e original)."""
+    release_date = movie.get("release_date") or ""
+    year = int(release_date[:4]) if release_date[:4].isdigit() else UNKNOWN_YEAR
+    entries = set()
+    for title in (movie.get("title"), movie.get("original_title")):
+        entry = make_entry(title or "", year, movie.get("id"))
+        if entry:
+            entries.add(entry)
+    return entries
+
+
+def entries_from_export(path):
+    """Lê o export diário de IDs do TMDB (JSON por linha, compactado com gzip)."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            try:
+                item = json.loads(line)
+            except ValueError:
+                continue
+            if item.get("adult") or item.get("video"):
+                continue
+            entry = make_entry(item.get("original_title") or "", UNKNOWN_YEAR, item.get("id"))
+            if entry:
+                yield entry
+
+
+def entries_from_journal(path=JOURNAL_PATH):
+    """Lê as respostas de busca registradas pelo MovieFetcher."""
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                movie = json.loads(line)
+            except ValueError:
+                continue
+            yield from movie_entries(movie)
+
+
+def entries_from_catalog(movies):
+    """Entradas dos filmes já catalogados."""
+    for movie in movies:
+        year = (movie.get("release_date") or "")[:4]
+        for title in (movie.get("title"), movie.get("original_title")):
+            entry = make_entry(title or "", year if year.isdigit() else UNKNOWN_YEAR, movie.get("tmdb_id"))
+            if entry:
+                yield entry
+
+
+def record_search_results(results, path=JOURNAL_PATH):
+    """Acrescenta resultados de uma busca do TMDB ao diário do índice."""
+    if not results:
+        return
+    lines = []
+    for movie in results:
+        lines.append(json.dumps({
+            "id": movie.get("id"),
+            "title": movie.get("title"),
+            "original_title": movie.get("original_title"),
+            "release_date": movie.get("release_date"),
+        }, ensure_ascii=False))
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with _journal_lock, open(path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+    except OSError as e:
+        print(f"Erro ao registrar busca no índice de títulos: {e}")
+
+
+def preferred_entry(current, entry):
+    """Entre duas entradas do mesmo título e id, prefere a que tem ano conhecido."""
+    if current is None or (current[1] == UNKNOWN_YEAR and entry[1] != UNKNOWN_YEAR):
+        return entry
+    return current
+
+
+def format_line(entry):
+    key, year, tmdb_id, title = entry
+    return f"{key}\t{year}\t{tmdb_id}\t{title.replace(chr(9), ' ')}\n"
+
+
+def parse_line(line):
+    key, year, tmdb_id, title = line.rstrip("\n").split("\t", 3)
+    return key, int(year), int(tmdb_id), title
+
+
+def build_index(sources, path=INDEX_PATH):
+    """
+    Monta o arquivo do índice a partir de fontes de entradas.
+
+    As entradas são ordenadas pela chave e repetições (mesma chave e id) são
+    removidas, preferindo a que tem ano conhecido. O arquivo é gravado em um
+    temporário e trocado no final, então leitores nunca veem um índice parcial.
+
+    Args:
+        sources: Iteráveis de entradas (chave, ano, tmdb_id, título)
+        path: Caminho do arquivo do índice
+
+    Returns:
+        int: Número de entradas gravadas
+    """
+    best = {}
+    for source in sources:
+        for entry in source:
+            best[(entry[0], entry[2])] = preferred_entry(best.get((entry[0], entry[2])), entry)
+    return write_index(sorted(best.values()), path)
+
+
+def write_index(entries, path=INDEX_PATH):
+    """Grava entradas já ordenadas no arquivo do índice (troca atômica)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = path + ".tmp"
+    count = 0
+    with open(temp_path, "w", encoding="utf-8", newline="\n") as f:
+        for entry in entries:
+            f.write(format_line(entry))
+            count += 1
+    os.replace(temp_path, path)
+    return count
+
+
+class TitleIndex:
+    """
+    Consulta ao índice local de títulos.
+
+    A busca por prefixo localiza a primeira linha com a chave procurada por
+    busca binária no arquivo mapeado e percorre as linhas seguintes. A busca
+    aproximada tenta prefixos cada vez mais curtos do título (completo, duas
+    palavras, uma palavra) e pontua os candidatos com o pontuador de títulos.
+    Respostas registradas no diário desde a última compactação são consultadas
+    em memória.
+    """
+
+    def __init__(self, path=INDEX_PATH, journal_path=JOURNAL_PATH, min_score=0.85, max_scan=2000):
+        """
+        Args:
+            path: Arquivo do índice ordenado
+            journal_path: Diário de respostas de busca ainda não incorporado
+            min_score: Pontuação mínima para aceitar um resultado local
+            max_scan: Número máximo de linhas percorridas por prefixo
+        """
+        self.path = path
+        self.journal_path = journal_path
+        self.min_score = min_score
+        self.max_scan = max_scan
+        self.scorer = get_scorer()
+        self._file = None
+        self._map = None
+        self._journal_entries = []
+
+    def open(self):
+        """Mapeia o índice e carrega o diário. Retorna False se não houver nada para consultar."""
+        self.close()
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            self._file = open(self.path, "rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._journal_entries = sorted(set(entries_from_journal(self.journal_path)))
+        return self._map is not None or bool(self._journal_entries)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _lower_bound(self, key):
+        """Posição da primeira linha cuja chave é >= key."""
+        data = self._map
+        low, high = 0, len(data)
+        while low < high:
+            middle = (low + high) // 2
+            start = data.rfind(b"\n", 0, middle) + 1
+            end = data.find(b"\n", start)
+            if end == -1:
+                end = len(data)
+            if data[start:data.find(b"\t", start, end)] < key:
+                low = end + 1
+            else:
+                high = start
+        return low
+
+    def prefix_search(self, prefix):
+        """Gera as entradas cuja chave começa com o prefixo (já normalizado)."""
+        scanned = 0
+        if self._map is not None:
+            encoded = prefix.encode("utf-8")
+            position = self._lower_bound(encoded)
+            data = self._map
+            while position < len(data) and scanned < self.max_scan:
+                end = data.find(b"\n", position)
+                if end == -1:
+                    end = len(data)
+                line = data[position:end]
+                if not line.startswith(encoded):
+                    break
+                yield parse_line(line.decode("utf-8"))
+                scanned += 1
+                position = end + 1
+
+        for entry in self._journal_entries:
+            if entry[0].startswith(prefix):
+                yield entry
+
+    def lookup(self, title, year=None):
+        """
+        Procura um título no índice.
+
+        Args:
+            title: Título extraído do nome do arquivo
+            year: Ano extraído do nome do arquivo (opcional)
+
+        Com o ano informado, entradas do mesmo ano vêm antes das de ano
+        vizinho (±1), e estas antes das de ano desconhecido (export do TMDB).
+
+        Returns:
+            list: Resultados no formato da busca do TMDB (id, title,
+            original_title, release_date), do mais para o menos compatível
+        """
+        key = normalize_title(title)
+        if not key:
+            return []
+
+        words = key.split()
+        # O último prefixo (três letras) cobre erros de digitação no fim da primeira palavra
+        prefixes = [key, " ".join(words[:2]), words[0], words[0][:3]]
+        candidates = {}
+        for prefix in dict.fromkeys(prefixes):
+            for entry_key, entry_year, tmdb_id, entry_title in self.prefix_search(prefix):
+                # Entradas sem ano (export do TMDB) são aceitas; com ano, tolera ±1
+                if year and entry_year != UNKNOWN_YEAR and abs(entry_year - year) > 1:
+                    continue
+                score = self.scorer.score(key, entry_key)
+                if score < self.min_score:
+                    continue
+                rank = (self._year_rank(entry_year, year), -score)
+                current = candidates.get(tmdb_id)
+                if current is None or rank < current[0]:
+                    candidates[tmdb_id] = (rank, entry_title, entry_year)
+            if candidates:
+                break
+
+        ranked = sorted(candidates.items(), key=lambda item: item[1][0])
+        return [
+            {
+                "id": tmdb_id,
+                "title": entry_title,
+                "original_title": entry_title,
+                "release_date": str(entry_year) if entry_year != UNKNOWN_YEAR else "",
+            }
+            for tmdb_id, (rank, entry_title, entry_year) in ranked
+        ]
+
+    @staticmethod
+    def _year_rank(entry_year, year):
+        """0 para o mesmo ano (ou sem ano procurado), 1 para ano vizinho e 2 para ano desconhecido."""
+        if not year or entry_year == year:
+            return 0
+        if entry_year == UNKNOWN_YEAR:
+            return 2
+        return 1
+
+    def compact(self, catalog_movies=()):
+        """
+        Incorpora o diário (e o catálogo) ao arquivo ordenado.
+
+        O arquivo existente é lido em sequência e intercalado com as novas
+        entradas já ordenadas, sem carregar o índice inteiro em memória. O
+        diário é renomeado antes da leitura para que buscas registradas
+        durante a compactação não se percam.
+        """
+        pending_path = self.journal_path + ".compacting"
+        with _journal_lock:
+            if os.path.exists(self.journal_path):
+                os.replace(self.journal_path, pending_path)
+        new_entries = set(entries_from_journal(pending_path)) | set(entries_from_catalog(catalog_movies))
+        if not new_entries:
+            return 0
+
+        existing = []
+        if self._map is not None:
+            self._map.seek(0)
+            existing = (parse_line(line.decode("utf-8")) for line in iter(self._map.readline, b""))
+
+        def deduplicated(entries):
+            # As entradas de uma chave são contíguas: agrupa por id e mantém a
+            # de ano conhecido, como em build_index
+            current_key = None
+            best = {}
+            for entry in entries:
+                if entry[0] != current_key:
+                    yield from sorted(best.values())
+                    current_key = entry[0]
+                    best = {}
+                best[entry[2]] = preferred_entry(best.get(entry[2]), entry)
+            yield from sorted(best.values())
+
+        temp_path = self.path + ".new"
+        count = write_index(deduplicated(heapq.merge(existing, sorted(new_entries))), temp_path)
+        self.close()
+        os.replace(temp_path, self.path)
+        if os.path.exists(pending_path):
+            os.remove(pending_path)
+        self.open()
+        return count
+
+    def compact_if_needed(self, catalog_movies=()):
+        """Compacta quando o diário ficou grande."""
+        if len(self._journal_entries) >= COMPACT_THRESHOLD:
+            return self.compact(catalog_movies)
+        return 0
+
+
+def main():
+    """Uso: python -m core.title_index movie_ids_MM_DD_YYYY.json.gz [catalog.json]"""
+    if len(sys.argv) < 2:
+        print(main.__doc__)
+        return
+    sources = [entries_from_export(sys.argv[1]), entries_from_journal()]
+    catalog_path = sys.argv[2] if len(sys.argv) > 2 else os.path.join("data", "catalog.json")
+    if os.path.exists(catalog_path):
+        with open(catalog_path, "r", encoding="utf-8") as f:
+            sources.append(entries_from_catalog(json.load(f).get("movies", [])))
+    count = build_index(sources)
+    if os.path.exists(JOURNAL_PATH):
+        os.remove(JOURNAL_PATH)
+    print(f"Índice de títulos criado com {count} entradas em {INDEX_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import re
+import unicodedata
+from functools import lru_cache
+from difflib import SequenceMatcher
+
+# Pontuadores de similaridade entre o título buscado e os resultados do TMDB.
+# Todos expõem score(query, title) -> float entre 0 e 1 e score_movie(query, movie),
+# que considera o título, o título original e os títulos alternativos.
+
+NON_ALNUM_RE = re.compile(r"[^0-9a-z]+")
+
+
+@lru_cache(maxsize=4096)
+def normalize_title(title):
+    """Normaliza um título para comparação (sem acentos, minúsculas, só letras e números)."""
+    title = unicodedata.normalize("NFKD", title or "")
+    title = "".join(char for char in title if not unicodedata.combining(char))
+    return NON_ALNUM_RE.sub(" ", title.casefold()).strip()
+
+
+def bounded_levenshtein(a, b, max_distance):
+    """
+    Distância de edição limitada a max_distance (retorna max_distance + 1 acima disso).
+
+    Usa o algoritmo bit-paralelo de Myers/Hyyrö: cada coluna da matriz de
+    programação dinâmica é representada por inteiros, então o custo é
+    O(len(b)) operações em vez de O(len(a) * len(b)). Strings com diferença de
+    tamanho maior que o limite são descartadas sem cálculo, e o laço para assim
+    que a distância já não pode voltar para dentro do limite.
+    """
+    limit = max_distance + 1
+    if abs(len(a) - len(b)) > max_distance:
+        return limit
+    if not a or not b:
+        return max(len(a), len(b))
+
+    # Máscara de posições de cada caractere em a
+    positions = {}
+    bit = 1
+    for char in a:
+        positions[char] = positions.get(char, 0) | bit
+        bit <<= 1
+    all_ones = bit - 1
+    last_bit = bit >> 1
+
+    vertical_plus = all_ones
+    vertical_minus = 0
+    distance = len(a)
+    remaining = len(b)
+    for char in b:
+        equal = positions.get(char, 0)
+        x_vertical = equal | vertical_minus
+        x_horizontal = (((equal & vertical_plus) + vertical_plus) ^ vertical_plus) | equal
+        horizontal_plus = vertical_minus | ~(x_horizontal | vertical_plus)
+        horizontal_minus = vertical_plus & x_horizontal
+        if horizontal_plus & last_bit:
+            distance += 1
+        elif horizontal_minus & last_bit:
+            distance -= 1
+        remaining -= 1
+        # Cada caractere restante reduz a distância em no máximo 1
+        if distance - remaining > max_distance:
+            return limit
+        horizontal_plus = (horizontal_plus << 1) | 1
+        horizontal_minus <<= 1
+        vertical_plus = (horizontal_minus | ~(x_vertical | horizontal_plus)) & all_ones
+        vertical_minus = horizontal_plus & x_vertical
+
+    return distance if distance <= max_distance else limit
+
+
+def candidate_titles(movie):
+    """Lista os títulos de um resultado do TMDB: título, original e alternativos."""
+    titles = [movie.get("title"), movie.get("original_title")]
+    alternatives = movie.get("alternative_titles") or []
+    # Aceita tanto a resposta do TMDB ({"titles": [{"title": ...}]}) quanto uma lista simples
+    if isinstance(alternatives, dict):
+        alternatives = alternatives.get("titles", [])
+    for alternative in alternatives:
+        titles.append(alternative.get("title") if isinstance(alternative, dict) else alternative)
+    return [title for title in titles if title]
+
+
+class TitleScorer:
+    """Base dos pontuadores de título."""
+    name = None
+
+    def score(self, query, title):
+        raise NotImplementedError
+
+    def score_movie(self, query, movie):
+        """Maior pontuação entre todos os títulos conhecidos do filme."""
+        return max((self.score(query, title) for title in candidate_titles(movie)), default=0.0)
+
+
+class SequenceMatcherScorer(TitleScorer):
+    """Pontuador original, baseado em difflib.SequenceMatcher."""
+    name = "sequence"
+
+    def score(self, query, title):
+        return SequenceMatcher(None, query.lower(), title.lower()).ratio()
+
+    def score_movie(self, query, movie):
+        # Mantém o comportamento antigo: compara apenas o título traduzido
+        return self.score(query, movie.get("title", ""))
+
+
+class TokenSetScorer(TitleScorer):
+    """
+    Pontuador por conjunto de palavras normalizadas e distância de edição limitada.
+
+    A similaridade por palavras ignora ordem e acentos ("Vandalos, Clube dos");
+    a distância de edição limitada cobre erros de digitação e palavras coladas.
+    O resultado é o maior dos dois.
+    """
+    name = "token_set"
+
+    def __init__(self, max_edit_ratio=0.3):
+        self.max_edit_ratio = max_edit_ratio
+
+    def score(self, query, title):
+        query = normalize_title(query)
+        title = normalize_title(title)
+        if not query or not title:
+            return 0.0
+        if query == title:
+            return 1.0
+
+        token_score = self.token_score(query, title)
+        # A distância de edição nunca é menor que a diferença de tamanho; se nem
+        # o melhor caso supera a pontuação por palavras, ela nem é calculada
+        longest = max(len(query), len(title))
+        if 1 - abs(len(query) - len(title)) / longest <= token_score:
+            return token_score
+        return max(token_score, self.edit_score(query, title))
+
+    def token_score(self, query, title):
+        """Coeficiente de Dice entre as palavras, aceitando um erro por palavra longa."""
+        query_tokens = set(query.split())
+        title_tokens = set(title.split())
+        common = len(query_tokens & title_tokens)
+
+        # Palavras restantes casam de forma aproximada (uma edição em palavras com 5+ letras)
+        remaining = [token for token in title_tokens - query_tokens if len(token) >= 5]
+        for token in query_tokens - title_tokens:
+            if len(token) < 5:
+                continue
+            for candidate in remaining:
+                if bounded_levenshtein(token, candidate, 1) <= 1:
+                    common += 0.8
+                    remaining.remove(candidate)
+                    break
+
+        return 2 * common / (len(query_tokens) + len(title_tokens))
+
+    def edit_score(self, query, title):
+        """Similaridade pela distância de edição, calculada só até o limite aceitável."""
+        longest = max(len(query), len(title))
+        max_distance = int(longest * self.max_edit_ratio)
+        distance = bounded_levenshtein(query, title, max_distance)
+        if distance > max_distance:
+            return 0.0
+        return 1 - distance / longest
+
+
+SCORERS = {
+    SequenceMatcherScorer.name: SequenceMatcherScorer,
+    TokenSetScorer.name: TokenSetScorer,
+}
+
+DEFAULT_SCORER = TokenSetScorer.name
+
+
+def get_scorer(name=DEFAULT_SCORER):
+    """Cria o pontuador pelo nome ("token_set" ou "sequence")."""
+    if name not in SCORERS:
+        raise ValueError(f"Pontuador desconhecido: {name}")
+    return SCORERS[name]()
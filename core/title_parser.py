@@ -0,0 +1,207 @@
+import os
+import re
+import json
+
+# Regras padrão distribuídas com o aplicativo e regras extras do usuário
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "title_rules.json")
+USER_RULES_PATH = os.path.join("data", "title_rules.json")
+
+# Campos que podem aparecer mais de uma vez no nome do arquivo
+LIST_FIELDS = ("audio", "channels", "language", "edition")
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.mpg', '.mpeg', '.ts')
+
+# Caracteres que separam as palavras no nome do arquivo
+SEPARATORS = r"\s._\-\[\]()"
+
+YEAR_RE = re.compile(r"(?:19|20)\d\d")
+RESOLUTION_RE = re.compile(r"\d{3,4}[pi]", re.IGNORECASE)
+RELEASE_GROUP_RE = re.compile(r"-([A-Za-z0-9]+)\s*(?:\[[^\]]*\])?$")
+LEADING_GROUP_RE = re.compile(r"^\[([^\]]+)\]")
+
+
+class TitleParser:
+    """
+    Extrai o título e os metadados técnicos do nome de um arquivo de filme.
+
+    O nome é percorrido uma única vez por uma expressão regular pré-compilada
+    que separa as palavras (e os termos compostos, como "WEB-DL" e "5.1").
+    Cada palavra é classificada por consulta a um dicionário montado a partir
+    das regras. O título são as palavras anteriores ao primeiro termo técnico
+    (ano, resolução, fonte, codec, áudio, idioma ou edição). Termos que
+    também são palavras comuns ("Original", "Web", "Dual") só encerram o título
+    quando vêm seguidos de outro termo técnico (ex: "WEB.1080p", "DUAL.AUDIO").
+    """
+
+    def __init__(self, rules_path=DEFAULT_RULES_PATH, user_rules_path=USER_RULES_PATH):
+        """
+        Args:
+            rules_path: Arquivo JSON com as regras padrão
+            user_rules_path: Arquivo JSON opcional, editável pelo usuário, cujas
+                listas são acrescentadas às regras padrão
+        """
+        rules = self.load_rules(rules_path)
+        if user_rules_path and os.path.exists(user_rules_path):
+            for field, values in self.load_rules(user_rules_path).items():
+                rules.setdefault(field, [])
+                rules[field] = rules[field] + values
+        self.compile_rules(rules)
+
+    def load_rules(self, path):
+        """Carrega um arquivo de regras."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Erro ao carregar regras de título ({path}): {e}")
+            return {}
+
+    def compile_rules(self, rules):
+        """Monta o dicionário de termos e a expressão do tokenizador."""
+        self.keywords = {}
+        self.context_dependent = {self.normalize_token(value) for value in rules.get("context_dependent", [])}
+        for field, values in rules.items():
+            if field in ("patterns", "context_dependent"):
+                continue
+            for value in values:
+                self.keywords[self.normalize_token(value)] = field
+
+        # Termos compostos entram antes da palavra genérica na alternância
+        self.pattern_fields = []
+        alternatives = []
+        for index, pattern in enumerate(rules.get("patterns", [])):
+            self.pattern_fields.append(pattern["field"])
+            alternatives.append(f"(?P<p{index}>{pattern['regex']})")
+        alternatives.append(r"(?P<bracket>\[[^\]]*\]|\([^)]*\))")
+        alternatives.append(rf"(?P<word>[^{SEPARATORS}]+)")
+
+        boundary_before = rf"(?<![^{SEPARATORS}])"
+        boundary_after = rf"(?![^{SEPARATORS}])"
+        self.token_re = re.compile(
+            boundary_before + "(?:" + "|".join(alternatives) + ")" + boundary_after,
+            re.IGNORECASE
+        )
+
+    @staticmethod
+    def normalize_token(token):
+        """Normaliza um termo para consulta no dicionário (minúsculas, sem separadores)."""
+        return re.sub(r"[\s._\-]", "", token.lower())
+
+    def classify(self, token):
+        """Retorna o campo de uma palavra solta ou None se ela não for um termo técnico."""
+        if YEAR_RE.fullmatch(token):
+            return "year"
+        if RESOLUTION_RE.fullmatch(token):
+            return "resolution"
+        return self.keywords.get(self.normalize_token(token))
+
+    def tokenize(self, name):
+        """Divide o nome em uma lista de (texto, campo, veio_de_colchetes)."""
+        tokens = []
+        for match in self.token_re.finditer(name):
+            kind = match.lastgroup
+            text = match.group(kind)
+            if kind == "word":
+                tokens.append((text, self.classify(text), False))
+            elif kind == "bracket":
+                # O conteúdo entre colchetes/parênteses nunca faz parte do título
+                for inner in self.token_re.finditer(text[1:-1]):
+                    inner_kind = inner.lastgroup
+                    inner_text = inner.group(inner_kind)
+                    if inner_kind == "word":
+                        field = self.classify(inner_text)
+                    elif inner_kind == "bracket":
+                        field = None
+                    else:
+                        field = self.pattern_fields[int(inner_kind[1:])]
+                    tokens.append((inner_text, field, True))
+            else:
+                tokens.append((text, self.pattern_fields[int(kind[1:])], False))
+        return tokens
+
+    def parse(self, filename):
+        """
+        Extrai o título e os metadados do nome de um arquivo.
+
+        Args:
+            filename: Nome do arquivo, com ou sem extensão
+
+        Returns:
+            dict: title, year (int ou None), resolution, source, video_codec,
+            release_group e as listas audio, channels, language e edition
+        """
+        name = os.path.basename(filename)
+        stem, ext = os.path.splitext(name)
+        if ext.lower() in VIDEO_EXTENSIONS:
+            name = stem
+
+        info = {
+            "title": "",
+            "year": None,
+            "resolution": None,
+            "source": None,
+            "video_codec": None,
+            "release_group": None,
+        }
+        for field in LIST_FIELDS:
+            info[field] = []
+
+        tokens = self.tokenize(name)
+        title_words = []
+        title_open = True
+
+        for index, (text, field, in_brackets) in enumerate(tokens):
+            if field == "noise":
+                continue
+
+            if title_open and not in_brackets:
+                # Um termo técnico só encerra o título se já houver alguma palavra
+                # (ex: "1917", "Cam"). Um ano seguido de outro ano faz parte do título
+                # (ex: "Blade Runner 2049 2017"), assim como uma palavra comum que
+                # não vem seguida de termo técnico (ex: "The Original Kings of Comedy")
+                # ou que vem antes do ano, onde o título costuma terminar
+                # (ex: "Charlotte's Web 2006").
+                next_field = tokens[index + 1][1] if index + 1 < len(tokens) else None
+                is_title = (field is None or not title_words or
+                            (field == "year" and next_field == "year") or
+                            (next_field in (None, "noise", "year") and
+                             self.normalize_token(text) in self.context_dependent))
+                if is_title:
+                    title_words.append(text)
+                    continue
+                title_open = False
+
+            if field == "year":
+                if info["year"] is None:
+                    info["year"] = int(text)
+            elif field in LIST_FIELDS:
+                value = text.upper()
+                if value not in info[field]:
+                    info[field].append(value)
+            elif field and info.get(field) is None:
+                info[field] = text.upper() if field != "resolution" else text.lower()
+
+        # Grupo no final ("-GRUPO") ou entre colchetes no início ("[GRUPO] Título")
+        for group_re in (RELEASE_GROUP_RE, LEADING_GROUP_RE):
+            group_match = group_re.search(name)
+            if group_match and not self.classify(group_match.group(1)):
+                info["release_group"] = group_match.group(1)
+                break
+
+        info["title"] = " ".join(title_words).strip()
+        return info
+
+    def clean_title(self, filename):
+        """Retorna apenas o título limpo, sem termos técnicos."""
+        return self.parse(filename)["title"]
+
+
+_shared_parser = None
+
+
+def get_title_parser():
+    """Retorna o parser compartilhado (as regras são compiladas uma única vez)."""
+    global _shared_parser
+    if _shared_parser is None:
+        _shared_parser = TitleParser()
+    return _shared_parser
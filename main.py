@@ -1,12 +1,11 @@
 import sys
 import os
 import json
+from core import startup_profiler  # Importado primeiro para medir toda a inicialização
 from PyQt5.QtWidgets import QApplication, QMessageBox
 from PyQt5.QtGui import QIcon
 from PyQt5.QtCore import QTimer
-from ui.interface import MainWindow
-from ui.splash_screen import SplashScreen
-from update.auto_updater import AutoUpdater  # Importando o módulo de atualização
+from update.version_switch import recover_interrupted_update
 
 def resource_path(relative_path):
     """Retorna o caminho absoluto, compatível com cx_Freeze"""
@@ -16,6 +15,9 @@ def resource_path(relative_path):
 
 def setup_environment():
     """Configura o ambiente, garantindo que os diretórios necessários existam."""
+    # Desfaz uma atualização interrompida antes de carregar os módulos da interface
+    recover_interrupted_update()
+    
     os.makedirs("assets/poster_images", exist_ok=True)
     os.makedirs("data", exist_ok=True)
     
@@ -39,54 +41,86 @@ def get_current_version():
         return "1.0.0"
 
 def check_for_updates(parent_widget=None):
-    """Verifica se há atualizações disponíveis e pergunta ao usuário se deseja atualizar"""
+    """
+    Verifica em segundo plano se há atualizações disponíveis e, se houver,
+    pergunta ao usuário se deseja atualizar.
+    """
+    # Importados sob demanda: requests/packaging não são necessários para abrir a janela
+    from update.auto_updater import AutoUpdater
+    from update.update_worker import UpdateCheckThread
+    
     current_version = get_current_version()
     updater = AutoUpdater(
         repo_owner="gabrieloliveira64",
         repo_name="PipocaApp",
         current_version=current_version,
-        ignore_patterns=["data/catalog.json", "assets/poster_images/*"]
+        ignore_patterns=[
+            "data/*",
+            "assets/poster_images/*",
+            "assets/backdrop_images/*",
+            "assets/profile_images/*",
+        ]
+    )
+    
+    check_thread = UpdateCheckThread(updater, parent_widget)
+    check_thread.update_available.connect(
+        lambda release: prompt_update(parent_widget, updater, release)
     )
+    check_thread.finished.connect(check_thread.deleteLater)
+    check_thread.start()
+    return check_thread
+
+def prompt_update(parent_widget, updater, release):
+    """Pergunta ao usuário se deseja instalar a atualização encontrada."""
+    if not parent_widget:
+        print(f"Nova versão disponível: {release['tag_name']}. Execute novamente para atualizar.")
+        return
+    
+    reply = QMessageBox.question(
+        parent_widget,
+        "Atualização Disponível",
+        f"Uma nova versão ({release['tag_name']}) está disponível. Deseja atualizar agora?",
+        QMessageBox.Yes | QMessageBox.No
+    )
+    
+    if reply != QMessageBox.Yes:
+        return
     
-    release = updater.check_for_updates()
+    msg = QMessageBox(parent_widget)
+    msg.setWindowTitle("Atualizando")
+    msg.setText("Baixando e instalando atualização. O programa será reiniciado automaticamente.")
+    msg.setStandardButtons(QMessageBox.NoButton)
+    msg.show()
     
-    if release:
-        if parent_widget:
-            reply = QMessageBox.question(
+    def on_install_finished(installed):
+        msg.close()
+        if installed:
+            QMessageBox.information(
                 parent_widget,
-                "Atualização Disponível",
-                f"Uma nova versão ({release['tag_name']}) está disponível. Deseja atualizar agora?",
-                QMessageBox.Yes | QMessageBox.No
+                "Atualização Concluída",
+                "A atualização foi instalada com sucesso. O programa será reiniciado."
             )
-            
-            if reply == QMessageBox.Yes:
-                msg = QMessageBox(parent_widget)
-                msg.setWindowTitle("Atualizando")
-                msg.setText("Baixando e instalando atualização. O programa será reiniciado automaticamente.")
-                msg.setStandardButtons(QMessageBox.NoButton)
-                msg.show()
-                QApplication.processEvents()
-                
-                zip_path = updater.download_update(release)
-                if zip_path and updater.install_update(zip_path):
-                    QMessageBox.information(
-                        parent_widget,
-                        "Atualização Concluída",
-                        "A atualização foi instalada com sucesso. O programa será reiniciado."
-                    )
-                    python = sys.executable
-                    os.execl(python, python, *sys.argv)
-                else:
-                    QMessageBox.warning(
-                        parent_widget,
-                        "Falha na Atualização",
-                        "Não foi possível instalar a atualização."
-                    )
+            python = sys.executable
+            os.execl(python, python, *sys.argv)
         else:
-            print(f"Nova versão disponível: {release['tag_name']}. Execute novamente para atualizar.")
+            QMessageBox.warning(
+                parent_widget,
+                "Falha na Atualização",
+                "Não foi possível instalar a atualização."
+            )
+    
+    from update.update_worker import UpdateInstallThread
+    install_thread = UpdateInstallThread(updater, release, parent_widget)
+    install_thread.install_finished.connect(on_install_finished)
+    install_thread.finished.connect(install_thread.deleteLater)
+    install_thread.start()
 
 if __name__ == "__main__":
     setup_environment()
+    startup_profiler.mark("ambiente configurado")
+    
+    # Importados só depois de setup_environment, que pode restaurar arquivos da interface
+    from ui.splash_screen import SplashScreen
     
     app = QApplication(sys.argv)
 
@@ -94,16 +128,29 @@ if __name__ == "__main__":
     app.setWindowIcon(QIcon(resource_path("icon/pipocaplus.ico")))
 
     splash = SplashScreen()
-    main_window = MainWindow()
+    splash.show()
+    startup_profiler.mark("splash exibido")
+    
+    windows = {}
+    
+    def create_main_window():
+        # Construída depois do splash aparecer, enquanto a animação roda
+        if "main" in windows:
+            return
+        from ui.interface import MainWindow
+        startup_profiler.mark("módulos da interface importados")
+        windows["main"] = MainWindow()
+        startup_profiler.mark("janela principal criada")
     
     def check_updates_after_splash():
-        check_for_updates(main_window)
+        check_for_updates(windows["main"])
     
     def open_main_window():
-        main_window.showFullScreen()
+        create_main_window()
+        windows["main"].showFullScreen()
         QTimer.singleShot(500, check_updates_after_splash)
     
     splash.animation_finished.connect(open_main_window)
-    splash.show()
+    QTimer.singleShot(0, create_main_window)
     
     sys.exit(app.exec_())
@@ -0,0 +1,64 @@
+import os
+import json
+import time
+import tempfile
+import unittest
+
+from core.movie_manager import MovieManager
+from core.asset_gc import AssetCollector
+
+
+class AssetCollectorTest(unittest.TestCase):
+    """Varredura de imagens sem dono sobre um catálogo em uma pasta temporária."""
+
+    def setUp(self):
+        self.previous_dir = os.getcwd()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.temp_dir.name)
+        for folder in ("data", "assets/poster_images", "assets/backdrop_images", "assets/profile_images"):
+            os.makedirs(folder)
+
+    def tearDown(self):
+        os.chdir(self.previous_dir)
+        self.temp_dir.cleanup()
+
+    def write_image(self, path):
+        with open(path, 'wb') as f:
+            f.write(b"x" * 100)
+        # Mais velha que o MIN_AGE padrão
+        old = time.time() - 2 * 60 * 60
+        os.utime(path, (old, old))
+
+    def collect(self, movies):
+        with open("data/catalog.json", 'w', encoding='utf-8') as f:
+            json.dump({"movies": movies}, f)
+        manager = MovieManager(validate_on_load=False)
+        report = AssetCollector(manager, min_age=0).run(pause=0)
+        manager.flush()
+        return report
+
+    def test_legacy_entry_keeps_fallback_backdrop(self):
+        # Entradas antigas não têm backdrop_local_path; a página de detalhes usa {tmdb_id}_backdrop.jpg
+        self.write_image("assets/backdrop_images/1586_backdrop.jpg")
+        self.write_image("assets/poster_images/1586.jpg")
+        self.write_image("assets/backdrop_images/999_backdrop.jpg")
+        report = self.collect([{"id": 15, "tmdb_id": 1586, "title": "Legado", "file_path": "filme.mkv"}])
+
+        self.assertTrue(os.path.exists("assets/backdrop_images/1586_backdrop.jpg"))
+        self.assertTrue(os.path.exists("assets/poster_images/1586.jpg"))
+        self.assertFalse(os.path.exists("assets/backdrop_images/999_backdrop.jpg"))
+        self.assertEqual(report["removed"], 1)
+        self.assertEqual(report["freed_bytes"], 100)
+
+    def test_shared_profile_image_is_kept(self):
+        self.write_image("assets/profile_images/cast_7.jpg")
+        self.write_image("assets/profile_images/cast_8.jpg")
+        cast = [{"id": 7, "profile_path": "/7.jpg"}]
+        self.collect([{"id": 1, "tmdb_id": 10, "cast": cast}, {"id": 2, "tmdb_id": 20, "cast": cast}])
+
+        self.assertTrue(os.path.exists("assets/profile_images/cast_7.jpg"))
+        self.assertFalse(os.path.exists("assets/profile_images/cast_8.jpg"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+from core import media_probe, movie_manager
+from core.media_probe import read_media_info, is_final
+from core.movie_manager import MovieManager
+
+
+class FailedProbeTest(unittest.TestCase):
+    """ffprobe instalado, mas sem conseguir ler o arquivo."""
+
+    def setUp(self):
+        self.previous_dir = os.getcwd()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.temp_dir.name)
+        os.makedirs("data")
+        with open("filme.wmv", 'wb') as f:
+            f.write(b"\0" * 1024)
+        patches = [
+            mock.patch.object(media_probe, "ffprobe_path", return_value="ffprobe"),
+            mock.patch.object(movie_manager, "ffprobe_path", return_value="ffprobe"),
+            mock.patch.object(media_probe, "ffprobe_media_info", return_value=None),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        os.chdir(self.previous_dir)
+        self.temp_dir.cleanup()
+
+    def test_failed_probe_is_final(self):
+        media_info = read_media_info("filme.wmv")
+        self.assertEqual(media_info["source"], "header")
+        self.assertTrue(is_final(media_info))
+        self.assertFalse(is_final({"source": "header", "duration": 5400.0}))
+
+    def test_fill_file_details_does_not_probe_again(self):
+        movie = {"id": 1, "title": "Filme", "file_path": "filme.wmv", "fingerprint": "0" * 16}
+        with open("data/catalog.json", 'w', encoding='utf-8') as f:
+            json.dump({"movies": [movie]}, f)
+
+        manager = MovieManager(validate_on_load=False)
+        self.assertEqual(manager.fill_file_details(), 1)
+        calls = media_probe.ffprobe_media_info.call_count
+        self.assertEqual(manager.fill_file_details(), 0)
+        self.assertEqual(media_probe.ffprobe_media_info.call_count, calls)
+        manager.flush()
+
+
+if __name__ == "__main__":
+    unittest.main()
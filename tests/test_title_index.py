@@ -0,0 +1,53 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+from core.title_index import TitleIndex, build_index, entries_from_catalog, make_entry, UNKNOWN_YEAR
+
+
+class EntriesFromCatalogTest(unittest.TestCase):
+
+    def test_null_release_date_uses_unknown_year(self):
+        movies = [{"tmdb_id": 10, "title": "Sem Data", "release_date": None},
+                  {"tmdb_id": 20, "title": "Com Data", "release_date": "1999-03-31"}]
+        years = {entry[2]: entry[1] for entry in entries_from_catalog(movies)}
+        self.assertEqual(years, {10: UNKNOWN_YEAR, 20: 1999})
+
+
+class TitleIndexYearTest(unittest.TestCase):
+    """Export do TMDB (sem ano) com as duas versões de Duna e o diário da busca de 2021."""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, "title_index.txt")
+        self.journal_path = os.path.join(self.folder, "journal.jsonl")
+        build_index([[make_entry("Dune", UNKNOWN_YEAR, 841), make_entry("Dune", UNKNOWN_YEAR, 438631)]],
+                    self.path)
+        with open(self.journal_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"id": 438631, "title": "Dune", "original_title": "Dune",
+                                "release_date": "2021-09-15"}) + "\n")
+        self.index = TitleIndex(self.path, self.journal_path)
+        self.index.open()
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def test_lookup_ranks_known_year_first(self):
+        results = self.index.lookup("Dune", 2021)
+        self.assertEqual(results[0]["id"], 438631)
+        self.assertEqual(results[0]["release_date"], "2021")
+        self.assertEqual(results[1]["id"], 841)
+
+    def test_compact_keeps_journal_year(self):
+        self.index.compact()
+        with open(self.path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines, ["dune\t0\t841\tDune", "dune\t2021\t438631\tDune"])
+        self.assertEqual(self.index.lookup("Dune", 2021)[0]["id"], 438631)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+
+from core.title_parser import TitleParser
+
+
+class TitleParserTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Só as regras distribuídas com o aplicativo
+        cls.parser = TitleParser(user_rules_path=None)
+
+    def assertParsed(self, filename, title, year=None, **fields):
+        info = self.parser.parse(filename)
+        self.assertEqual(info["title"], title, filename)
+        self.assertEqual(info["year"], year, filename)
+        for field, value in fields.items():
+            self.assertEqual(info[field], value, filename)
+
+    def test_common_words_stay_in_title(self):
+        self.assertParsed("The.Original.Kings.of.Comedy.2000.mkv", "The Original Kings of Comedy", 2000)
+        self.assertParsed("The.Web.mkv", "The Web")
+        self.assertParsed("Charlotte's.Web.2006.1080p.BluRay.x264.mkv", "Charlotte's Web", 2006,
+                          resolution="1080p", source="BLURAY")
+        self.assertParsed("Dual.mkv", "Dual")
+
+    def test_common_words_end_title_before_technical_terms(self):
+        self.assertParsed("Duna.Parte.Dois.WEB.1080p.mkv", "Duna Parte Dois", resolution="1080p", source="WEB")
+        self.assertParsed("Duna.Parte.Dois.WEB-DL.mkv", "Duna Parte Dois", source="WEB-DL")
+        self.assertParsed("Interestelar.DUAL.AUDIO.mkv", "Interestelar", language=["DUAL"], audio=["AUDIO"])
+        self.assertParsed("Interestelar.Dual.Áudio.5.1.mkv", "Interestelar", channels=["5.1"])
+
+    def test_years_in_title(self):
+        self.assertParsed("1917.2019.1080p.mkv", "1917", 2019)
+        self.assertParsed("Blade.Runner.2049.2017.2160p.mkv", "Blade Runner 2049", 2017)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,191 +1,173 @@
 import os
-import json
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
                             QPushButton, QFileDialog, QListWidget, QListWidgetItem,
                             QMessageBox, QProgressDialog, QApplication, QCheckBox)
 from PyQt5.QtGui import QPixmap, QIcon
-from PyQt5.QtCore import Qt, QSize, QThread, pyqtSignal
+from PyQt5.QtCore import Qt, QSize, QTimer, pyqtSignal
 from core.movie_fetcher import MovieFetcher
+from core.title_parser import get_title_parser
+from core.title_matcher import get_scorer
+from core.title_index import TitleIndex
+from core.import_queue import ImportQueue
+from core.media_probe import get_duration, read_duration, read_media_info, is_final
+from core.job_control import JobControl
+from core.preferences import get_preference, set_preference
+from ui.job_progress_dialog import JobProgressDialog
+from ui.image_loader import ImageLoader
+from ui.task_runner import Task, BACKGROUND, get_task_runner
+import copy
 import time
+import requests
 import re
-import subprocess
 from pathlib import Path
-from difflib import SequenceMatcher
 
-
-class BatchScanThread(QThread):
-    """Thread para escanear pastas e encontrar filmes."""
+class BatchScanTask(Task):
+    """Tarefa para escanear pastas e encontrar filmes."""
+    category = BACKGROUND
     progress_updated = pyqtSignal(int, int)
     movie_found = pyqtSignal(str, str)
+    movies_relinked = pyqtSignal(list)
     scan_completed = pyqtSignal(list)
     
-    def __init__(self, root_folder, movie_manager):
+    def __init__(self, root_folder, movie_manager, control=None):
         super().__init__()
         self.root_folder = root_folder
         self.movie_manager = movie_manager
+        self.control = control or JobControl()
         
     def run(self):
         video_files = []
         
         # Lista de extensões de vídeo suportadas
-        video_extensions = ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm']
-        
-        total_files = 0
-        processed_files = 0
-        
-        # Contar arquivos primeiro para a barra de progresso
-        for root, dirs, files in os.walk(self.root_folder):
-            for file in files:
-                if any(file.lower().endswith(ext) for ext in video_extensions):
-                    total_files += 1
+        video_extensions = ('.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm')
         
-        # Escanear pasta recursivamente
+        # Listar os arquivos de vídeo uma única vez (o total alimenta a barra de progresso)
+        candidates = []
         for root, dirs, files in os.walk(self.root_folder):
+            if self.control.is_cancelled():
+                break
             for file in files:
-                if any(file.lower().endswith(ext) for ext in video_extensions):
-                    file_path = os.path.join(root, file)
-                    processed_files += 1
-                    self.progress_updated.emit(processed_files, total_files)
-                    
-                    # Verificar se é um filme (mais de 60 minutos)
-                    if self.is_movie_file(file_path):
-                        # Limpar o título
-                        clean_title = self.clean_movie_title(file)
-                        video_files.append((clean_title, file_path))
-                        self.movie_found.emit(clean_title, file_path)
-        
-        # Emitir resultados
+                if file.lower().endswith(video_extensions):
+                    candidates.append((root, file))
+        
+        # Filmes que mudaram de pasta ou de unidade voltam ao catálogo pela
+        # impressão digital, sem nova busca na API
+        if not self.control.is_cancelled():
+            relinked = self.movie_manager.relink_missing([os.path.join(root, file) for root, file in candidates])
+            if relinked:
+                self.movies_relinked.emit(relinked)
+                relinked_paths = {movie["file_path"] for movie in relinked}
+                candidates = [(root, file) for root, file in candidates
+                              if os.path.join(root, file) not in relinked_paths]
+        
+        total_files = len(candidates)
+        for processed_files, (root, file) in enumerate(candidates, start=1):
+            # Pausa ou cancelamento entre um arquivo e outro
+            if not self.control.checkpoint():
+                break
+            
+            file_path = os.path.join(root, file)
+            self.progress_updated.emit(processed_files, total_files)
+            
+            # Verificar se é um filme (mais de 60 minutos). A duração vem do
+            # cabeçalho; se o ffprobe precisar rodar, o resultado completo é guardado
+            media_info = read_media_info(file_path, full=False)
+            duration = media_info["duration"]
+            if self.is_movie_file(file_path, duration):
+                # Extrair título e ano do nome do arquivo
+                title_info = get_title_parser().parse(file)
+                clean_title = title_info["title"]
+                metadata = {"year": title_info["year"], "duration": duration, "media_info": media_info}
+                video_files.append((clean_title, file_path, metadata))
+                self.movie_found.emit(clean_title, file_path)
+        
+        # Emitir resultados (parciais, se a varredura foi cancelada)
         self.scan_completed.emit(video_files)
     
-    def is_movie_file(self, file_path):
+    def is_movie_file(self, file_path, duration=None):
         """Verifica se o arquivo é um filme com base na duração (mais de 60 minutos)."""
-        try:
-            # Verificar se ffprobe está disponível
-            try:
-                # Verifica se o ffprobe está disponível no sistema
-                subprocess.run(['ffprobe', '-version'], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            except FileNotFoundError:
-                # Se ffprobe não estiver disponível, assumir que é um filme
-                print("FFprobe não encontrado no sistema. Assumindo que é um filme.")
-                return True
-            
-            # Usar ffprobe para obter a duração
-            cmd = [
-                'ffprobe', 
-                '-v', 'error', 
-                '-show_entries', 'format=duration', 
-                '-of', 'default=noprint_wrappers=1:nokey=1', 
-                file_path
-            ]
-            
-            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            
-            if result.returncode != 0:
-                print(f"Erro ao executar ffprobe: {result.stderr}")
-                return True  # Se falhar, assumir que é um filme
-                
-            duration = float(result.stdout.strip())
-            
-            # Considerar um filme se tiver mais de 60 minutos (3600 segundos)
-            return duration > 3600
-        except Exception as e:
-            print(f"Erro ao verificar duração: {e}")
-            # Se não conseguir verificar, assumir que é um filme
+        if duration is None:
+            duration = self.get_duration(file_path)
+        
+        # Se não conseguir verificar, assumir que é um filme
+        if duration is None:
             return True
+        
+        # Considerar um filme se tiver mais de 60 minutos (3600 segundos)
+        return duration > 3600
+    
+    def get_duration(self, file_path):
+        """Obtém a duração do arquivo em segundos (None se não for possível verificar)."""
+        # Lida do cabeçalho do contêiner; o ffprobe só roda para formatos não suportados
+        return get_duration(file_path)
     
     def clean_movie_title(self, filename):
         """Remove termos técnicos do nome do arquivo para obter o título do filme."""
-        # Obter nome sem extensão
-        name = os.path.splitext(filename)[0]
-        
-        # Substituir separadores comuns por espaços
-        name = name.replace('.', ' ').replace('_', ' ').replace('-', ' ')
-        
-        # Remover termos técnicos comuns
-        patterns = [
-            r'\b\d{4}\b',  # Anos (ex: 2022)
-            r'\b(1080p|720p|480p|4K|UHD|HD|FHD)\b',  # Resoluções
-            r'\b(BluRay|BRRip|WEBRip|HDTV|DVDRip|WEB-DL|HDRIP|WEB |DL|REPACK|-|JefePsb|CAMPRip|SF|Acesse|ORIGINAL|Dublagem|BKS|by|GmV|Pirate|Filmes|The|LAPUMiaAFiLMES|COM|By|jmsmarcelo|COMANDO LA|LA|LapumiaFilmes|TorrentDosFilmes|SE|NET|)\b',  # Fontes
-            r'\b(x264|x265|HEVC|XviD|h264|h265)\b',  # Codecs de vídeo
-            r'\b(AAC|AC3|DTS|MP3|FLAC|DDP5.1|DDP|DD5.1|ÁUDIO|AUDIO|EAC3|6CH|CH|TDF|DL)\b',  # Codecs de áudio
-            r'\b(DUAL|DUBLADO|LEGENDADO|DUB|PT-BR|PT|BR|EN|ENG|PTBR)\b',  # Idiomas
-            r'\b(5.1|7.1|2.0)\b',  # Canais de áudio
-            r'\bwww\.[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b',  # URLs
-            r'\b(EXTENDED|DIRECTORS.CUT|UNRATED|CAMPRip|Sem Cortes|JefePsb|REPACK|D4V1|D4VI|199991|REMASTERED|REMUX |SF|BLUDV|BY|LUAHARP|LuaHarper|JefPsB|LAPUMiA|CAMPRip|THEPIRATEFILMES|RICKSZ|COMANDOTORRENTS|WOLVERDONFILMES|NACIONAL|VERSAO|ESTENDIDA|STARCKFILMES|remasterizado|CAMPRip|VERSÃO|ToTTI9|jeffpsb|portugues|WWW|-)\b',  # Versões
-            r'\[.*?\]|\(.*?\)',  # Qualquer coisa entre colchetes ou parênteses
-        ]
-        
-        for pattern in patterns:
-            name = re.sub(pattern, '', name, flags=re.IGNORECASE)
-        
-        # Remover múltiplos espaços e espaços no início/fim
-        name = re.sub(r'\s+', ' ', name).strip()
-        
-        return name
+        return get_title_parser().clean_title(filename)
 
 
-class AutomaticMovieAddThread(QThread):
-    """Thread para adicionar filmes automaticamente."""
+class AutomaticMovieAddTask(Task):
+    """Tarefa para adicionar filmes automaticamente."""
+    category = BACKGROUND
     progress_updated = pyqtSignal(int, int)
     movie_processed = pyqtSignal(str, bool, str)
     processing_completed = pyqtSignal()
     
-    def __init__(self, movie_files, movie_manager, movie_fetcher):
+    # Resultado que não é falha: o arquivo sai da fila de importação
+    ALREADY_IN_CATALOG = "Filme já existe no catálogo"
+    
+    # A fila é gravada a cada tantos filmes processados (e no final)
+    QUEUE_SAVE_INTERVAL = 10
+    
+    def __init__(self, movie_files, movie_manager, movie_fetcher, scorer=None, title_index=None,
+                 import_queue=None, control=None):
         super().__init__()
         self.movie_files = movie_files
         self.movie_manager = movie_manager
         self.movie_fetcher = movie_fetcher
-        self.catalog = self.load_catalog()
-        
-    def load_catalog(self):
-        """Carrega o catálogo existente para verificar duplicatas."""
-        catalog_path = os.path.join("data", "catalog.json")
-        if os.path.exists(catalog_path):
-            try:
-                with open(catalog_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"Erro ao carregar catálogo: {e}")
-                return {"movies": []}
-        return {"movies": []}
+        self.scorer = scorer or get_scorer()
+        # Índice local opcional: quando resolve o título, só os detalhes vêm da API
+        self.title_index = title_index
+        self.local_matches = 0
+        # Fila persistente opcional com os pendentes e as falhas para novas tentativas
+        self.import_queue = import_queue
+        self.processed_count = 0
+        self.control = control or JobControl()
         
     def run(self):
         total = len(self.movie_files)
-        for index, (clean_title, file_path) in enumerate(self.movie_files):
+        for index, (clean_title, file_path, metadata) in enumerate(self.movie_files):
+            # Pausa ou cancelamento entre um filme e outro; os restantes continuam na fila
+            if not self.control.checkpoint():
+                break
+            
             try:
                 # Atualizar progresso
                 self.progress_updated.emit(index + 1, total)
                 
                 # Verificar se o filme já existe no catálogo (pelo caminho do arquivo)
                 if self.movie_exists_in_catalog(file_path):
-                    self.movie_processed.emit(clean_title, False, "Filme já existe no catálogo")
+                    self.record_result(clean_title, file_path, False, self.ALREADY_IN_CATALOG)
                     continue
                 
-                # Buscar filme na API
-                results = self.movie_fetcher.search_movie(clean_title)
+                year = metadata.get("year")
+                duration = metadata.get("duration")
                 
-                if not results:
-                    # Tentar termos alternativos
-                    alternative_title = self.get_alternative_search_term(clean_title)
-                    if alternative_title and alternative_title != clean_title:
-                        results = self.movie_fetcher.search_movie(alternative_title)
+                candidates = self.find_candidates(clean_title, year)
                 
-                if not results:
-                    self.movie_processed.emit(clean_title, False, "Nenhum resultado encontrado")
+                if candidates is None:
+                    self.record_result(clean_title, file_path, False, "Nenhum resultado encontrado")
                     continue
                 
-                # Ordenar resultados pelo melhor match
-                best_match = self.find_best_title_match(clean_title, results)
-                
-                if not best_match:
-                    self.movie_processed.emit(clean_title, False, "Nenhum resultado compatível")
+                if not candidates:
+                    self.record_result(clean_title, file_path, False, "Nenhum resultado compatível")
                     continue
                 
-                # Buscar detalhes completos
-                movie_details = self.movie_fetcher.get_movie_details(best_match['id'])
+                # Buscar detalhes completos, conferindo a duração do arquivo com a do filme
+                movie_details = self.fetch_matching_details(candidates, duration)
                 
                 if not movie_details:
-                    self.movie_processed.emit(clean_title, False, "Falha ao obter detalhes")
+                    self.record_result(clean_title, file_path, False, "Falha ao obter detalhes")
                     continue
                 
                 # Baixar poster
@@ -200,58 +182,165 @@ class AutomaticMovieAddThread(QThread):
                 movie_info = self.movie_fetcher.extract_movie_info(movie_details)
                 movie_info["local_poster_path"] = local_poster_path
                 
+                # Informações técnicas do arquivo: uma chamada do ffprobe, só se a varredura não a fez
+                media_info = metadata.get("media_info")
+                movie_info["media_info"] = media_info if is_final(media_info) else read_media_info(file_path)
+                
                 # Adicionar filme ao catálogo
                 new_movie = self.movie_manager.add_movie(movie_info, file_path)
                 
                 if new_movie:
-                    self.movie_processed.emit(clean_title, True, new_movie['title'])
+                    self.record_result(clean_title, file_path, True, new_movie['title'])
                 else:
-                    self.movie_processed.emit(clean_title, False, "Falha ao adicionar ao catálogo")
+                    self.record_result(clean_title, file_path, False, "Falha ao adicionar ao catálogo")
                     
             except Exception as e:
-                self.movie_processed.emit(clean_title, False, str(e))
+                self.record_result(clean_title, file_path, False, str(e))
+        
+        if self.import_queue is not None:
+            self.import_queue.save()
+        
+        if self.title_index:
+            print(f"Títulos resolvidos pelo índice local: {self.local_matches}/{total}")
+            self.title_index.compact_if_needed(self.movie_manager.snapshot())
+            self.title_index.close()
         
         self.processing_completed.emit()
     
+    def record_result(self, clean_title, file_path, success, message):
+        """Emite o resultado de um arquivo e atualiza a fila de importação."""
+        if self.import_queue is not None:
+            if success or message == self.ALREADY_IN_CATALOG:
+                self.import_queue.mark_done(file_path)
+            else:
+                self.import_queue.mark_failed(file_path, message)
+            self.processed_count += 1
+            if self.processed_count % self.QUEUE_SAVE_INTERVAL == 0:
+                self.import_queue.save()
+        self.movie_processed.emit(clean_title, success, message)
+    
+    def find_candidates(self, clean_title, year):
+        """
+        Lista os filmes compatíveis com o título, do melhor para o pior.
+        
+        Consulta primeiro o índice local de títulos; a busca do TMDB só é feita
+        quando o índice não tem um resultado compatível. Com o ano no nome do
+        arquivo, o resultado local só é aceito se o melhor candidato tiver ano
+        igual ou vizinho: entradas sem ano (export do TMDB) não distinguem
+        refilmagens de mesmo título.
+        
+        Returns:
+            list: Candidatos ordenados, ou None se a busca não retornou nada
+        """
+        if self.title_index:
+            candidates = self.rank_title_matches(clean_title, self.title_index.lookup(clean_title, year), year)
+            if candidates and year:
+                release_year = self.get_release_year(candidates[0])
+                if release_year is None or abs(release_year - year) > 1:
+                    candidates = None
+            if candidates:
+                self.local_matches += 1
+                return candidates
+        
+        # Buscar filme na API, restringindo pelo ano quando ele está no nome do arquivo.
+        # Sem limite de resultados: o ranqueamento local escolhe entre a página inteira
+        results = self.movie_fetcher.search_movie(clean_title, year=year, limit=None)
+        if not results and year:
+            results = self.movie_fetcher.search_movie(clean_title, limit=None)
+        
+        if not results:
+            # Tentar termos alternativos
+            alternative_title = self.get_alternative_search_term(clean_title)
+            if alternative_title and alternative_title != clean_title:
+                results = self.movie_fetcher.search_movie(alternative_title, limit=None)
+        
+        if not results:
+            return None
+        
+        # Ordenar resultados pelo melhor match
+        return self.rank_title_matches(clean_title, results, year)
+    
     def movie_exists_in_catalog(self, file_path):
         """Verifica se o filme já existe no catálogo pelo caminho do arquivo."""
-        for movie in self.catalog.get("movies", []):
-            if movie.get("file_path") == file_path:
-                return True
-        return False
+        return self.movie_manager.find_by_file_path(file_path) is not None
     
-    def find_best_title_match(self, search_title, results):
-        """Encontra o melhor match de título entre os resultados."""
-        best_match = None
-        best_score = 0
+    def rank_title_matches(self, search_title, results, year=None):
+        """
+        Ordena os resultados da busca pela pontuação de compatibilidade.
+        
+        A pontuação combina a similaridade do título (calculada pelo pontuador
+        configurado, sobre o título traduzido, o original e os alternativos)
+        com o ano extraído do nome do arquivo: ano igual soma 0.3, ano vizinho (±1, comum entre lançamento e
+        estreia no Brasil) soma 0.15 e ano diferente subtrai 0.2.
+        
+        Returns:
+            list: Filmes com pontuação mínima de 0.5, do melhor para o pior
+        """
+        scored = []
         
         for movie in results:
             # Comparar os títulos
-            title = movie.get("title", "").lower()
-            search = search_title.lower()
-            
-            # Usar algoritmo de similaridade
-            ratio = SequenceMatcher(None, search, title).ratio()
+            score = self.scorer.score_movie(search_title, movie)
             
-            # Considerar ano de lançamento se estiver no título de busca
-            year_match = 0
-            release_date = movie.get("release_date", "")
-            if release_date:
-                year = release_date.split("-")[0]
-                if year in search_title:
-                    year_match = 0.2  # Bônus por ano correspondente
-            
-            score = ratio + year_match
+            # Considerar ano de lançamento se ele foi extraído do nome do arquivo
+            release_year = self.get_release_year(movie)
+            if year and release_year:
+                difference = abs(release_year - year)
+                if difference == 0:
+                    score += 0.3
+                elif difference == 1:
+                    score += 0.15
+                else:
+                    score -= 0.2
             
-            if score > best_score:
-                best_score = score
-                best_match = movie
+            # Exigir pontuação mínima de 0.5 (50% similar)
+            if score >= 0.5:
+                scored.append((score, movie))
         
-        # Exigir pontuação mínima de 0.5 (50% similar)
-        if best_score < 0.5:
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [movie for score, movie in scored]
+    
+    def find_best_title_match(self, search_title, results, year=None):
+        """Encontra o melhor match de título entre os resultados."""
+        candidates = self.rank_title_matches(search_title, results, year)
+        return candidates[0] if candidates else None
+    
+    @staticmethod
+    def get_release_year(movie):
+        """Retorna o ano de lançamento de um resultado do TMDB (ou None)."""
+        release_date = movie.get("release_date") or ""
+        try:
+            return int(release_date.split("-")[0])
+        except ValueError:
             return None
-            
-        return best_match
+    
+    def fetch_matching_details(self, candidates, duration=None, max_candidates=2):
+        """
+        Obtém os detalhes do melhor candidato cuja duração confere com o arquivo.
+        
+        A duração (runtime) só existe nos detalhes, então ela serve para validar o
+        melhor candidato: se divergir muito da duração do arquivo, o próximo
+        candidato é consultado. Sem duração conhecida, usa o primeiro candidato.
+        """
+        first_details = None
+        for movie in candidates[:max_candidates]:
+            details = self.movie_fetcher.get_movie_details(movie['id'])
+            if not details:
+                continue
+            if first_details is None:
+                first_details = details
+            if self.runtime_matches(details.get("runtime"), duration):
+                return details
+        return first_details
+    
+    @staticmethod
+    def runtime_matches(runtime, duration):
+        """Verifica se a duração do filme (minutos) confere com a do arquivo (segundos)."""
+        if not runtime or not duration:
+            return True
+        difference = abs(runtime - duration / 60)
+        # Tolera cortes estendidos, créditos e diferenças de framerate
+        return difference <= max(15, runtime * 0.2)
     
     def get_alternative_search_term(self, title):
         """Cria termos de busca alternativos para melhorar a pesquisa."""
@@ -269,22 +358,40 @@ class AutomaticMovieAddThread(QThread):
         return alt_title if alt_title != title else None
 
 
-class TMDBSearchThread(QThread):
-    """Thread para buscar filmes na API do TMDB."""
-    search_completed = pyqtSignal(list)
+class TMDBSearchTask(Task):
+    """Tarefa para buscar uma página de filmes na API do TMDB."""
+    # Geração da busca, resultados e total de páginas
+    search_completed = pyqtSignal(int, list, int)
     
-    def __init__(self, fetcher, title):
+    def __init__(self, fetcher, title, year=None, page=1, generation=0):
         super().__init__()
         self.fetcher = fetcher
         self.title = title
+        self.year = year
+        self.page = page
+        self.generation = generation
         
     def run(self):
-        results = self.fetcher.search_movie(self.title)
-        self.search_completed.emit(results)
+        try:
+            results, total_pages = self.fetcher.search_movie_page(self.title, self.year, self.page, timeout=15)
+            if not results and self.year and self.page == 1:
+                # O ano do nome do arquivo pode estar errado; repete sem ele
+                self.year = None
+                results, total_pages = self.fetcher.search_movie_page(self.title, timeout=15)
+        except Exception as e:
+            print(f"Erro na busca por '{self.title}': {e}")
+            results, total_pages = [], 0
+        self.search_completed.emit(self.generation, results, total_pages)
 
 
-class MovieDetailsFetchThread(QThread):
-    """Thread para buscar detalhes completos de um filme."""
+class MovieDetailsFetchTask(Task):
+    """
+    Tarefa para buscar os detalhes de um filme para a pré-visualização.
+    
+    Baixa só os detalhes e um poster pequeno para a pasta temporária; as
+    imagens definitivas ficam para MovieAssetsCommitTask, quando o filme é
+    adicionado.
+    """
     fetch_completed = pyqtSignal(dict)
     
     def __init__(self, fetcher, movie_id):
@@ -293,50 +400,79 @@ class MovieDetailsFetchThread(QThread):
         self.movie_id = movie_id
         
     def run(self):
-        movie_details = self.fetcher.get_movie_details(self.movie_id)
-        if movie_details:
-            # Baixar o poster
-            local_poster_path = None
-            if movie_details.get("poster_path"):
-                local_poster_path = self.fetcher.download_poster(
-                    movie_details["poster_path"], 
+        # Sempre emite: um dicionário vazio leva o diálogo à mensagem de erro
+        movie_info = {}
+        try:
+            movie_details = self.fetcher.get_movie_details(self.movie_id, timeout=15)
+            if movie_details:
+                movie_info = self.fetcher.parse_movie_info(movie_details)
+                movie_info["preview_poster_path"] = self.fetcher.download_preview_poster(
+                    movie_details.get("poster_path"),
                     movie_details["id"]
                 )
-            
-            # Extrair informações relevantes
-            movie_info = self.fetcher.extract_movie_info(movie_details)
-            movie_info["local_poster_path"] = local_poster_path
-            
-            self.fetch_completed.emit(movie_info)
-        else:
-            self.fetch_completed.emit({})
+        except (requests.RequestException, OSError) as e:
+            print(f"Erro ao buscar detalhes do filme {self.movie_id}: {e}")
+            movie_info = {}
+        self.fetch_completed.emit(movie_info)
+
+
+class MovieAssetsCommitTask(Task):
+    """Tarefa que baixa poster, backdrop e fotos do elenco do filme confirmado."""
+    commit_completed = pyqtSignal(dict)
+    
+    def __init__(self, fetcher, movie_info, file_path=None):
+        super().__init__()
+        self.fetcher = fetcher
+        # Cópia: a pré-visualização em cache continua sem as imagens definitivas
+        self.movie_info = copy.deepcopy(movie_info)
+        self.file_path = file_path
+        
+    def run(self):
+        try:
+            movie_info = self.fetcher.download_movie_assets(self.movie_info)
+            movie_info.pop("preview_poster_path", None)
+            if self.file_path:
+                movie_info["media_info"] = read_media_info(self.file_path)
+            self.commit_completed.emit(movie_info)
+        except Exception as e:
+            print(f"Erro ao baixar imagens do filme: {e}")
+            self.commit_completed.emit({})
 
 
 class AddMovieDialog(QDialog):
     """Diálogo para adicionar um novo filme."""
+    # Busca enquanto digita: espera uma pausa na digitação e um mínimo de letras
+    SEARCH_DELAY_MS = 400
+    MIN_SEARCH_LENGTH = 2
     
     def __init__(self, movie_manager, parent=None):
         super().__init__(parent)
         self.movie_manager = movie_manager
         self.movie_fetcher = MovieFetcher()
         self.selected_file_path = ""
+        self.selected_file_duration = None
         self.selected_movie_info = None
+        # Pré-visualizações já buscadas nesta janela (tmdb_id -> detalhes)
+        self.preview_cache = {}
+        self.file_title_year = None
         self.found_movies = []
-        self.catalog = self.load_catalog()
+        self.import_queue = ImportQueue()
+        self.closing = False
+        
+        # Cada nova busca incrementa a geração; respostas de buscas anteriores são descartadas
+        self.search_generation = 0
+        self.search_request = None
+        self.search_task = None
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.timeout.connect(lambda: self.search_movie(typed=True))
+        
+        # Miniaturas dos resultados (poster_path -> itens da lista aguardando a imagem)
+        self.thumbnail_loader = ImageLoader(self.movie_fetcher.fetch_thumbnail)
+        self.thumbnail_loader.image_loaded.connect(self.on_thumbnail_loaded)
+        self.thumbnail_items = {}
         self.init_ui()
         
-    def load_catalog(self):
-        """Carrega o catálogo existente para verificar duplicatas."""
-        catalog_path = os.path.join("data", "catalog.json")
-        if os.path.exists(catalog_path):
-            try:
-                with open(catalog_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"Erro ao carregar catálogo: {e}")
-                return {"movies": []}
-        return {"movies": []}
-        
     def init_ui(self):
         self.setWindowTitle("Adicionar Filme")
         self.setMinimumSize(800, 600)
@@ -365,6 +501,12 @@ class AddMovieDialog(QDialog):
         browse_folder_button.clicked.connect(self.browse_folder)
         file_layout.addWidget(browse_folder_button)
         
+        # Reprocessa só os arquivos pendentes ou com falha de importações anteriores
+        self.retry_button = QPushButton()
+        self.retry_button.clicked.connect(self.retry_failed_imports)
+        file_layout.addWidget(self.retry_button)
+        self.update_retry_button()
+        
         file_section.addLayout(file_layout)
         
         # Opção para processamento automático
@@ -402,6 +544,8 @@ class AddMovieDialog(QDialog):
         
         self.search_edit = QLineEdit()
         self.search_edit.setPlaceholderText("Digite o título do filme...")
+        self.search_edit.textEdited.connect(self.schedule_search)
+        self.search_edit.returnPressed.connect(self.search_movie)
         search_layout.addWidget(self.search_edit)
         
         search_button = QPushButton("Buscar")
@@ -410,13 +554,25 @@ class AddMovieDialog(QDialog):
         
         search_section.addLayout(search_layout)
         
+        self.search_status_label = QLabel("")
+        self.search_status_label.setStyleSheet("color: gray;")
+        search_section.addWidget(self.search_status_label)
+        
         # Lista de resultados
         results_layout = QHBoxLayout()
         
+        results_column = QVBoxLayout()
         self.results_list = QListWidget()
         self.results_list.setStyleSheet("font-size: 14px;")
+        self.results_list.setIconSize(QSize(46, 69))
         self.results_list.itemClicked.connect(self.select_movie)
-        results_layout.addWidget(self.results_list, 2)
+        results_column.addWidget(self.results_list)
+        
+        self.more_results_button = QPushButton("Mais resultados")
+        self.more_results_button.clicked.connect(self.load_more_results)
+        self.more_results_button.hide()
+        results_column.addWidget(self.more_results_button)
+        results_layout.addLayout(results_column, 2)
         
         # Painel de detalhes do filme selecionado
         self.details_panel = QVBoxLayout()
@@ -442,6 +598,13 @@ class AddMovieDialog(QDialog):
         self.overview_label.setAlignment(Qt.AlignTop)
         self.details_panel.addWidget(self.overview_label)
         
+        # Aviso quando a duração do candidato não confere com a do arquivo
+        self.runtime_warning_label = QLabel()
+        self.runtime_warning_label.setWordWrap(True)
+        self.runtime_warning_label.setStyleSheet("color: #FFB020;")
+        self.runtime_warning_label.hide()
+        self.details_panel.addWidget(self.runtime_warning_label)
+        
         self.details_panel.addStretch()
         results_layout.addLayout(self.details_panel, 1)
         
@@ -567,6 +730,9 @@ class AddMovieDialog(QDialog):
                 
             self.selected_file_path = file_path
             self.file_path_edit.setText(file_path)
+            # Lida só do cabeçalho (alguns KB) para conferir a duração dos candidatos;
+            # o ffprobe não roda na thread da interface (sem duração, não há aviso)
+            self.selected_file_duration = read_duration(file_path)
             
             # Verificar se o filme já existe no catálogo
             if self.skip_duplicates_checkbox.isChecked() and self.movie_exists_in_catalog(file_path):
@@ -577,13 +743,10 @@ class AddMovieDialog(QDialog):
                 )
                 return
             
-            # Extrair o nome do arquivo (sem extensão) para usar como termo de busca
-            filename = os.path.basename(file_path)
-            basename = os.path.splitext(filename)[0]
-
-            # Criar uma instância da classe BatchScanThread apenas para usar o método clean_movie_title
-            scan_thread = BatchScanThread("", self.movie_manager)
-            clean_title = scan_thread.clean_movie_title(basename)
+            # Extrair título e ano do nome do arquivo para usar como termo de busca
+            title_info = get_title_parser().parse(os.path.basename(file_path))
+            clean_title = title_info["title"]
+            self.file_title_year = (clean_title, title_info["year"])
             
             # Preencher o campo de busca com o nome limpo
             self.search_edit.setText(clean_title.strip())
@@ -593,37 +756,11 @@ class AddMovieDialog(QDialog):
     
     def clean_movie_title(self, filename):
         """Remove termos técnicos do nome do arquivo para obter o título do filme."""
-        # Substituir separadores comuns por espaços
-        name = filename.replace('.', ' ').replace('_', ' ').replace('-', ' ')
-        
-        # Remover termos técnicos comuns
-        patterns = [
-            r'\b\d{4}\b',  # Anos (ex: 2022)
-            r'\b(1080p|720p|480p|4K|UHD|HD|FHD)\b',  # Resoluções
-            r'\b(BluRay|BRRip|WEBRip|HDTV|DVDRip|WEB-DL|HDRIP)\b',  # Fontes
-            r'\b(x264|x265|HEVC|XviD|h264|h265)\b',  # Codecs de vídeo
-            r'\b(AAC|AC3|DTS|MP3|FLAC|DDP5.1|DDP|DD5.1)\b',  # Codecs de áudio
-            r'\b(DUAL|DUBLADO|LEGENDADO|DUB|PT-BR|PT|BR|EN|ENG|PTBR)\b',  # Idiomas
-            r'\b(5.1|7.1|2.0)\b',  # Canais de áudio
-            r'\bwww\.[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b',  # URLs
-            r'\b(EXTENDED|DIRECTORS.CUT|UNRATED|REMASTERED|REMUX)\b',  # Versões
-            r'\[.*?\]|\(.*?\)',  # Qualquer coisa entre colchetes ou parênteses
-        ]
-        
-        for pattern in patterns:
-            name = re.sub(pattern, '', name, flags=re.IGNORECASE)
-        
-        # Remover múltiplos espaços e espaços no início/fim
-        name = re.sub(r'\s+', ' ', name).strip()
-        
-        return name
+        return get_title_parser().clean_title(filename)
     
     def movie_exists_in_catalog(self, file_path):
         """Verifica se o filme já existe no catálogo pelo caminho do arquivo."""
-        for movie in self.catalog.get("movies", []):
-            if movie.get("file_path") == file_path:
-                return True
-        return False
+        return self.movie_manager.find_by_file_path(file_path) is not None
     
     def browse_folder(self):
         """Abre um diálogo para selecionar uma pasta contendo filmes."""
@@ -642,53 +779,74 @@ class AddMovieDialog(QDialog):
     def scan_folder_for_movies(self, folder_path):
         """Escaneia a pasta em busca de arquivos de vídeo que possam ser filmes."""
         # Criar e mostrar diálogo de progresso
-        self.scan_progress = QProgressDialog("Escaneando pasta por filmes...", "Cancelar", 0, 0, self)
-        self.scan_progress.setWindowTitle("Escaneando")
-        self.scan_progress.setWindowModality(Qt.WindowModal)
-        self.scan_progress.setMinimumDuration(0)
+        control = JobControl()
+        self.scan_progress = JobProgressDialog("Escaneando", "Escaneando filmes...", control, "arquivos", self)
         self.scan_progress.show()
-        QApplication.processEvents()
         
         # Limpar log
         self.log_list.clear()
         self.add_log_message("Iniciando escaneamento da pasta...")
         
-        # Iniciar thread de escaneamento
-        self.scan_thread = BatchScanThread(folder_path, self.movie_manager)
-        self.scan_thread.progress_updated.connect(self.update_scan_progress)
-        self.scan_thread.movie_found.connect(self.on_movie_found)
-        self.scan_thread.scan_completed.connect(self.on_scan_completed)
-        self.scan_thread.start()
+        # Pastas escaneadas formam a biblioteca usada na busca de duplicados
+        library_roots = get_preference("library_roots", [])
+        if folder_path not in library_roots:
+            set_preference("library_roots", library_roots + [folder_path])
+        
+        # Enviar a varredura ao executor compartilhado
+        self.scan_task = BatchScanTask(folder_path, self.movie_manager, control)
+        self.scan_task.progress_updated.connect(self.update_scan_progress)
+        self.scan_task.movie_found.connect(self.on_movie_found)
+        self.scan_task.movies_relinked.connect(self.on_movies_relinked)
+        self.scan_task.scan_completed.connect(self.on_scan_completed)
+        get_task_runner().submit(self.scan_task)
     
     def update_scan_progress(self, current, total):
         """Atualiza a barra de progresso do escaneamento."""
-        if self.scan_progress.wasCanceled():
-            self.scan_thread.terminate()
-            return
-        
-        self.scan_progress.setMaximum(total)
-        self.scan_progress.setValue(current)
-        self.scan_progress.setLabelText(f"Escaneando filmes... ({current}/{total})")
+        self.scan_progress.set_progress(current, total)
     
     def on_movie_found(self, clean_title, file_path):
         """Manipula o evento quando um filme é encontrado durante o escaneamento."""
         self.add_log_message(f"Filme encontrado: {clean_title}")
     
+    def on_movies_relinked(self, movies):
+        """Registra no log os filmes reencontrados em um novo caminho."""
+        for movie in movies:
+            self.add_log_message(f"Arquivo reencontrado: {movie.get('title')}")
+    
     def on_scan_completed(self, found_movies):
         """Manipula o evento quando o escaneamento é concluído."""
+        self.scan_progress.finish()
         self.found_movies = []
         
+        # Varredura cancelada: os arquivos já verificados ficam na fila para depois
+        if self.scan_task.control.is_cancelled():
+            self.import_queue.enqueue([movie for movie in found_movies
+                                       if not self.movie_exists_in_catalog(movie[1])])
+            self.import_queue.save()
+            if not self.closing:
+                self.update_retry_button()
+                self.add_log_message(f"Escaneamento cancelado: {len(found_movies)} filmes guardados na fila",
+                                     success=False)
+            return
+        
         # Filtrar duplicatas se necessário
         if self.skip_duplicates_checkbox.isChecked():
-            for title, file_path in found_movies:
+            for title, file_path, metadata in found_movies:
                 if not self.movie_exists_in_catalog(file_path):
-                    self.found_movies.append((title, file_path))
+                    self.found_movies.append((title, file_path, metadata))
                 else:
                     self.add_log_message(f"Pulando filme duplicado: {title}", success=False)
         else:
             self.found_movies = found_movies
         
-        self.scan_progress.close()
+        # Registrar na fila de importação e pular falhas que ainda aguardam nova tentativa
+        self.import_queue.enqueue(self.found_movies)
+        self.import_queue.save()
+        waiting = [movie for movie in self.found_movies if self.import_queue.is_waiting(movie[1])]
+        if waiting:
+            self.found_movies = [movie for movie in self.found_movies if movie not in waiting]
+            self.add_log_message(f"Aguardando nova tentativa: {len(waiting)} filmes que falharam recentemente",
+                                 success=False)
         
         if not self.found_movies:
             QMessageBox.information(self, "Escaneamento Concluído", 
@@ -713,33 +871,32 @@ class AddMovieDialog(QDialog):
         if not self.found_movies:
             return
         
-        # Criar e mostrar diálogo de progresso
-        self.processing_progress = QProgressDialog("Processando filmes...", "Cancelar", 0, len(self.found_movies), self)
-        self.processing_progress.setWindowTitle("Adicionando Filmes")
-        self.processing_progress.setWindowModality(Qt.WindowModal)
-        self.processing_progress.setMinimumDuration(0)
+        # Criar e mostrar diálogo de progresso. A importação cede a vez às
+        # tarefas interativas (busca, detalhes) entre um filme e outro
+        control = JobControl(gate=get_task_runner().interactive_idle)
+        self.processing_progress = JobProgressDialog("Adicionando Filmes", "Processando filmes...", control,
+                                                     "filmes", self)
+        self.processing_progress.set_progress(0, len(self.found_movies))
         self.processing_progress.show()
-        QApplication.processEvents()
         
-        # Iniciar thread de processamento
-        self.auto_add_thread = AutomaticMovieAddThread(
+        # Enviar a importação ao executor compartilhado
+        title_index = TitleIndex()
+        self.auto_add_task = AutomaticMovieAddTask(
             self.found_movies,
             self.movie_manager,
-            self.movie_fetcher
+            self.movie_fetcher,
+            title_index=title_index if title_index.open() else None,
+            import_queue=self.import_queue,
+            control=control
         )
-        self.auto_add_thread.progress_updated.connect(self.update_processing_progress)
-        self.auto_add_thread.movie_processed.connect(self.on_movie_processed)
-        self.auto_add_thread.processing_completed.connect(self.on_processing_completed)
-        self.auto_add_thread.start()
+        self.auto_add_task.progress_updated.connect(self.update_processing_progress)
+        self.auto_add_task.movie_processed.connect(self.on_movie_processed)
+        self.auto_add_task.processing_completed.connect(self.on_processing_completed)
+        get_task_runner().submit(self.auto_add_task)
     
     def update_processing_progress(self, current, total):
         """Atualiza a barra de progresso do processamento."""
-        if self.processing_progress.wasCanceled():
-            self.auto_add_thread.terminate()
-            return
-        
-        self.processing_progress.setValue(current)
-        self.processing_progress.setLabelText(f"Processando filmes... ({current}/{total})")
+        self.processing_progress.set_progress(current, total)
     
     def on_movie_processed(self, movie_title, success, message):
         """Manipula o evento quando um filme é processado."""
@@ -749,103 +906,207 @@ class AddMovieDialog(QDialog):
     
     def on_processing_completed(self):
         """Manipula o evento quando o processamento é concluído."""
-        self.processing_progress.close()
-        QMessageBox.information(
-            self, 
-            "Processamento Concluído", 
-            "O processamento dos filmes foi concluído. Os filmes foram adicionados ao catálogo."
-        )
+        self.processing_progress.finish()
+        if self.closing:
+            return
+        self.update_retry_button()
+        
+        if self.auto_add_task.control.is_cancelled():
+            QMessageBox.information(
+                self,
+                "Processamento Cancelado",
+                f"A importação foi interrompida. {len(self.import_queue)} filmes continuam na fila "
+                "e podem ser retomados depois."
+            )
+            self.add_log_message("Processamento de filmes cancelado", success=False)
+            return
+        
+        # Relatório da importação: falhas agrupadas por motivo
+        report = self.import_queue.report()
+        message = "O processamento dos filmes foi concluído. Os filmes foram adicionados ao catálogo."
+        if report["failed"]:
+            reasons = "\n".join(f"  {reason}: {count}" for reason, count in report["reasons"].items())
+            message += (f"\n\n{report['failed']} filmes não foram adicionados e ficarão na fila "
+                        f"para uma nova tentativa:\n{reasons}")
+        QMessageBox.information(self, "Processamento Concluído", message)
         self.add_log_message("Processamento de filmes concluído")
         self.accept()
     
-    def search_movie(self):
-        """Busca filmes com base no título inserido."""
+    def done(self, result):
+        """Cancela a varredura e a importação em andamento ao fechar o diálogo."""
+        self.closing = True
+        for name in ("scan_task", "auto_add_task"):
+            task = getattr(self, name, None)
+            if task is not None and task.is_active():
+                task.control.cancel()
+        self.search_timer.stop()
+        self.thumbnail_loader.cancel_pending()
+        details_task = getattr(self, "details_task", None)
+        if details_task is None or not details_task.is_active():
+            self.movie_fetcher.clear_preview_cache()
+        super().done(result)
+    
+    def update_retry_button(self):
+        """Mostra no botão quantos arquivos aguardam nova tentativa."""
+        count = len(self.import_queue)
+        self.retry_button.setText(f"Retomar Fila ({count})")
+        self.retry_button.setEnabled(count > 0)
+    
+    def retry_failed_imports(self):
+        """Processa apenas os arquivos da fila de importação, sem varrer as pastas."""
+        # Arquivos removidos ou já catalogados saem da fila
+        for title, file_path, metadata in self.import_queue.due_items(force=True):
+            if not os.path.exists(file_path) or self.movie_exists_in_catalog(file_path):
+                self.import_queue.mark_done(file_path)
+        self.import_queue.save()
+        
+        self.found_movies = self.import_queue.due_items()
+        if not self.found_movies and len(self.import_queue):
+            answer = QMessageBox.question(
+                self,
+                "Retomar Fila",
+                "As falhas recentes ainda estão no intervalo de espera. Tentar mesmo assim?",
+                QMessageBox.Yes | QMessageBox.No
+            )
+            if answer == QMessageBox.Yes:
+                self.found_movies = self.import_queue.due_items(force=True)
+        
+        self.update_retry_button()
+        if not self.found_movies:
+            return
+        
+        self.log_list.clear()
+        self.add_log_message(f"Repetindo {len(self.found_movies)} filmes da fila de importação")
+        self.process_found_movies()
+    
+    def schedule_search(self):
+        """Agenda a busca para quando o usuário parar de digitar."""
+        if len(self.search_edit.text().strip()) >= self.MIN_SEARCH_LENGTH:
+            self.search_timer.start(self.SEARCH_DELAY_MS)
+        else:
+            self.search_timer.stop()
+    
+    def search_movie(self, typed=False):
+        """
+        Busca filmes com base no título inserido.
+        
+        Args:
+            typed: Busca disparada pela digitação; nesse caso um resultado único
+                não é aberto automaticamente, para não interromper o usuário
+        """
+        self.search_timer.stop()
         search_term = self.search_edit.text().strip()
         if not search_term:
             QMessageBox.warning(self, "Campo Vazio", "Digite um título para buscar.")
             return
         
-        # Mostrar diálogo de progresso
-        progress = QProgressDialog("Buscando filmes...", "Cancelar", 0, 0, self)
-        progress.setWindowTitle("Aguarde")
-        progress.setWindowModality(Qt.WindowModal)
-        progress.show()
-        QApplication.processEvents()
+        # Usar o ano do arquivo apenas enquanto o termo for o título extraído dele
+        year = None
+        if self.file_title_year and self.file_title_year[0] == search_term:
+            year = self.file_title_year[1]
         
-        # Iniciar thread de busca
-        self.search_thread = TMDBSearchThread(self.movie_fetcher, search_term)
-        self.search_thread.search_completed.connect(self.handle_search_results)
-        self.search_thread.finished.connect(progress.close)
-        self.search_thread.start()
+        self.start_search(search_term, year, auto_select=not typed)
+    
+    def start_search(self, title, year=None, page=1, alternative=False, auto_select=False):
+        """
+        Inicia a busca de uma página de resultados em segundo plano.
+        
+        Uma busca nova (página 1) torna obsoletas as anteriores: a requisição
+        em andamento não é interrompida, mas a resposta dela é ignorada, e as
+        miniaturas que ainda não começaram a baixar são descartadas.
+        """
+        if page == 1:
+            self.search_generation += 1
+            self.thumbnail_loader.cancel_pending()
+            # Uma busca anterior que ainda nem começou sai da fila
+            if self.search_task is not None:
+                get_task_runner().cancel(self.search_task)
+        
+        self.search_request = {
+            "title": title, "year": year, "page": page,
+            "alternative": alternative, "auto_select": auto_select,
+        }
+        self.search_task = TMDBSearchTask(self.movie_fetcher, title, year, page, self.search_generation)
+        self.search_task.search_completed.connect(self.handle_search_results)
+        self.search_status_label.setText(f"Buscando \"{title}\"...")
+        self.more_results_button.setEnabled(False)
+        get_task_runner().submit(self.search_task)
+    
+    def load_more_results(self):
+        """Busca a próxima página da busca atual."""
+        request = self.search_request
+        if request:
+            self.start_search(request["title"], request["year"], request["page"] + 1, request["alternative"])
     
-    def handle_search_results(self, results):
+    def handle_search_results(self, generation, results, total_pages):
         """Processa os resultados da busca."""
-        self.results_list.clear()
+        if generation != self.search_generation or self.closing:
+            return
         
-        if not results:
-            # Tentar busca alternativa se não encontrar resultados
-            search_term = self.search_edit.text().strip()
-            alternative_term = self.get_alternative_search_term(search_term)
-            
-            if alternative_term and alternative_term != search_term:
-                # Mostrar diálogo de progresso
-                progress = QProgressDialog(f"Tentando busca alternativa: {alternative_term}", "Cancelar", 0, 0, self)
-                progress.setWindowTitle("Aguarde")
-                progress.setWindowModality(Qt.WindowModal)
-                progress.show()
-                QApplication.processEvents()
-                
-                # Iniciar thread de busca alternativa
-                self.alt_search_thread = TMDBSearchThread(self.movie_fetcher, alternative_term)
-                self.alt_search_thread.search_completed.connect(self.handle_alternative_search_results)
-                self.alt_search_thread.finished.connect(progress.close)
-                self.alt_search_thread.start()
-                return
-            else:
-                self.results_list.addItem("Nenhum resultado encontrado.")
+        request = self.search_request
+        # A tarefa pode ter repetido a busca sem o ano; as próximas páginas seguem assim
+        request["year"] = self.sender().year
+        self.search_status_label.setText("")
+        
+        if request["page"] == 1:
+            self.clear_results()
+            if not results:
+                # Tentar busca alternativa se não encontrar resultados
+                alternative_term = None
+                if not request["alternative"]:
+                    alternative_term = self.get_alternative_search_term(request["title"])
+                if alternative_term:
+                    self.start_search(alternative_term, alternative=True)
+                elif request["alternative"]:
+                    self.results_list.addItem("Nenhum resultado encontrado com busca alternativa.")
+                else:
+                    self.results_list.addItem("Nenhum resultado encontrado.")
                 return
         
+        suffix = " [busca alternativa]" if request["alternative"] else ""
         for movie in results:
-            title = movie.get("title", "Sem título")
-            year = ""
-            release_date = movie.get("release_date", "")
-            if release_date:
-                try:
-                    year = f" ({release_date.split('-')[0]})"
-                except:
-                    pass
-            
-            item = QListWidgetItem(f"{title}{year}")
-            item.setData(Qt.UserRole, movie)
-            self.results_list.addItem(item)
-            
-            # Se houver apenas um resultado e for muito similar ao termo de busca, selecionar automaticamente
-            if len(results) == 1:
-                search_term = self.search_edit.text().strip().lower()
-                movie_title = title.lower()
-                if search_term in movie_title or movie_title in search_term:
-                    self.results_list.setCurrentItem(item)
-                    self.select_movie(item)
-    
-    def handle_alternative_search_results(self, results):
-        """Processa os resultados da busca alternativa."""
-        if not results:
-            self.results_list.addItem("Nenhum resultado encontrado com busca alternativa.")
-            return
-            
-        for movie in results:
-            title = movie.get("title", "Sem título")
-            year = ""
-            release_date = movie.get("release_date", "")
-            if release_date:
-                try:
-                    year = f" ({release_date.split('-')[0]})"
-                except:
-                    pass
-            
-            item = QListWidgetItem(f"{title}{year} [busca alternativa]")
-            item.setData(Qt.UserRole, movie)
-            self.results_list.addItem(item)
+            self.add_result_item(movie, suffix)
+        
+        self.more_results_button.setVisible(request["page"] < total_pages)
+        self.more_results_button.setEnabled(True)
+        
+        # Se houver apenas um resultado e for muito similar ao termo de busca, selecionar automaticamente
+        if request["auto_select"] and request["page"] == 1 and len(results) == 1 and not request["alternative"]:
+            search_term = self.search_edit.text().strip().lower()
+            movie_title = results[0].get("title", "").lower()
+            if search_term in movie_title or movie_title in search_term:
+                item = self.results_list.item(0)
+                self.results_list.setCurrentItem(item)
+                self.select_movie(item)
+    
+    def clear_results(self):
+        self.results_list.clear()
+        self.thumbnail_items.clear()
+        self.more_results_button.hide()
+    
+    def add_result_item(self, movie, suffix=""):
+        """Acrescenta um filme à lista de resultados e pede a miniatura do poster."""
+        title = movie.get("title", "Sem título")
+        year = ""
+        release_date = movie.get("release_date", "")
+        if release_date:
+            year = f" ({release_date.split('-')[0]})"
+        
+        item = QListWidgetItem(f"{title}{year}{suffix}")
+        item.setData(Qt.UserRole, movie)
+        self.results_list.addItem(item)
+        
+        poster_path = movie.get("poster_path")
+        if poster_path:
+            pixmap = self.thumbnail_loader.request(poster_path)
+            if pixmap is not None:
+                item.setIcon(QIcon(pixmap))
+            else:
+                self.thumbnail_items.setdefault(poster_path, []).append(item)
+    
+    def on_thumbnail_loaded(self, poster_path, pixmap):
+        for item in self.thumbnail_items.pop(poster_path, []):
+            item.setIcon(QIcon(pixmap))
     
     def get_alternative_search_term(self, title):
         """Cria termos de busca alternativos para melhorar a pesquisa."""
@@ -868,6 +1129,12 @@ class AddMovieDialog(QDialog):
         if not movie_data:
             return
         
+        # Candidato já visto nesta janela: nada a baixar
+        cached = self.preview_cache.get(movie_data["id"])
+        if cached:
+            self.show_movie_details(cached)
+            return
+        
         # Mostrar diálogo de progresso
         progress = QProgressDialog("Obtendo detalhes do filme...", "Cancelar", 0, 0, self)
         progress.setWindowTitle("Aguarde")
@@ -875,11 +1142,20 @@ class AddMovieDialog(QDialog):
         progress.show()
         QApplication.processEvents()
         
-        # Iniciar thread para buscar detalhes completos
-        self.details_thread = MovieDetailsFetchThread(self.movie_fetcher, movie_data["id"])
-        self.details_thread.fetch_completed.connect(self.show_movie_details)
-        self.details_thread.finished.connect(progress.close)
-        self.details_thread.start()
+        # Buscar os detalhes para a pré-visualização (à frente de buscas na fila: foi um clique)
+        self.details_task = MovieDetailsFetchTask(self.movie_fetcher, movie_data["id"])
+        self.details_task.fetch_completed.connect(self.show_movie_details)
+        self.details_task.finished.connect(progress.close)
+        progress.canceled.connect(lambda task=self.details_task: self.cancel_details_fetch(task))
+        get_task_runner().submit(self.details_task, priority=1)
+    
+    def cancel_details_fetch(self, task):
+        """Descarta a busca de detalhes cancelada pelo usuário (a resposta, se vier, é ignorada)."""
+        get_task_runner().cancel(task)
+        try:
+            task.fetch_completed.disconnect(self.show_movie_details)
+        except TypeError:
+            pass
     
     def show_movie_details(self, movie_info):
         """Exibe os detalhes do filme selecionado."""
@@ -888,9 +1164,10 @@ class AddMovieDialog(QDialog):
             return
         
         self.selected_movie_info = movie_info
+        self.preview_cache[movie_info["id"]] = movie_info
         
         # Exibir poster
-        poster_path = movie_info.get("local_poster_path")
+        poster_path = movie_info.get("preview_poster_path")
         if poster_path and os.path.exists(poster_path):
             pixmap = QPixmap(poster_path)
             pixmap = pixmap.scaled(200, 300, Qt.KeepAspectRatio, Qt.SmoothTransformation)
@@ -914,6 +1191,16 @@ class AddMovieDialog(QDialog):
         overview = movie_info.get("overview", "Sinopse não disponível.")
         self.overview_label.setText(overview)
         
+        # Conferir a duração com a do arquivo (já lida, sem novo acesso ao disco)
+        runtime = movie_info.get("runtime")
+        if self.selected_file_path and not AutomaticMovieAddTask.runtime_matches(runtime, self.selected_file_duration):
+            self.runtime_warning_label.setText(
+                f"Atenção: o arquivo tem {self.selected_file_duration / 60:.0f} min e este filme, "
+                f"{runtime} min. Confira se é o filme certo.")
+            self.runtime_warning_label.show()
+        else:
+            self.runtime_warning_label.hide()
+        
         # Habilitar botão de adicionar
         self.add_button.setEnabled(True if self.selected_file_path else False)
     
@@ -932,8 +1219,28 @@ class AddMovieDialog(QDialog):
             )
             return
         
+        # Baixar as imagens definitivas só agora que o filme foi confirmado
+        progress = QProgressDialog("Baixando imagens do filme...", None, 0, 0, self)
+        progress.setWindowTitle("Aguarde")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.show()
+        
+        self.add_button.setEnabled(False)
+        self.commit_task = MovieAssetsCommitTask(self.movie_fetcher, self.selected_movie_info,
+                                                 self.selected_file_path)
+        self.commit_task.commit_completed.connect(self.finish_add_movie)
+        self.commit_task.finished.connect(progress.close)
+        get_task_runner().submit(self.commit_task, priority=1)
+    
+    def finish_add_movie(self, movie_info):
+        """Adiciona ao catálogo o filme confirmado, já com as imagens baixadas."""
+        self.add_button.setEnabled(True)
+        if not movie_info:
+            QMessageBox.critical(self, "Erro", "Não foi possível baixar as imagens do filme.")
+            return
+        
         # Adicionar filme ao catálogo
-        new_movie = self.movie_manager.add_movie(self.selected_movie_info, self.selected_file_path)
+        new_movie = self.movie_manager.add_movie(movie_info, self.selected_file_path)
         
         if new_movie:
             QMessageBox.information(self, "Sucesso", f"Filme '{new_movie['title']}' adicionado com sucesso!")
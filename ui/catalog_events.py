@@ -0,0 +1,40 @@
+from PyQt5.QtCore import QObject, pyqtSignal
+from core.movie_manager import MOVIE_ADDED, MOVIE_UPDATED, MOVIE_REMOVED, CATALOG_RELOADED
+
+
+class CatalogEvents(QObject):
+    """
+    Repassa as alterações do MovieManager como sinais do Qt.
+
+    As alterações podem vir das threads de importação; como este objeto vive
+    na thread da interface, os sinais chegam aos widgets pela fila de eventos,
+    sempre na thread certa.
+    """
+    movie_added = pyqtSignal(object)
+    movie_updated = pyqtSignal(object)
+    movie_removed = pyqtSignal(object)
+    catalog_reloaded = pyqtSignal()
+
+    def __init__(self, movie_manager, parent=None):
+        super().__init__(parent)
+        self.movie_manager = movie_manager
+        movie_manager.add_listener(self.on_catalog_changed)
+
+    def on_catalog_changed(self, event, movie):
+        if event == MOVIE_ADDED:
+            self.movie_added.emit(movie)
+        elif event == MOVIE_UPDATED:
+            self.movie_updated.emit(movie)
+        elif event == MOVIE_REMOVED:
+            self.movie_removed.emit(movie)
+        elif event == CATALOG_RELOADED:
+            self.catalog_reloaded.emit()
+
+
+def get_catalog_events(movie_manager):
+    """Retorna a ponte de eventos do catálogo (uma por MovieManager, criada na thread da interface)."""
+    events = getattr(movie_manager, "qt_events", None)
+    if events is None:
+        events = CatalogEvents(movie_manager)
+        movie_manager.qt_events = events
+    return events
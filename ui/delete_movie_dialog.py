@@ -1,54 +1,142 @@
 import os
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
-                            QPushButton, QLineEdit, QListWidget, QListWidgetItem,
+                            QPushButton, QLineEdit, QListView, QAbstractItemView,
                             QMessageBox, QFrame, QSizePolicy, QToolButton,
                             QApplication)
-from PyQt5.QtCore import Qt, pyqtSignal, QSize
+from PyQt5.QtCore import (Qt, pyqtSignal, QSize, QAbstractListModel, QModelIndex,
+                          QSortFilterProxyModel)
 from PyQt5.QtGui import QPixmap, QIcon, QFont, QCursor
+from core.movie_manager import STATUS_MISSING
+from ui.catalog_events import get_catalog_events
 
-class MovieListItem(QListWidgetItem):
-    """Item personalizado para a lista de filmes."""
-    def __init__(self, movie):
-        super().__init__()
-        self.movie = movie
-        self.setup_item()
-    
-    def setup_item(self):
-        """Configura o texto e dados do item."""
-        title = self.movie.get('title', 'Sem título')
-        
-        # Adicionar o ano de lançamento se disponível
-        year = ''
-        if self.movie.get('release_date'):
-            release_year = self.movie.get('release_date', '').split('-')[0]
-            if release_year:
-                year = f" ({release_year})"
-        
-        # Adicionar o título original se for diferente do título principal
-        original = ''
-        if (self.movie.get('original_title') and 
-            self.movie.get('original_title') != self.movie.get('title')):
-            original = f"\nTítulo original: {self.movie.get('original_title')}"
-        
-        # Adicionar gêneros se disponíveis
-        genres = ''
-        if self.movie.get('genres'):
-            genres_text = ", ".join(self.movie.get('genres'))
-            if len(genres_text) > 50:
-                genres_text = genres_text[:47] + "..."
-            genres = f"\nGêneros: {genres_text}"
-        
-        # Configurar o texto do item
-        self.setText(f"{title}{year}{original}{genres}")
-        
-        # Armazenar os dados do filme no item
-        self.setData(Qt.UserRole, self.movie)
-        
-        # Ajustar a altura do item para mostrar todas as informações
-        # Calcula a altura necessária com base no número de linhas de texto
-        lines = self.text().count('\n') + 1
-        height = max(60, lines * 20)  # Altura mínima de 60px ou 20px por linha
-        self.setSizeHint(QSize(0, height))
+def format_movie_text(movie):
+    """Monta o texto do filme na lista (título, ano, título original e gêneros)."""
+    title = movie.get('title', 'Sem título')
+    
+    # Adicionar o ano de lançamento se disponível
+    year = ''
+    if movie.get('release_date'):
+        release_year = movie.get('release_date', '').split('-')[0]
+        if release_year:
+            year = f" ({release_year})"
+    
+    # Adicionar o título original se for diferente do título principal
+    original = ''
+    if movie.get('original_title') and movie.get('original_title') != movie.get('title'):
+        original = f"\nTítulo original: {movie.get('original_title')}"
+    
+    # Adicionar gêneros se disponíveis
+    genres = ''
+    if movie.get('genres'):
+        genres_text = ", ".join(movie.get('genres'))
+        if len(genres_text) > 50:
+            genres_text = genres_text[:47] + "..."
+        genres = f"\nGêneros: {genres_text}"
+    
+    # Filmes cujo arquivo sumiu só aparecem aqui (a grade os esconde)
+    missing = " · arquivo não encontrado" if movie.get('status') == STATUS_MISSING else ''
+    
+    return f"{title}{year}{missing}{original}{genres}"
+
+
+class MovieListModel(QAbstractListModel):
+    """
+    Modelo com os filmes do catálogo para a lista de exclusão.
+    
+    O texto de cada filme é montado só quando a linha aparece na tela e fica
+    em cache; a chave de pesquisa (título e título original em minúsculas) é
+    calculada uma vez por filme. Inclusões, alterações e exclusões mexem só
+    na linha afetada.
+    """
+    # Três linhas de texto cabem na altura mínima, então todas as linhas têm a mesma altura
+    ROW_HEIGHT = 60
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.movies = []
+        self.rows = {}
+        self.search_keys = []
+        self.texts = {}
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.movies)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        movie = self.movies[index.row()]
+        if role == Qt.DisplayRole:
+            text = self.texts.get(movie.get('id'))
+            if text is None:
+                text = format_movie_text(movie)
+                self.texts[movie.get('id')] = text
+            return text
+        if role == Qt.UserRole:
+            return movie
+        if role == Qt.SizeHintRole:
+            return QSize(0, self.ROW_HEIGHT)
+        return None
+    
+    @staticmethod
+    def search_key(movie):
+        return f"{movie.get('title') or ''}\n{movie.get('original_title') or ''}".lower()
+    
+    def set_movies(self, movies):
+        self.beginResetModel()
+        self.movies = list(movies)
+        self.rows = {movie.get('id'): row for row, movie in enumerate(self.movies)}
+        self.search_keys = [self.search_key(movie) for movie in self.movies]
+        self.texts = {}
+        self.endResetModel()
+    
+    def add_movie(self, movie):
+        row = len(self.movies)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.movies.append(movie)
+        self.search_keys.append(self.search_key(movie))
+        self.rows[movie.get('id')] = row
+        self.endInsertRows()
+    
+    def update_movie(self, movie):
+        row = self.rows.get(movie.get('id'))
+        if row is None:
+            return
+        self.movies[row] = movie
+        self.search_keys[row] = self.search_key(movie)
+        self.texts.pop(movie.get('id'), None)
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+    
+    def remove_movie(self, movie):
+        row = self.rows.pop(movie.get('id'), None)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.movies[row]
+        del self.search_keys[row]
+        self.texts.pop(movie.get('id'), None)
+        # As linhas seguintes sobem uma posição
+        for following in self.movies[row:]:
+            self.rows[following.get('id')] -= 1
+        self.endRemoveRows()
+
+
+class MovieFilterProxyModel(QSortFilterProxyModel):
+    """Filtra a lista pelo texto da pesquisa (título ou título original)."""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.search_text = ""
+    
+    def set_search_text(self, text):
+        text = text.lower()
+        if text == self.search_text:
+            return
+        self.search_text = text
+        self.invalidateFilter()
+    
+    def filterAcceptsRow(self, source_row, source_parent):
+        return not self.search_text or self.search_text in self.sourceModel().search_keys[source_row]
 
 
 class DeleteConfirmationDialog(QDialog):
@@ -183,6 +271,20 @@ class DeleteMovieDialog(QDialog):
         self.deleted_count = 0
         self.init_ui()
         
+        # A lista acompanha as alterações do catálogo sem ser recarregada
+        self.catalog_events = get_catalog_events(movie_manager)
+        self.catalog_events.movie_added.connect(self.on_movie_added)
+        self.catalog_events.movie_updated.connect(self.on_movie_updated)
+        self.catalog_events.movie_removed.connect(self.on_movie_removed)
+        self.catalog_events.catalog_reloaded.connect(self.load_movies)
+    
+    def done(self, result):
+        self.catalog_events.movie_added.disconnect(self.on_movie_added)
+        self.catalog_events.movie_updated.disconnect(self.on_movie_updated)
+        self.catalog_events.movie_removed.disconnect(self.on_movie_removed)
+        self.catalog_events.catalog_reloaded.disconnect(self.load_movies)
+        super().done(result)
+        
     def init_ui(self):
         """Inicializa a interface da janela de diálogo."""
         self.setWindowTitle("Deletar Filmes")
@@ -240,7 +342,7 @@ class DeleteMovieDialog(QDialog):
                 border: 2px solid #E50914;
                 background-color: #252525;
             }
-            QListWidget {
+            QListView {
                 background-color: #1f1f1f;
                 color: white;
                 border: 1px solid #333;
@@ -249,18 +351,18 @@ class DeleteMovieDialog(QDialog):
                 outline: none;
                 font-size: 13px;
             }
-            QListWidget::item {
+            QListView::item {
                 background-color: #1f1f1f;
                 border-bottom: 1px solid #333;
                 padding: 8px;
                 border-radius: 0px;
             }
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background-color: #252525;
                 color: white;
                 border-left: 3px solid #E50914;
             }
-            QListWidget::item:hover {
+            QListView::item:hover {
                 background-color: #2a2a2a;
             }
             QScrollBar:vertical {
@@ -309,11 +411,19 @@ class DeleteMovieDialog(QDialog):
         self.search_input.textChanged.connect(self.filter_movies)
         main_layout.addWidget(self.search_input)
         
-        # Lista de filmes
-        self.movies_list = QListWidget()
+        # Lista de filmes (modelo com todos os filmes + filtro da pesquisa)
+        self.movies_model = MovieListModel(self)
+        self.filter_model = MovieFilterProxyModel(self)
+        self.filter_model.setSourceModel(self.movies_model)
+        
+        self.movies_list = QListView()
+        self.movies_list.setModel(self.filter_model)
         self.movies_list.setAlternatingRowColors(True)
-        self.movies_list.setSelectionMode(QListWidget.SingleSelection)
-        self.movies_list.itemClicked.connect(self.enable_delete_button)
+        # Ctrl/Shift + clique seleciona vários filmes para excluir de uma vez
+        self.movies_list.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        # Linhas de altura fixa: a lista não mede cada item (catálogos com dezenas de milhares de filmes)
+        self.movies_list.setUniformItemSizes(True)
+        self.movies_list.selectionModel().selectionChanged.connect(self.enable_delete_button)
         main_layout.addWidget(self.movies_list)
         
         # Barra de status para mostrar quantidade de filmes encontrados
@@ -352,118 +462,97 @@ class DeleteMovieDialog(QDialog):
     
     def load_movies(self):
         """Carrega todos os filmes do catálogo na lista."""
-        self.movies_list.clear()
-        
         movies = self.movie_manager.get_all_movies()
+        self.movies_model.set_movies(movies)
+        self.enable_delete_button()
+        
         if not movies:
             self.status_label.setText("O catálogo está vazio")
             self.delete_all_button.setEnabled(False)  # Desabilita o botão se não houver filmes
             return
         
-        for movie in movies:
-            self.add_movie_to_list(movie)
-        
         self.status_label.setText(f"{len(movies)} filmes encontrados no catálogo")
         self.delete_all_button.setEnabled(True)  # Habilita o botão se houver filmes
     
-    def add_movie_to_list(self, movie):
-        """Adiciona um filme à lista com formato mais simples e confiável."""
-        item = MovieListItem(movie)
-        self.movies_list.addItem(item)
+    def on_movie_added(self, movie):
+        self.movies_model.add_movie(movie)
+        self.delete_all_button.setEnabled(True)
+    
+    def on_movie_updated(self, movie):
+        self.movies_model.update_movie(movie)
+    
+    def on_movie_removed(self, movie):
+        self.movies_model.remove_movie(movie)
+        if not self.movies_model.rowCount():
+            self.delete_all_button.setEnabled(False)
     
     def filter_movies(self):
         """Filtra os filmes com base no texto de pesquisa."""
-        search_text = self.search_input.text().lower()
-        self.movies_list.clear()
+        self.filter_model.set_search_text(self.search_input.text())
         
-        # Recarrega os filmes atuais do catálogo para ter certeza de ter a lista mais recente
-        movies = self.movie_manager.get_all_movies()
-        filtered_movies = []
-        
-        for movie in movies:
-            title = movie.get('title', '').lower()
-            original_title = movie.get('original_title', '').lower()
-            
-            if search_text in title or search_text in original_title:
-                filtered_movies.append(movie)
-                self.add_movie_to_list(movie)
-        
-        if filtered_movies:
-            self.status_label.setText(f"{len(filtered_movies)} filmes encontrados")
+        count = self.filter_model.rowCount()
+        if count:
+            self.status_label.setText(f"{count} filmes encontrados")
         else:
             self.status_label.setText("Nenhum filme encontrado com esse termo")
     
+    def selected_movies(self):
+        return [index.data(Qt.UserRole) for index in self.movies_list.selectionModel().selectedIndexes()]
+    
     def enable_delete_button(self):
-        """Habilita o botão de deletar quando um filme é selecionado."""
-        self.delete_button.setEnabled(True)
+        """Habilita o botão de deletar enquanto houver filmes selecionados."""
+        count = len(self.movies_list.selectionModel().selectedIndexes())
+        self.delete_button.setEnabled(count > 0)
+        self.delete_button.setText(f"Deletar {count} Filmes" if count > 1 else "Deletar Filme")
     
     def delete_selected_movie(self):
-        """Deleta o filme selecionado do catálogo."""
-        current_item = self.movies_list.currentItem()
-        if not current_item:
+        """Deleta os filmes selecionados do catálogo."""
+        movies = [movie for movie in self.selected_movies() if movie.get('id') is not None]
+        if not movies:
             return
         
-        movie = current_item.data(Qt.UserRole)
-        title = movie.get('title', 'Sem título')
-        movie_id = movie.get('id')
-        
-        # Verificação adicional para garantir que temos o ID correto
-        if movie_id is None:
-            QMessageBox.warning(
-                self, 
-                "Erro ao Deletar", 
-                f'Não foi possível identificar o ID do filme "{title}".'
-            )
-            return
+        if len(movies) == 1:
+            title = movies[0].get('title', 'Sem título')
+            question = f'Tem certeza que deseja deletar o filme "{title}" (ID: {movies[0].get("id")}) do catálogo?'
+        else:
+            question = f'Tem certeza que deseja deletar os {len(movies)} filmes selecionados do catálogo?'
         
         # Mensagem de confirmação
         reply = QMessageBox.question(
             self, 
             'Confirmar Exclusão',
-            f'Tem certeza que deseja deletar o filme "{title}" (ID: {movie_id}) do catálogo?',
+            question,
             QMessageBox.Yes | QMessageBox.No,
             QMessageBox.No
         )
+        if reply != QMessageBox.Yes:
+            return
         
-        if reply == QMessageBox.Yes:
-            # Tenta deletar o filme
-            success = self.movie_manager.delete_movie(movie_id)
+        # Uma única alteração do catálogo para todos os selecionados
+        removed = self.movie_manager.delete_many([movie.get('id') for movie in movies])
+        
+        if removed:
+            self.deleted_count += len(removed)
+            self.movie_deleted.emit()
             
-            if success:
-                self.deleted_count += 1
-                self.movie_deleted.emit()  # Emite o sinal para atualizar a lista principal
-                
-                # Remove o item da lista
-                row = self.movies_list.row(current_item)
-                self.movies_list.takeItem(row)
-                
-                # Atualiza o status
-                remaining = self.movies_list.count()
-                self.status_label.setText(f"{remaining} filmes restantes | {self.deleted_count} deletados nesta sessão")
-                
-                # Desabilita o botão novamente
-                self.delete_button.setEnabled(False)
-                
-                # Mostra confirmação
-                QMessageBox.information(
-                    self, 
-                    "Filme Deletado", 
-                    f'O filme "{title}" (ID: {movie_id}) foi removido do catálogo.'
-                )
-                
-                # Recarrega a lista para garantir que esteja atualizada
-                # Isso garante que a lista reflita o estado atual do catálogo
-                self.load_movies()
-                
-                # Reaplica o filtro se houver texto de pesquisa
-                if self.search_input.text():
-                    self.filter_movies()
+            # As linhas já saíram da lista pelo evento de remoção do catálogo
+            # Atualiza o status
+            remaining = self.filter_model.rowCount()
+            self.status_label.setText(f"{remaining} filmes restantes | {self.deleted_count} deletados nesta sessão")
+            self.enable_delete_button()
+            
+            # Mostra confirmação
+            if len(removed) == 1:
+                message = f'O filme "{removed[0].get("title", "Sem título")}" (ID: {removed[0].get("id")}) foi removido do catálogo.'
             else:
-                QMessageBox.warning(
-                    self, 
-                    "Erro ao Deletar", 
-                    f'Não foi possível deletar o filme "{title}" (ID: {movie_id}).'
-                )
+                message = f"{len(removed)} filmes foram removidos do catálogo."
+            QMessageBox.information(self, "Filmes Deletados", message)
+        else:
+            QMessageBox.warning(
+                self, 
+                "Erro ao Deletar", 
+                "Não foi possível deletar os filmes selecionados."
+            )
     
     def show_delete_all_confirmation(self):
         """Mostra o diálogo de confirmação para deletar todos os filmes."""
@@ -494,13 +583,13 @@ class DeleteMovieDialog(QDialog):
         if total_movies == 0:
             return
         
-        # Tenta deletar todos os filmes usando o método do MovieManager
-        success = self.movie_manager.delete_all_movies()
+        # Remove todos os filmes com uma única gravação do catálogo
+        success = self.movie_manager.delete_all()
         
         if success:
             # Atualiza contadores e limpa a lista
             self.deleted_count += total_movies
-            self.movies_list.clear()
+            self.movies_model.set_movies([])
             
             # Emite sinal para atualização da interface principal
             self.all_movies_deleted.emit()
@@ -0,0 +1,170 @@
+import os
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                            QTreeWidget, QTreeWidgetItem, QProgressBar, QHeaderView)
+from PyQt5.QtCore import pyqtSignal
+from core.duplicate_finder import DuplicateFinder, library_roots
+from core.job_control import JobControl
+from core.preferences import get_preference
+from ui.task_runner import Task, BACKGROUND, get_task_runner
+
+STAGE_LABELS = {
+    "partial": "Comparando início e fim dos arquivos",
+    "full": "Comparando arquivos inteiros",
+}
+
+
+def format_size(size):
+    """Formata bytes como "1.4 GB" ou "700.0 MB"."""
+    if size >= 1024 ** 3:
+        return f"{size / 1024 ** 3:.1f} GB"
+    return f"{size / 1024 ** 2:.1f} MB"
+
+
+class DuplicateScanTask(Task):
+    """Tarefa que procura arquivos repetidos nas pastas da biblioteca."""
+    category = BACKGROUND
+    progress_updated = pyqtSignal(str, int, int)
+    scan_completed = pyqtSignal(list)
+
+    def __init__(self, roots, control=None):
+        super().__init__()
+        self.roots = roots
+        self.control = control or JobControl()
+
+    def run(self):
+        finder = DuplicateFinder(self.roots, control=self.control, progress=self.progress_updated.emit)
+        self.progress_updated.emit("list", 0, 0)
+        self.scan_completed.emit(finder.find())
+
+
+class DuplicatesDialog(QDialog):
+    """Mostra os grupos de arquivos de vídeo idênticos e o espaço desperdiçado."""
+
+    def __init__(self, movie_manager, parent=None):
+        super().__init__(parent)
+        self.movie_manager = movie_manager
+        self.scan_task = None
+        self.init_ui()
+        self.start_scan()
+
+    def init_ui(self):
+        self.setWindowTitle("Arquivos Duplicados")
+        self.setMinimumSize(760, 480)
+        self.setStyleSheet("""
+            QDialog {
+                background-color: #141414;
+                color: white;
+            }
+            QLabel {
+                color: white;
+            }
+            QTreeWidget {
+                background-color: #1f1f1f;
+                color: white;
+                border: 1px solid #333;
+                border-radius: 4px;
+            }
+            QHeaderView::section {
+                background-color: #1f1f1f;
+                color: #aaa;
+                border: none;
+                padding: 4px;
+            }
+            QPushButton {
+                background-color: #333;
+                color: white;
+                border: none;
+                border-radius: 4px;
+                padding: 8px 16px;
+            }
+            QPushButton:hover {
+                background-color: #444;
+            }
+        """)
+
+        layout = QVBoxLayout(self)
+
+        self.status_label = QLabel("Procurando arquivos de vídeo...")
+        layout.addWidget(self.status_label)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)
+        layout.addWidget(self.progress_bar)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Arquivo", "Tamanho", "Filme"])
+        self.tree.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.tree.header().setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        self.tree.header().setSectionResizeMode(2, QHeaderView.ResizeToContents)
+        layout.addWidget(self.tree)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        self.rescan_button = QPushButton("Procurar Novamente")
+        self.rescan_button.clicked.connect(self.start_scan)
+        buttons.addWidget(self.rescan_button)
+        close_button = QPushButton("Fechar")
+        close_button.clicked.connect(self.reject)
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
+
+    def start_scan(self):
+        """Envia a busca ao executor compartilhado (pastas escaneadas e pastas do catálogo)."""
+        if self.scan_task is not None and self.scan_task.is_active():
+            return
+        roots = library_roots(self.movie_manager.snapshot(), get_preference("library_roots", []))
+        self.tree.clear()
+        self.rescan_button.setEnabled(False)
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.show()
+        self.status_label.setText(f"Procurando arquivos de vídeo em {len(roots)} pastas...")
+
+        self.scan_task = DuplicateScanTask(roots)
+        self.scan_task.progress_updated.connect(self.update_progress)
+        self.scan_task.scan_completed.connect(self.show_duplicates)
+        get_task_runner().submit(self.scan_task)
+
+    def update_progress(self, stage, done, total):
+        if stage not in STAGE_LABELS:
+            return
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
+        self.status_label.setText(f"{STAGE_LABELS[stage]} ({done}/{total})")
+
+    def show_duplicates(self, groups):
+        """Preenche a árvore: um grupo por conteúdo, com as cópias como filhos."""
+        self.progress_bar.hide()
+        self.rescan_button.setEnabled(True)
+        if self.scan_task.control.is_cancelled():
+            return
+        if not groups:
+            self.status_label.setText("Nenhum arquivo duplicado encontrado.")
+            return
+
+        index = self.movie_manager.index()
+        wasted = 0
+        for group in groups:
+            wasted += group["wasted_bytes"]
+            parent = QTreeWidgetItem([
+                f"{len(group['paths'])} cópias · {format_size(group['wasted_bytes'])} desperdiçados",
+                format_size(group["size"]),
+                "",
+            ])
+            for file_path in group["paths"]:
+                movie = index.get(index.by_file_path, file_path)
+                child = QTreeWidgetItem([file_path, "", movie.get("title", "") if movie else ""])
+                child.setToolTip(0, os.path.dirname(file_path))
+                parent.addChild(child)
+            self.tree.addTopLevelItem(parent)
+            parent.setExpanded(True)
+
+        self.status_label.setText(f"{len(groups)} grupos de arquivos duplicados · "
+                                  f"{format_size(wasted)} de espaço desperdiçado")
+
+    def done(self, result):
+        """Cancela a busca em andamento ao fechar o diálogo."""
+        if self.scan_task is not None and self.scan_task.is_active():
+            self.scan_task.control.cancel()
+            self.scan_task.scan_completed.disconnect(self.show_duplicates)
+            self.scan_task.progress_updated.disconnect(self.update_progress)
+        super().done(result)
@@ -0,0 +1,85 @@
+from collections import OrderedDict
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtGui import QPixmap
+from ui.task_runner import Task, THUMBNAIL, get_task_runner
+
+
+class ImageFetchTask(Task):
+    """Baixa uma imagem e devolve os bytes ao ImageLoader."""
+    category = THUMBNAIL
+
+    def __init__(self, loader, key):
+        super().__init__()
+        self.loader = loader
+        self.key = key
+
+    def run(self):
+        try:
+            data = self.loader.fetch(self.key)
+        except Exception as e:
+            print(f"Erro ao baixar imagem {self.key}: {e}")
+            data = None
+        self.loader.fetched.emit(self.key, data)
+
+
+class ImageLoader(QObject):
+    """
+    Carrega imagens pequenas (miniaturas) em segundo plano.
+
+    Os downloads rodam no executor compartilhado, na categoria de miniaturas,
+    que tem poucas execuções simultâneas para não disputar a conexão com a
+    busca em redes lentas. Cada imagem é baixada uma só vez: as já carregadas
+    ficam em um cache em memória (as menos usadas saem primeiro) e pedidos
+    repetidos de uma imagem em andamento são ignorados. O QPixmap é criado na
+    thread da interface, ao receber os bytes.
+    """
+    image_loaded = pyqtSignal(str, QPixmap)
+    fetched = pyqtSignal(str, object)
+
+    def __init__(self, fetch, cache_size=200):
+        """
+        Args:
+            fetch: Função chamada em outra thread como fetch(chave) -> bytes ou None
+            cache_size: Número de imagens mantidas em memória
+        """
+        # Sem pai: as tarefas em andamento mantêm o objeto vivo até emitirem
+        super().__init__()
+        self.fetch = fetch
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.pending = {}
+        self.fetched.connect(self.on_fetched)
+
+    def request(self, key):
+        """
+        Pede uma imagem.
+
+        Returns:
+            QPixmap: A imagem, se já estiver no cache; senão None, e image_loaded
+            é emitido quando o download terminar
+        """
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        if key not in self.pending:
+            self.pending[key] = get_task_runner().submit(ImageFetchTask(self, key))
+        return None
+
+    def cancel_pending(self):
+        """Descarta os downloads que ainda não começaram (ex: nova busca)."""
+        runner = get_task_runner()
+        for key, task in list(self.pending.items()):
+            if runner.cancel(task):
+                del self.pending[key]
+
+    def on_fetched(self, key, data):
+        self.pending.pop(key, None)
+        if not data:
+            return
+        pixmap = QPixmap()
+        if not pixmap.loadFromData(data):
+            return
+        self.cache[key] = pixmap
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        self.image_loaded.emit(key, pixmap)
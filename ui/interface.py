@@ -1,5 +1,6 @@
 import os
 import sys
+import threading
 from utils import resource_path
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                             QScrollArea, QGridLayout, QPushButton, QMessageBox, QAction, 
@@ -7,17 +8,19 @@ from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLa
                             QDesktopWidget, QSizePolicy, QApplication)
 from PyQt5.QtGui import QPixmap, QIcon, QFont, QPalette, QColor, QCursor
 from PyQt5.QtCore import Qt, QSize, QEvent, pyqtSignal, QPoint, QTimer
-import webbrowser
 from core.movie_manager import MovieManager
+from core.catalog_sort import SORT_ORDERS
+from core.preferences import get_preference, set_preference
+from core.asset_gc import collect_in_background
+from core.media_probe import is_4k, has_portuguese_audio
+from core import startup_profiler
 from PyQt5.QtWidgets import (QCheckBox, QLineEdit, QToolButton, QSizePolicy, 
                             QVBoxLayout, QHBoxLayout, QWidget, QFrame, QLabel,
                             QScrollArea, QGroupBox)
 from PyQt5.QtSvg import QSvgWidget
 from ui.movie_card import MovieCard
-from ui.add_movie_dialog import AddMovieDialog
-from ui.delete_movie_dialog import DeleteMovieDialog
-from ui.splash_screen import SplashScreen
 from ui.sidebar import Sidebar
+from ui.catalog_events import get_catalog_events
 import json
 
 def get_version():
@@ -36,17 +39,58 @@ class MainWindow(QMainWindow):
     
     def __init__(self):
         super().__init__()
-        self.movie_manager = MovieManager()
+        # A validação dos arquivos fica para depois do primeiro frame (load_library)
+        self.movie_manager = MovieManager(validate_on_load=False)
+        self.library_loaded = False
         self.resize_timer = QTimer()
         self.resize_timer.setSingleShot(True)
-        self.resize_timer.timeout.connect(self.load_movies)
+        self.resize_timer.timeout.connect(self.render_grid)
+        # Alterações em sequência (ex: importação em lote) geram uma única rearrumação da grade
+        self.render_timer = QTimer()
+        self.render_timer.setSingleShot(True)
+        self.render_timer.timeout.connect(self.render_grid)
+        # Cartões já criados, reaproveitados entre filtros e atualizações (chave do filme -> MovieCard)
+        self.movie_cards = {}
         self.menu_open = False
         self.menu_width = 250
         self.selected_genres = []
         self.search_term = ""
+        # Ordenação escolhida no menu Ordenar Por (None = ordem de inclusão)
+        self.sort_order = get_preference("sort_order")
+        if self.sort_order not in SORT_ORDERS:
+            self.sort_order = None
         self.init_ui()
+        
+        # Alterações do catálogo chegam como eventos e atualizam só o que mudou
+        self.catalog_events = get_catalog_events(self.movie_manager)
+        self.catalog_events.movie_added.connect(self.on_movie_added)
+        self.catalog_events.movie_updated.connect(self.on_movie_updated)
+        self.catalog_events.movie_removed.connect(self.on_movie_removed)
+        self.catalog_events.catalog_reloaded.connect(self.load_movies)
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.library_loaded:
+            # Mostra a janela vazia primeiro e carrega a biblioteca no próximo ciclo
+            startup_profiler.mark("janela principal exibida")
+            QTimer.singleShot(0, self.load_library)
+    
+    def load_library(self):
+        """Valida os arquivos do catálogo e monta a grade pela primeira vez."""
+        if self.library_loaded:
+            return
+        self.library_loaded = True
+        validation_result = self.movie_manager.validate_movie_files()
+        if validation_result["missing_count"] > 0:
+            print(f"Validação de filmes: {validation_result['missing_count']} filmes estão com o arquivo ausente.")
+        startup_profiler.mark("catálogo validado")
+        # Impressões digitais e informações técnicas de filmes importados antes delas (lidas uma vez)
+        threading.Thread(target=self.movie_manager.fill_file_details, name="FileDetails", daemon=True).start()
+        # Imagens sem dono (filmes removidos, pré-visualizações abandonadas) são apagadas aos poucos
+        collect_in_background(self.movie_manager)
         self.load_movies()
-        self.showFullScreen()  # Restaurado para comportamento original
+        startup_profiler.mark("grade de filmes montada")
+        startup_profiler.report()
     
     def init_ui(self):
         self.setWindowTitle("Pipoca+")
@@ -89,6 +133,7 @@ class MainWindow(QMainWindow):
         self.sidebar.setFixedWidth(0)  # Inicialmente fechada
         self.sidebar.searchChanged.connect(self.filter_movies)
         self.sidebar.genreFilterChanged.connect(self.filter_movies)
+        self.sidebar.mediaFilterChanged.connect(self.filter_movies)
         
         file_menu = menubar.addMenu("Arquivo")
         add_action = QAction("Adicionar Filme", self)
@@ -97,6 +142,9 @@ class MainWindow(QMainWindow):
         refresh_action = QAction("Atualizar Biblioteca", self)
         refresh_action.triggered.connect(self.load_movies)
         file_menu.addAction(refresh_action)
+        duplicates_action = QAction("Arquivos Duplicados", self)
+        duplicates_action.triggered.connect(self.show_duplicates)
+        file_menu.addAction(duplicates_action)
         file_menu.addSeparator()
         toggle_fullscreen_action = QAction("Alternar Tela Cheia", self)
         toggle_fullscreen_action.setShortcut("F11")
@@ -246,26 +294,74 @@ class MainWindow(QMainWindow):
         """)
     
     def delete_movie(self):
+        from ui.delete_movie_dialog import DeleteMovieDialog
         dialog = DeleteMovieDialog(self.movie_manager, self)
-        dialog.movie_deleted.connect(self.load_movies)
         dialog.exec_()
     
+    @staticmethod
+    def card_key(movie):
+        # Ids locais são únicos (MovieManager.repair_ids), então bastam como chave
+        return movie.get('id')
+    
+    def on_movie_added(self, movie):
+        self.sidebar.add_movie(movie)
+        self.schedule_render()
+    
+    def on_movie_updated(self, movie):
+        # O cartão antigo mostra dados desatualizados; render_grid cria outro
+        card = self.movie_cards.pop(self.card_key(movie), None)
+        if card:
+            card.deleteLater()
+        self.sidebar.update_movie(movie)
+        self.schedule_render()
+    
+    def on_movie_removed(self, movie):
+        card = self.movie_cards.pop(self.card_key(movie), None)
+        if card:
+            card.deleteLater()
+        self.sidebar.remove_movie(movie)
+        self.schedule_render()
+    
+    def schedule_render(self):
+        self.render_timer.start(50)
+    
     def load_movies(self):
+        """Recarrega a barra lateral e a grade a partir do catálogo inteiro."""
+        if not self.library_loaded:
+            return
+        movies = self.movie_manager.get_all_movies()
+        self.sidebar.populate_genres(movies)
+        
+        # Descarta cartões de filmes que saíram do catálogo
+        current_keys = {self.card_key(movie) for movie in movies}
+        for key in list(self.movie_cards):
+            if key not in current_keys:
+                self.movie_cards.pop(key).deleteLater()
+        self.render_grid()
+    
+    def render_grid(self):
+        """Posiciona na grade os cartões dos filmes que passam pelos filtros."""
+        if not self.library_loaded:
+            return
+        self.render_timer.stop()
+        cards = set(self.movie_cards.values())
         while self.grid_layout.count():
             item = self.grid_layout.takeAt(0)
             widget = item.widget()
-            if widget:
+            if widget in cards:
+                widget.hide()
+            elif widget:
                 widget.deleteLater()
         self.grid_layout.setSpacing(0)
         self.grid_layout.setHorizontalSpacing(0)
         self.grid_layout.setVerticalSpacing(10)
         self.grid_layout.setContentsMargins(0, 0, 0, 0)
-        movies = self.movie_manager.get_all_movies()
-        self.sidebar.populate_genres(movies)
+        movies = self.movie_manager.get_sorted_movies(self.sort_order)
         filtered_movies = self.apply_filters(movies)
         if not filtered_movies:
             empty_message = "Sua biblioteca está vazia. Adicione filmes usando o botão acima."
-            if movies and (self.search_term or self.selected_genres):
+            if movies and (self.sidebar.get_search_term() or self.sidebar.get_selected_genres()
+                           or any(self.sidebar.get_media_filters().values())):
                 empty_message = "Nenhum filme encontrado com os critérios selecionados."
             empty_label = QLabel(empty_message)
             empty_label.setAlignment(Qt.AlignCenter)
@@ -281,13 +377,19 @@ class MainWindow(QMainWindow):
         row, col = 0, 0
         unique_movies = {}
         for movie in filtered_movies:
-            movie_key = f"{movie.get('id', '')}-{movie.get('file_path', '')}"
+            movie_key = self.card_key(movie)
             if movie_key in unique_movies:
                 continue
             unique_movies[movie_key] = True
-            movie_card = MovieCard(movie)
-            movie_card.setFixedSize(card_width, movie_card.sizeHint().height())
+            movie_card = self.movie_cards.get(movie_key)
+            if movie_card is None or movie_card.movie is not movie:
+                if movie_card is not None:
+                    movie_card.deleteLater()
+                movie_card = MovieCard(movie)
+                movie_card.setFixedSize(card_width, movie_card.sizeHint().height())
+                self.movie_cards[movie_key] = movie_card
             self.grid_layout.addWidget(movie_card, row, col)
+            movie_card.show()
             col += 1
             if col >= cols_with_margin:
                 col = 0
@@ -316,7 +418,7 @@ class MainWindow(QMainWindow):
         self.grid_layout.setHorizontalSpacing(0)
         self.grid_layout.setVerticalSpacing(2)
         self.grid_layout.setContentsMargins(0, 0, 0, 0)
-        self.load_movies()
+        self.render_grid()
         self.content_container.update()
         QApplication.processEvents()
 
@@ -325,7 +427,7 @@ class MainWindow(QMainWindow):
         self.grid_layout.setHorizontalSpacing(0)
         self.grid_layout.setVerticalSpacing(2)
         self.grid_layout.setContentsMargins(0, 0, 0, 0)
-        self.load_movies()
+        self.render_grid()
         self.content_container.update()
         QApplication.processEvents()
         if should_keep_menu_open and not self.menu_open:
@@ -337,8 +439,13 @@ class MainWindow(QMainWindow):
         filtered_movies = []
         search_term = self.sidebar.get_search_term()
         selected_genres = self.sidebar.get_selected_genres()
+        media_filters = self.sidebar.get_media_filters()
         
         for movie in movies:
+            # Filmes sem arquivo ficam fora da grade até serem reencontrados
+            if self.movie_manager.is_missing(movie):
+                continue
+            
             match_search = True
             if search_term:
                 title = movie.get("title", "").lower()
@@ -353,35 +460,35 @@ class MainWindow(QMainWindow):
                 movie_genres = movie.get("genres", [])
                 match_genre = any(genre in movie_genres for genre in selected_genres)
             
+            # Filtros de arquivo usam o media_info gravado no catálogo
+            media_info = movie.get("media_info")
+            if media_filters["only_4k"] and not is_4k(media_info):
+                continue
+            if media_filters["portuguese_audio"] and not has_portuguese_audio(media_info):
+                continue
+            
             if match_search and match_genre:
                 filtered_movies.append(movie)
         
         return filtered_movies
     
+    def show_duplicates(self):
+        from ui.duplicates_dialog import DuplicatesDialog
+        dialog = DuplicatesDialog(self.movie_manager, self)
+        dialog.exec_()
+    
     def add_movie(self):
+        from ui.add_movie_dialog import AddMovieDialog
         dialog = AddMovieDialog(self.movie_manager, self)
-        if dialog.exec_():
-            self.load_movies()
+        dialog.exec_()
     
     def sort_movies(self, sort_key):
-        movies = self.movie_manager.get_all_movies()
-        if sort_key == "title":
-            sorted_movies = sorted(movies, key=lambda x: x.get("title", "").lower())
-        elif sort_key == "date_added":
-            sorted_movies = sorted(movies, key=lambda x: x.get("date_added", ""), reverse=True)
-        elif sort_key == "vote_average":
-            sorted_movies = sorted(
-                movies, 
-                key=lambda x: float(x.get("vote_average", 0)) if x.get("vote_average") not in (None, "") else 0, 
-                reverse=True
-            )
-        elif sort_key == "release_date":
-            sorted_movies = sorted(movies, key=lambda x: x.get("release_date", ""), reverse=True)
-        else:
+        # Só troca o índice usado pela grade; o catálogo não é reordenado nem gravado
+        if sort_key not in SORT_ORDERS:
             return
-        self.movie_manager.catalog["movies"] = sorted_movies
-        self.movie_manager.save_catalog()
-        self.load_movies()
+        self.sort_order = sort_key
+        set_preference("sort_order", sort_key)
+        self.render_grid()
     
     def toggle_fullscreen(self):
         if self.isFullScreen():
@@ -410,5 +517,5 @@ class MainWindow(QMainWindow):
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = MainWindow()
-    window.show()
+    window.showFullScreen()
     sys.exit(app.exec_())
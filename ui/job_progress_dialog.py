@@ -0,0 +1,91 @@
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QProgressBar
+from PyQt5.QtCore import Qt
+from core.job_control import ProgressMeter, format_duration
+
+
+class JobProgressDialog(QDialog):
+    """Diálogo de progresso com pausa, retomada e cancelamento de uma tarefa longa."""
+
+    def __init__(self, title, label, control, unit="itens", parent=None):
+        """
+        Args:
+            title: Título da janela
+            label: Texto mostrado acima da barra
+            control: JobControl compartilhado com a thread de trabalho
+            unit: Nome dos itens processados, usado na vazão (ex: "filmes")
+        """
+        super().__init__(parent)
+        self.control = control
+        self.unit = unit
+        self.meter = ProgressMeter()
+        self.base_label = label
+
+        self.setWindowTitle(title)
+        self.setWindowModality(Qt.WindowModal)
+        self.setMinimumWidth(420)
+
+        layout = QVBoxLayout(self)
+
+        self.label = QLabel(label)
+        layout.addWidget(self.label)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)
+        layout.addWidget(self.progress_bar)
+
+        self.stats_label = QLabel("")
+        self.stats_label.setStyleSheet("color: gray;")
+        layout.addWidget(self.stats_label)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        self.pause_button = QPushButton("Pausar")
+        self.pause_button.clicked.connect(self.toggle_pause)
+        buttons.addWidget(self.pause_button)
+        self.cancel_button = QPushButton("Cancelar")
+        self.cancel_button.clicked.connect(self.cancel)
+        buttons.addWidget(self.cancel_button)
+        layout.addLayout(buttons)
+
+    def set_progress(self, current, total):
+        """Atualiza a barra, a vazão e o tempo restante."""
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(current)
+        self.label.setText(f"{self.base_label} ({current}/{total})")
+
+        rate, remaining = self.meter.update(current, total)
+        if rate:
+            per_minute = rate * 60
+            text = f"{per_minute:.1f} {self.unit}/min"
+            if remaining is not None:
+                text += f" · restante: {format_duration(remaining)}"
+            self.stats_label.setText(text)
+
+    def toggle_pause(self):
+        """Pausa ou retoma a tarefa. O item em andamento termina antes da pausa."""
+        if self.control.is_paused():
+            self.control.resume()
+            self.meter.resume()
+            self.pause_button.setText("Pausar")
+            self.stats_label.setText("")
+        else:
+            self.control.pause()
+            self.meter.pause()
+            self.pause_button.setText("Retomar")
+            self.stats_label.setText("Pausado")
+
+    def cancel(self):
+        """Pede o cancelamento; a janela fecha quando a thread terminar o item atual."""
+        self.control.cancel()
+        self.pause_button.setEnabled(False)
+        self.cancel_button.setEnabled(False)
+        self.stats_label.setText("Cancelando...")
+
+    def finish(self):
+        """Fecha o diálogo ao fim da tarefa (concluída ou cancelada)."""
+        self.done(QDialog.Accepted)
+
+    def reject(self):
+        # Esc ou fechar a janela equivalem a cancelar; quem fecha é finish()
+        if not self.control.is_cancelled():
+            self.cancel()
@@ -4,11 +4,6 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                            QPushButton, QMessageBox, QFrame)
 from PyQt5.QtGui import QPixmap, QCursor, QPainter, QPainterPath, QBrush
 from PyQt5.QtCore import Qt
-from ui.movie_info_page import MovieInfoPage
-from core.movie_manager import MovieManager
-
-movie_manager = MovieManager()
-movies = movie_manager.get_all_movies()
 
 class RoundedLabel(QLabel):
     def __init__(self, parent=None):
@@ -187,10 +182,12 @@ class MovieCard(QWidget):
             
     def show_info(self):
         """Mostra informações detalhadas do filme."""
-        if movies:
-            # Para exibir informações de um filme, passe o caminho base do aplicativo
-            base_path = os.getcwd()  # Obtém o diretório atual do aplicativo
-    
-            # Cria o diálogo com o caminho base
-            info_page = MovieInfoPage(self.movie, parent=None, base_path=base_path)
-            info_page.show()
+        # Importado sob demanda: a página de informações só é usada ao clicar
+        from ui.movie_info_page import MovieInfoPage
+        
+        # Para exibir informações de um filme, passe o caminho base do aplicativo
+        base_path = os.getcwd()  # Obtém o diretório atual do aplicativo
+
+        # Cria o diálogo com o caminho base
+        info_page = MovieInfoPage(self.movie, parent=None, base_path=base_path)
+        info_page.show()
@@ -11,12 +11,20 @@ class Sidebar(QFrame):
     # Sinais para comunicação com a janela principal
     searchChanged = pyqtSignal(str)
     genreFilterChanged = pyqtSignal(list)
+    mediaFilterChanged = pyqtSignal(dict)
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setObjectName("sidebar")
         self.selected_genres = []
         self.search_term = ""
+        # Filtros pelas informações técnicas do arquivo (media_info)
+        self.media_filters = {"only_4k": False, "portuguese_audio": False}
+        # Quantidade de filmes por gênero e o rótulo de cada gênero na lista
+        self.genre_counts = {}
+        self.genre_labels = {}
+        # Gêneros já contados de cada filme (pelo id), para aplicar só a diferença nas alterações
+        self.movie_genres = {}
         self.init_ui()
         
     def init_ui(self):
@@ -76,6 +84,41 @@ class Sidebar(QFrame):
         search_layout.addWidget(self.search_input)
         self.sidebar_layout.addWidget(search_container)
         
+        # Filtros pelo arquivo: lidos do catálogo, sem acessar o disco
+        file_title = QLabel("ARQUIVO")
+        file_title.setStyleSheet("""
+            font-size: 14px;
+            font-weight: bold;
+            color: #E50914;
+            letter-spacing: 1px;
+        """)
+        self.sidebar_layout.addWidget(file_title)
+        for key, text in (("only_4k", "Somente 4K"), ("portuguese_audio", "Áudio em português")):
+            checkbox = QCheckBox(text)
+            checkbox.setStyleSheet("""
+                QCheckBox {
+                    color: #ddd;
+                    font-size: 13px;
+                    spacing: 8px;
+                }
+                QCheckBox::indicator {
+                    width: 18px;
+                    height: 18px;
+                    border-radius: 3px;
+                    border: 2px solid #555;
+                }
+                QCheckBox::indicator:unchecked {
+                    background-color: #2a2a2a;
+                }
+                QCheckBox::indicator:checked {
+                    background-color: #E50914;
+                    border: 2px solid #E50914;
+                    image: url(ui/icons/check.svg);
+                }
+            """)
+            checkbox.stateChanged.connect(lambda state, k=key: self.handle_media_filter(k, state))
+            self.sidebar_layout.addWidget(checkbox)
+        
         # Título de gêneros
         genres_title = QLabel("GÊNEROS")
         genres_title.setStyleSheet("""
@@ -123,6 +166,11 @@ class Sidebar(QFrame):
         
         self.genreFilterChanged.emit(self.selected_genres)
     
+    def handle_media_filter(self, key, state):
+        """Manipula alterações nos filtros de arquivo (4K, áudio em português)"""
+        self.media_filters[key] = state == Qt.Checked
+        self.mediaFilterChanged.emit(dict(self.media_filters))
+    
     def clear_genre_filters(self):
         """Limpa todos os filtros de gênero selecionados"""
         if not self.selected_genres:
@@ -142,22 +190,79 @@ class Sidebar(QFrame):
     
     def populate_genres(self, movies):
         """Preenche a barra lateral com os gêneros disponíveis"""
+        # Conta os filmes de cada gênero em uma única passada
+        self.genre_counts = {}
+        self.movie_genres = {}
+        for movie in movies:
+            genres = movie.get("genres", [])
+            self.movie_genres[movie.get("id")] = list(genres)
+            for genre in genres:
+                self.genre_counts[genre] = self.genre_counts.get(genre, 0) + 1
+        self.rebuild_genres()
+    
+    def add_movie(self, movie):
+        """Atualiza as contagens para um filme adicionado ao catálogo"""
+        self.movie_genres[movie.get("id")] = list(movie.get("genres", []))
+        self.update_genre_counts(movie.get("genres", []), 1)
+    
+    def update_movie(self, movie):
+        """Atualiza as contagens para um filme alterado (só os gêneros que mudaram)"""
+        old_genres = self.movie_genres.get(movie.get("id"), [])
+        new_genres = list(movie.get("genres", []))
+        self.movie_genres[movie.get("id")] = new_genres
+        removed = [genre for genre in old_genres if genre not in new_genres]
+        added = [genre for genre in new_genres if genre not in old_genres]
+        if removed:
+            self.update_genre_counts(removed, -1)
+        if added:
+            self.update_genre_counts(added, 1)
+    
+    def remove_movie(self, movie):
+        """Atualiza as contagens para um filme removido do catálogo"""
+        genres = self.movie_genres.pop(movie.get("id"), movie.get("genres", []))
+        self.update_genre_counts(genres, -1)
+    
+    def update_genre_counts(self, genres, delta):
+        """
+        Aplica a variação nas contagens dos gêneros.
+        
+        Só reconstrói a lista quando um gênero aparece ou desaparece; caso
+        contrário, apenas o texto dos rótulos afetados muda.
+        """
+        changed_structure = False
+        for genre in genres:
+            count = self.genre_counts.get(genre, 0) + delta
+            if genre not in self.genre_counts or count <= 0:
+                changed_structure = True
+            if count > 0:
+                self.genre_counts[genre] = count
+            else:
+                self.genre_counts.pop(genre, None)
+        
+        if changed_structure:
+            self.rebuild_genres()
+            return
+        for genre in genres:
+            self.genre_labels[genre].setText(self.genre_label_text(genre))
+    
+    def genre_label_text(self, genre):
+        return f"{genre} <span style='color: #888; font-size: 11px;'>({self.genre_counts[genre]})</span>"
+    
+    def rebuild_genres(self):
+        """Recria as caixas de seleção a partir das contagens atuais"""
         # Limpa o layout atual
         while self.genres_layout.count():
             item = self.genres_layout.takeAt(0)
             widget = item.widget()
             if widget:
                 widget.deleteLater()
+        self.genre_labels = {}
         
-        # Coleta todos os gêneros únicos
-        all_genres = set()
-        for movie in movies:
-            genres = movie.get("genres", [])
-            for genre in genres:
-                all_genres.add(genre)
+        # Gêneros que não existem mais deixam de filtrar
+        self.selected_genres = [genre for genre in self.selected_genres if genre in self.genre_counts]
         
         # Se não houver gêneros, mostra uma mensagem
-        if not all_genres:
+        if not self.genre_counts:
             no_genres_container = QFrame()
             no_genres_container.setStyleSheet("""
                 background-color: #1f1f1f;
@@ -189,7 +294,7 @@ class Sidebar(QFrame):
         filter_layout.setContentsMargins(8, 8, 8, 8)
         
         # Adiciona cada gênero com checkbox
-        for genre in sorted(all_genres):
+        for genre in sorted(self.genre_counts):
             genre_widget = QFrame()
             genre_widget.setStyleSheet("""
                 QFrame {
@@ -230,9 +335,8 @@ class Sidebar(QFrame):
             """)
             checkbox.stateChanged.connect(lambda state, g=genre: self.handle_genre_filter(g, state))
             
-            # Conta quantos filmes têm este gênero
-            genre_count = sum(1 for movie in movies if genre in movie.get("genres", []))
-            genre_label = QLabel(f"{genre} <span style='color: #888; font-size: 11px;'>({genre_count})</span>")
+            genre_label = QLabel(self.genre_label_text(genre))
+            self.genre_labels[genre] = genre_label
             genre_label.setStyleSheet("""
                 color: #ddd;
                 font-size: 13px;
@@ -278,4 +382,8 @@ class Sidebar(QFrame):
     
     def get_selected_genres(self):
         """Retorna a lista de gêneros selecionados"""
-        return self.selected_genres
\ No newline at end of file
+        return self.selected_genres
+    
+    def get_media_filters(self):
+        """Retorna os filtros de arquivo ativos"""
+        return self.media_filters
\ No newline at end of file
@@ -0,0 +1,166 @@
+import heapq
+import itertools
+import threading
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+# Executor compartilhado pelas tarefas de segundo plano da interface (busca,
+# detalhes, miniaturas, varredura de pastas e importação em lote). Cada tarefa
+# pertence a uma categoria com limite próprio de execuções simultâneas; dentro
+# da categoria, as de maior prioridade saem primeiro da fila. Enquanto houver
+# uma tarefa interativa em andamento, as importações param no próximo
+# checkpoint (ver JobControl), para que a busca do usuário não dispute a rede
+# com elas.
+
+INTERACTIVE = "interactive"
+THUMBNAIL = "thumbnail"
+BACKGROUND = "background"
+
+# Execuções simultâneas por categoria
+CATEGORY_LIMITS = {
+    INTERACTIVE: 3,
+    THUMBNAIL: 4,
+    BACKGROUND: 1,
+}
+
+# Ordem de despacho entre categorias (maior primeiro)
+CATEGORY_PRIORITIES = {
+    INTERACTIVE: 2,
+    THUMBNAIL: 1,
+    BACKGROUND: 0,
+}
+
+
+class Task(QObject):
+    """
+    Trabalho executado pelo TaskRunner em uma thread do pool.
+
+    Subclasses implementam run() e declaram seus próprios sinais; como o
+    objeto vive na thread da interface, os sinais emitidos em run() chegam aos
+    widgets pela fila de eventos. finished é emitido depois de run(), mesmo
+    se houver erro.
+    """
+    finished = pyqtSignal()
+
+    category = INTERACTIVE
+
+    def __init__(self):
+        super().__init__()
+        self.queued = False
+        self.running = False
+
+    def run(self):
+        raise NotImplementedError
+
+    def is_active(self):
+        """Indica se a tarefa está na fila ou em execução."""
+        return self.queued or self.running
+
+
+class _TaskRunnable(QRunnable):
+    def __init__(self, runner, task):
+        super().__init__()
+        self.runner = runner
+        self.task = task
+
+    def run(self):
+        try:
+            self.task.run()
+        except Exception as e:
+            print(f"Erro na tarefa {type(self.task).__name__}: {e}")
+        finally:
+            self.runner.task_done(self.task)
+
+
+class TaskRunner(QObject):
+    """Fila de tarefas com limites por categoria, sobre um QThreadPool."""
+
+    def __init__(self, limits=None):
+        super().__init__()
+        self.limits = dict(limits or CATEGORY_LIMITS)
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(sum(self.limits.values()))
+        self.lock = threading.Lock()
+        self.queues = {category: [] for category in self.limits}
+        self.running = {category: 0 for category in self.limits}
+        # Referências às tarefas na fila ou em execução; nenhuma é destruída antes de terminar
+        self.active = set()
+        self._sequence = itertools.count()
+        # Liberado quando não há tarefa interativa; as importações esperam por ele
+        self.interactive_idle = threading.Event()
+        self.interactive_idle.set()
+
+    def submit(self, task, priority=0):
+        """
+        Coloca uma tarefa na fila da sua categoria.
+
+        Args:
+            task: Instância de Task
+            priority: Prioridade dentro da categoria (maior sai primeiro)
+        """
+        # Conectado depois dos sinais de quem enviou a tarefa: a referência é a última a sair
+        task.finished.connect(self.forget_task)
+        with self.lock:
+            task.queued = True
+            self.active.add(task)
+            # A sequência desempata e mantém a ordem de chegada
+            heapq.heappush(self.queues[task.category], (-priority, next(self._sequence), task))
+            if task.category == INTERACTIVE:
+                self.interactive_idle.clear()
+            self._dispatch()
+        return task
+
+    def cancel(self, task):
+        """Retira da fila uma tarefa que ainda não começou. Retorna False se ela já estava em execução."""
+        with self.lock:
+            queue = self.queues[task.category]
+            for position, entry in enumerate(queue):
+                if entry[2] is task:
+                    queue.pop(position)
+                    heapq.heapify(queue)
+                    task.queued = False
+                    self.active.discard(task)
+                    self._update_interactive_idle()
+                    return True
+        return False
+
+    def _dispatch(self):
+        """Inicia as tarefas que cabem nos limites (chamar com o lock)."""
+        for category in sorted(self.queues, key=lambda name: CATEGORY_PRIORITIES.get(name, 0), reverse=True):
+            queue = self.queues[category]
+            while queue and self.running[category] < self.limits[category]:
+                task = heapq.heappop(queue)[2]
+                task.queued = False
+                task.running = True
+                self.running[category] += 1
+                self.pool.start(_TaskRunnable(self, task), CATEGORY_PRIORITIES.get(category, 0))
+
+    def _update_interactive_idle(self):
+        if self.running.get(INTERACTIVE) or self.queues.get(INTERACTIVE):
+            self.interactive_idle.clear()
+        else:
+            self.interactive_idle.set()
+
+    def task_done(self, task):
+        """Chamado na thread do pool quando uma tarefa termina."""
+        with self.lock:
+            task.running = False
+            self.running[task.category] -= 1
+            self._update_interactive_idle()
+            self._dispatch()
+        task.finished.emit()
+
+    @pyqtSlot()
+    def forget_task(self):
+        """Solta a referência à tarefa terminada (na thread da interface)."""
+        self.active.discard(self.sender())
+
+
+_runner = None
+
+
+def get_task_runner():
+    """Retorna o executor único do aplicativo (criado na thread da interface)."""
+    global _runner
+    if _runner is None:
+        _runner = TaskRunner()
+    return _runner
@@ -3,13 +3,144 @@ import json
 import shutil
 import zipfile
 import fnmatch
+import hashlib
 import requests
 import subprocess
 import sys
+import time
 from packaging import version
+from update.version_switch import (VERSIONS_DIR_NAME, JOURNAL_NAME, STATE_NAME, read_json,
+                                   write_json_atomic, swap_version_files)
+
+# Nome do manifesto incluído na raiz do zip de cada release
+MANIFEST_NAME = "manifest.json"
+
+# Intervalo mínimo entre consultas à API de releases (segundos)
+DEFAULT_CHECK_INTERVAL = 6 * 60 * 60
+
+
+def file_sha256(file_path, chunk_size=1024 * 1024):
+    """Calcula o hash SHA-256 de um arquivo lendo em blocos."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_crc32(file_path, chunk_size=1024 * 1024):
+    """Calcula o CRC-32 de um arquivo (mesmo valor armazenado no zip)."""
+    crc = 0
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            crc = zipfile.crc32(chunk, crc)
+    return crc & 0xFFFFFFFF
+
+
+def build_manifest(directory, new_version, ignore_patterns=None):
+    """
+    Gera o manifesto de uma distribuição (usado ao empacotar um release).
+    
+    :param directory: Diretório com os arquivos da distribuição
+    :param new_version: Versão da distribuição (ex: "1.0.2")
+    :param ignore_patterns: Padrões de arquivos que não entram no manifesto
+    :return: Dicionário com a versão e o hash/tamanho de cada arquivo
+    """
+    files = {}
+    for root, dirs, filenames in os.walk(directory):
+        for filename in filenames:
+            full_path = os.path.join(root, filename)
+            rel_path = os.path.relpath(full_path, directory).replace('\\', '/')
+            if rel_path == MANIFEST_NAME:
+                continue
+            if any(fnmatch.fnmatch(rel_path, pattern) for pattern in (ignore_patterns or [])):
+                continue
+            files[rel_path] = {
+                "sha256": file_sha256(full_path),
+                "size": os.path.getsize(full_path)
+            }
+    return {"version": new_version, "files": files}
+
+
+class RemoteZipFile:
+    """
+    Arquivo somente leitura sobre HTTP Range.
+    
+    Permite que o zipfile leia o diretório central e apenas as entradas
+    alteradas de um zip remoto, sem baixar o pacote inteiro.
+    """
+    
+    def __init__(self, url, timeout=30, block_size=64 * 1024):
+        self.session = requests.Session()
+        self.timeout = timeout
+        self.block_size = block_size
+        
+        response = self.session.head(url, allow_redirects=True, timeout=timeout)
+        response.raise_for_status()
+        if response.headers.get("Accept-Ranges", "").lower() != "bytes":
+            raise IOError("O servidor não suporta download parcial")
+        
+        # Usa a URL final (após redirecionamentos) para as requisições parciais
+        self.url = response.url
+        self.size = int(response.headers["Content-Length"])
+        self.position = 0
+        self.bytes_downloaded = 0
+        self._buffer = b""
+        self._buffer_start = 0
+    
+    def seekable(self):
+        return True
+    
+    def readable(self):
+        return True
+    
+    def tell(self):
+        return self.position
+    
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_SET:
+            self.position = offset
+        elif whence == os.SEEK_CUR:
+            self.position += offset
+        elif whence == os.SEEK_END:
+            self.position = self.size + offset
+        return self.position
+    
+    def read(self, size=-1):
+        if size is None or size < 0 or self.position + size > self.size:
+            size = self.size - self.position
+        if size <= 0:
+            return b""
+        
+        # Serve a leitura do buffer se o intervalo já foi baixado
+        offset = self.position - self._buffer_start
+        if not (0 <= offset and offset + size <= len(self._buffer)):
+            self._fetch(self.position, max(size, self.block_size))
+            offset = 0
+        
+        data = self._buffer[offset:offset + size]
+        self.position += len(data)
+        return data
+    
+    def _fetch(self, start, length):
+        """Baixa um bloco do arquivo remoto para o buffer de leitura."""
+        end = min(start + length, self.size) - 1
+        response = self.session.get(
+            self.url, headers={"Range": f"bytes={start}-{end}"}, timeout=self.timeout
+        )
+        if response.status_code != 206:
+            raise IOError(f"Resposta inesperada ao baixar intervalo: {response.status_code}")
+        self._buffer = response.content
+        self._buffer_start = start
+        self.bytes_downloaded += len(self._buffer)
+    
+    def close(self):
+        self.session.close()
+
 
 class AutoUpdater:
-    def __init__(self, repo_owner, repo_name, current_version, app_directory=None, ignore_patterns=None):
+    def __init__(self, repo_owner, repo_name, current_version, app_directory=None, ignore_patterns=None,
+                 delta_updates=True, timeout=10, check_interval=DEFAULT_CHECK_INTERVAL, cache_path=None):
         """
         Inicializa o atualizador automático.
         
@@ -18,6 +149,10 @@ class AutoUpdater:
         :param current_version: Versão atual do software (ex: "1.0.0")
         :param app_directory: Diretório da aplicação (padrão: diretório atual)
         :param ignore_patterns: Lista de padrões de arquivos/pastas a serem ignorados durante a atualização
+        :param delta_updates: Se True, instala apenas os arquivos que mudaram em relação à versão instalada
+        :param timeout: Tempo máximo (segundos) de cada requisição à API
+        :param check_interval: Intervalo mínimo (segundos) entre consultas à API de releases
+        :param cache_path: Arquivo de cache da última consulta (padrão: data/update_cache.json)
         """
         self.repo_owner = repo_owner
         self.repo_name = repo_name
@@ -25,29 +160,84 @@ class AutoUpdater:
         self.app_directory = app_directory or os.getcwd()
         self.api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/latest"
         self.update_dir = os.path.join(self.app_directory, "update_temp")
+        self.versions_dir = os.path.join(self.app_directory, VERSIONS_DIR_NAME)
+        self.journal_path = os.path.join(self.versions_dir, JOURNAL_NAME)
+        self.state_path = os.path.join(self.versions_dir, STATE_NAME)
         self.ignore_patterns = ignore_patterns or []
+        self.delta_updates = delta_updates
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self.cache_path = cache_path or os.path.join(self.app_directory, "data", "update_cache.json")
+        self.latest_release = None
         
-    def check_for_updates(self):
-        """Verifica se há atualizações disponíveis."""
+    def check_for_updates(self, force=False):
+        """
+        Verifica se há atualizações disponíveis.
+        
+        A resposta da API fica em cache: dentro do intervalo de verificação o
+        cache é usado sem acessar a rede, e depois dele a consulta é condicional
+        (ETag), de modo que um release inalterado responde 304 sem corpo.
+        
+        :param force: Ignora o intervalo mínimo entre verificações
+        :return: Informações do release mais recente, ou None se não houver atualização
+        """
         try:
-            print("Verificando atualizações...")
-            response = requests.get(self.api_url)
-            response.raise_for_status()
-            
-            latest_release = response.json()
+            latest_release = self.fetch_latest_release(force)
+            if not latest_release:
+                return None
             latest_version = latest_release['tag_name'].lstrip('v')
             
             if version.parse(latest_version) > version.parse(self.current_version):
+                self.latest_release = latest_release
                 print(f"Nova versão disponível: {latest_version} (você tem: {self.current_version})")
                 return latest_release
             else:
                 print(f"Você já está usando a versão mais recente ({self.current_version}).")
                 return None
                 
-        except requests.RequestException as e:
+        except (requests.RequestException, KeyError, ValueError) as e:
             print(f"Erro ao verificar atualizações: {e}")
             return None
     
+    def fetch_latest_release(self, force=False):
+        """Obtém o release mais recente da API ou do cache local."""
+        cache = read_json(self.cache_path) or {}
+        cached_release = cache.get("release")
+        
+        if cached_release and not force and time.time() - cache.get("last_check", 0) < self.check_interval:
+            print("Verificação de atualizações recente, usando cache.")
+            return cached_release
+        
+        print("Verificando atualizações...")
+        headers = {}
+        if cached_release and cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+        
+        response = requests.get(self.api_url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and cached_release:
+            release = cached_release
+        else:
+            response.raise_for_status()
+            data = response.json()
+            # Guarda apenas o necessário para instalar a atualização
+            release = {
+                "tag_name": data["tag_name"],
+                "assets": [
+                    {"name": asset["name"], "browser_download_url": asset["browser_download_url"]}
+                    for asset in data.get("assets", [])
+                ]
+            }
+            cache["etag"] = response.headers.get("ETag")
+        
+        cache["release"] = release
+        cache["last_check"] = time.time()
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            write_json_atomic(self.cache_path, cache)
+        except OSError as e:
+            print(f"Erro ao salvar cache de atualizações: {e}")
+        return release
+    
     def download_update(self, release):
         """
         Baixa o arquivo da atualização.
@@ -56,12 +246,8 @@ class AutoUpdater:
         :return: Caminho do arquivo baixado ou None em caso de falha
         """
         try:
-            # Procura pelo asset .zip no release
-            zip_asset = None
-            for asset in release['assets']:
-                if asset['name'].endswith('.zip'):
-                    zip_asset = asset
-                    break
+            self.latest_release = release
+            zip_asset = self.find_zip_asset(release)
             
             if not zip_asset:
                 print("Nenhum arquivo .zip encontrado no release.")
@@ -76,7 +262,7 @@ class AutoUpdater:
             zip_path = os.path.join(self.update_dir, zip_asset['name'])
             
             print(f"Baixando atualização de {download_url}...")
-            response = requests.get(download_url, stream=True)
+            response = requests.get(download_url, stream=True, timeout=self.timeout)
             response.raise_for_status()
             
             with open(zip_path, 'wb') as f:
@@ -90,6 +276,96 @@ class AutoUpdater:
             print(f"Erro ao baixar atualização: {e}")
             return None
     
+    def find_zip_asset(self, release):
+        """Procura pelo asset .zip no release."""
+        for asset in release.get('assets', []):
+            if asset['name'].endswith('.zip'):
+                return asset
+        return None
+    
+    def open_update_source(self, release):
+        """
+        Abre o pacote da atualização para instalação.
+        
+        Tenta ler o zip remoto por HTTP Range, de forma que apenas as entradas
+        alteradas sejam baixadas. Se o servidor não permitir, baixa o zip completo.
+        
+        :param release: Informações do release mais recente
+        :return: Objeto RemoteZipFile, caminho do zip baixado ou None em caso de falha
+        """
+        self.latest_release = release
+        zip_asset = self.find_zip_asset(release)
+        if not zip_asset:
+            print("Nenhum arquivo .zip encontrado no release.")
+            return None
+        
+        if self.delta_updates:
+            try:
+                return RemoteZipFile(zip_asset['browser_download_url'], timeout=self.timeout)
+            except (requests.RequestException, IOError, KeyError, ValueError) as e:
+                print(f"Download parcial indisponível ({e}). Baixando pacote completo...")
+        
+        return self.download_update(release)
+    
+    def load_manifest(self, zip_ref):
+        """Lê o manifesto do release, se o zip tiver um."""
+        if MANIFEST_NAME not in zip_ref.namelist():
+            return None
+        try:
+            return json.loads(zip_ref.read(MANIFEST_NAME).decode('utf-8'))
+        except (ValueError, UnicodeDecodeError) as e:
+            print(f"Manifesto inválido, ignorando: {e}")
+            return None
+    
+    def is_file_unchanged(self, info, manifest_entry):
+        """
+        Verifica se o arquivo instalado é idêntico à entrada do zip.
+        
+        Compara primeiro o tamanho (barato) e só calcula o hash quando o tamanho
+        coincide. Usa o SHA-256 do manifesto ou, sem manifesto, o CRC-32 do zip.
+        """
+        local_path = os.path.join(self.app_directory, info.filename)
+        if not os.path.isfile(local_path):
+            return False
+        
+        local_size = os.path.getsize(local_path)
+        if manifest_entry:
+            return (local_size == manifest_entry.get("size") and
+                    file_sha256(local_path) == manifest_entry.get("sha256"))
+        return local_size == info.file_size and file_crc32(local_path) == info.CRC
+    
+    def compute_delta(self, zip_ref, manifest=None):
+        """
+        Lista as entradas do zip que precisam ser instaladas.
+        
+        :param zip_ref: ZipFile aberto do release
+        :param manifest: Manifesto do release (opcional)
+        :return: Lista de ZipInfo com os arquivos novos ou alterados
+        """
+        manifest_files = (manifest or {}).get("files", {})
+        changed = []
+        for info in zip_ref.infolist():
+            if info.is_dir() or info.filename == MANIFEST_NAME:
+                continue
+            # Recusa caminhos absolutos ou que saiam do diretório da aplicação
+            if os.path.isabs(info.filename) or '..' in info.filename.replace('\\', '/').split('/'):
+                print(f"Entrada inválida no pacote, ignorando: {info.filename}")
+                continue
+            if self.should_ignore_file(info.filename):
+                continue
+            if self.delta_updates and self.is_file_unchanged(info, manifest_files.get(info.filename)):
+                continue
+            changed.append(info)
+        return changed
+    
+    def get_new_version(self, manifest=None):
+        """Obtém a versão sendo instalada a partir do manifesto ou do release."""
+        if manifest and manifest.get("version"):
+            return manifest["version"].lstrip('v')
+        if self.latest_release:
+            return self.latest_release['tag_name'].lstrip('v')
+        return self.current_version
+    
     def should_ignore_file(self, file_path):
         """
         Verifica se um arquivo deve ser ignorado durante a atualização.
@@ -113,102 +389,42 @@ class AutoUpdater:
         """
         Instala a atualização baixada, preservando arquivos específicos.
         
-        :param zip_path: Caminho do arquivo .zip baixado
+        Os arquivos novos são extraídos primeiro para versions/<nova versão> e só
+        então ativados (ver activate_version). Uma falha durante a extração não
+        altera nada na instalação atual.
+        
+        :param zip_path: Caminho do arquivo .zip baixado ou objeto retornado por open_update_source
         :return: True se a atualização foi instalada com sucesso, False caso contrário
         """
         try:
-            extract_dir = os.path.join(self.update_dir, "extracted")
-            
-            # Limpa o diretório de extração se já existir
-            if os.path.exists(extract_dir):
-                shutil.rmtree(extract_dir)
-            
-            os.makedirs(extract_dir)
-            
-            # Extrai o arquivo zip
-            print(f"Extraindo arquivo {zip_path}...")
             with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(extract_dir)
-            
-            # Cria um backup de segurança
-            backup_dir = os.path.join(self.app_directory, "backup_before_update")
-            if os.path.exists(backup_dir):
-                shutil.rmtree(backup_dir)
-            os.makedirs(backup_dir)
-            
-            # Faz backup dos arquivos importantes antes da atualização
-            for root, dirs, files in os.walk(self.app_directory):
-                # Pula os diretórios temporários e de backup
-                if "update_temp" in root or "backup_before_update" in root:
-                    continue
-                
-                # Caminho relativo dentro do diretório da aplicação
-                rel_path = os.path.relpath(root, self.app_directory)
-                if rel_path == ".":
-                    rel_path = ""
+                manifest = self.load_manifest(zip_ref)
+                new_version = self.get_new_version(manifest)
+                changed = self.compute_delta(zip_ref, manifest)
                 
-                # Cria a estrutura de diretórios no backup
-                if rel_path:
-                    os.makedirs(os.path.join(backup_dir, rel_path), exist_ok=True)
+                # Limpa o diretório da nova versão se já existir
+                stage_dir = self.get_version_dir(new_version)
+                if os.path.exists(stage_dir):
+                    shutil.rmtree(stage_dir)
+                os.makedirs(stage_dir)
                 
-                # Copia os arquivos importantes para o backup
-                for file in files:
-                    src_file = os.path.join(root, file)
-                    rel_file_path = os.path.join(rel_path, file) if rel_path else file
-                    
-                    # Se for um arquivo que deve ser preservado, faz backup
-                    if self.should_ignore_file(rel_file_path):
-                        dst_file = os.path.join(backup_dir, rel_file_path)
-                        shutil.copy2(src_file, dst_file)
+                # Extrai apenas os arquivos novos ou alterados
+                print(f"Extraindo {len(changed)} de {len(zip_ref.infolist())} arquivos do pacote...")
+                for info in changed:
+                    zip_ref.extract(info, stage_dir)
             
-            print("Instalando atualização...")
-            
-            # Atualiza os arquivos da aplicação
-            for root, dirs, files in os.walk(extract_dir):
-                # Caminho relativo dentro do diretório extraído
-                rel_path = os.path.relpath(root, extract_dir)
-                if rel_path == ".":
-                    rel_path = ""
-                
-                # Diretório de destino na aplicação
-                dst_dir = os.path.join(self.app_directory, rel_path) if rel_path else self.app_directory
-                os.makedirs(dst_dir, exist_ok=True)
-                
-                # Copia os arquivos da atualização para a aplicação
-                for file in files:
-                    src_file = os.path.join(root, file)
-                    rel_file_path = os.path.join(rel_path, file) if rel_path else file
-                    dst_file = os.path.join(dst_dir, file)
-                    
-                    # Não sobrescreve arquivos que devem ser preservados
-                    if not self.should_ignore_file(rel_file_path):
-                        if os.path.exists(dst_file):
-                            os.remove(dst_file)
-                        shutil.copy2(src_file, dst_file)
+            if isinstance(zip_path, RemoteZipFile):
+                print(f"Baixados {zip_path.bytes_downloaded} de {zip_path.size} bytes do pacote")
             
-            # Restaura os arquivos preservados do backup
-            for root, dirs, files in os.walk(backup_dir):
-                rel_path = os.path.relpath(root, backup_dir)
-                if rel_path == ".":
-                    rel_path = ""
-                
-                dst_dir = os.path.join(self.app_directory, rel_path) if rel_path else self.app_directory
-                
-                for file in files:
-                    src_file = os.path.join(root, file)
-                    rel_file_path = os.path.join(rel_path, file) if rel_path else file
-                    
-                    # Se for um arquivo que deve ser preservado, restaura do backup
-                    if self.should_ignore_file(rel_file_path):
-                        dst_file = os.path.join(dst_dir, file)
-                        if os.path.exists(dst_file):
-                            os.remove(dst_file)
-                        shutil.copy2(src_file, dst_file)
-            
-            # Atualiza o arquivo de versão com a nova versão
-            new_version = release['tag_name'].lstrip('v')
-            with open(os.path.join(self.app_directory, "version.json"), "w") as f:
+            # O arquivo de versão é ativado junto com os demais arquivos
+            with open(os.path.join(stage_dir, "version.json"), "w") as f:
                 json.dump({"version": new_version}, f)
+            files = [info.filename for info in changed if info.filename != "version.json"]
+            files.append("version.json")
+            
+            print("Instalando atualização...")
+            self.activate_version(new_version, files)
+            self.prune_versions()
             
             print(f"Atualização para a versão {new_version} instalada com sucesso!")
             
@@ -222,6 +438,86 @@ class AutoUpdater:
             self.cleanup()
             return False
     
+    def get_version_dir(self, version_name):
+        """Retorna o diretório lado a lado de uma versão (versions/<versão>)."""
+        return os.path.join(self.versions_dir, version_name)
+    
+    def activate_version(self, new_version, files):
+        """
+        Ativa os arquivos de uma versão já extraída em versions/<nova versão>.
+        
+        Cada arquivo instalado é trocado por renomeação: o arquivo atual vai para
+        versions/<versão atual> e o novo toma o seu lugar. Nenhum byte é copiado,
+        então o tempo depende só da quantidade de arquivos alterados, nunca do
+        tamanho da biblioteca. A troca é registrada em um journal antes de começar;
+        se for interrompida, recover_interrupted_update desfaz a troca parcial.
+        
+        :param new_version: Versão sendo ativada
+        :param files: Caminhos relativos dos arquivos extraídos para a nova versão
+        """
+        if new_version == self.current_version:
+            raise ValueError(f"A versão {new_version} já está instalada")
+        
+        # O diretório da versão atual recebe os arquivos substituídos (rollback)
+        previous_dir = self.get_version_dir(self.current_version)
+        if os.path.exists(previous_dir):
+            shutil.rmtree(previous_dir)
+        os.makedirs(previous_dir)
+        
+        journal = {
+            "from": self.current_version,
+            "to": new_version,
+            "files": [
+                {"path": path, "existed": os.path.exists(os.path.join(self.app_directory, path))}
+                for path in files
+            ]
+        }
+        write_json_atomic(self.journal_path, journal)
+        
+        try:
+            swap_version_files(self.app_directory, journal, forward=True)
+        except Exception:
+            print("Falha ao ativar a nova versão. Restaurando a versão anterior...")
+            swap_version_files(self.app_directory, journal, forward=False)
+            os.remove(self.journal_path)
+            raise
+        
+        # Ponto de confirmação: a partir daqui a nova versão é a ativa
+        write_json_atomic(self.state_path, journal)
+        os.remove(self.journal_path)
+        self.current_version = new_version
+    
+    def rollback(self):
+        """
+        Desfaz a última atualização, reativando a versão anterior.
+        
+        :return: True se a versão anterior foi restaurada, False caso contrário
+        """
+        state = read_json(self.state_path)
+        if not state:
+            print("Nenhuma atualização para desfazer.")
+            return False
+        
+        try:
+            swap_version_files(self.app_directory, state, forward=False)
+        except OSError as e:
+            print(f"Erro ao restaurar a versão anterior: {e}")
+            return False
+        
+        os.remove(self.state_path)
+        self.current_version = state["from"]
+        print(f"Versão {state['from']} restaurada.")
+        return True
+    
+    def prune_versions(self):
+        """Remove diretórios de versões antigas, mantendo apenas a atual e a anterior."""
+        state = read_json(self.state_path) or {}
+        keep = {state.get("from"), state.get("to"), self.current_version}
+        for entry in os.listdir(self.versions_dir):
+            path = os.path.join(self.versions_dir, entry)
+            if os.path.isdir(path) and entry not in keep:
+                shutil.rmtree(path, ignore_errors=True)
+    
     def cleanup(self):
         """Remove os arquivos temporários de atualização."""
         try:
@@ -236,8 +532,12 @@ class AutoUpdater:
         if not release:
             return False
         
-        zip_path = self.download_update(release)
-        if not zip_path:
+        zip_source = self.open_update_source(release)
+        if not zip_source:
             return False
         
-        return self.install_update(zip_path)
+        try:
+            return self.install_update(zip_source)
+        finally:
+            if isinstance(zip_source, RemoteZipFile):
+                zip_source.close()
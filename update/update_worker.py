@@ -0,0 +1,32 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+
+
+class UpdateCheckThread(QThread):
+    """Thread para verificar atualizações sem bloquear a interface."""
+    update_available = pyqtSignal(dict)
+
+    def __init__(self, updater, parent=None):
+        super().__init__(parent)
+        self.updater = updater
+
+    def run(self):
+        release = self.updater.check_for_updates()
+        if release:
+            self.update_available.emit(release)
+
+
+class UpdateInstallThread(QThread):
+    """Thread para baixar e instalar uma atualização em segundo plano."""
+    install_finished = pyqtSignal(bool)
+
+    def __init__(self, updater, release, parent=None):
+        super().__init__(parent)
+        self.updater = updater
+        self.release = release
+
+    def run(self):
+        zip_source = self.updater.open_update_source(self.release)
+        installed = bool(zip_source) and self.updater.install_update(zip_source)
+        if hasattr(zip_source, "close"):
+            zip_source.close()
+        self.install_finished.emit(installed)
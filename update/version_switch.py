@@ -0,0 +1,87 @@
+import os
+import json
+
+# Troca de versões lado a lado usada pelo AutoUpdater. Fica separado de
+# auto_updater para que a recuperação de uma atualização interrompida rode
+# na inicialização sem importar requests/packaging.
+
+# Diretório com as versões lado a lado e arquivos de controle da troca
+VERSIONS_DIR_NAME = "versions"
+JOURNAL_NAME = "pending.json"
+STATE_NAME = "current.json"
+
+
+def read_json(path):
+    """Lê um arquivo JSON, retornando None se não existir ou estiver corrompido."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def write_json_atomic(path, data):
+    """Grava um arquivo JSON de forma atômica (arquivo temporário + os.replace)."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def swap_version_files(app_directory, journal, forward=True):
+    """
+    Troca os arquivos entre a instalação e os diretórios de versão.
+    
+    Cada passo verifica onde o arquivo está antes de movê-lo, então a função
+    pode ser repetida com segurança sobre uma troca interrompida no meio.
+    
+    :param app_directory: Diretório da aplicação
+    :param journal: Registro da troca (versões de origem/destino e arquivos)
+    :param forward: True para ativar a versão nova, False para voltar à anterior
+    """
+    versions_dir = os.path.join(app_directory, VERSIONS_DIR_NAME)
+    new_dir = os.path.join(versions_dir, journal["to"])
+    old_dir = os.path.join(versions_dir, journal["from"])
+    
+    for entry in journal["files"]:
+        installed = os.path.join(app_directory, entry["path"])
+        new_file = os.path.join(new_dir, entry["path"])
+        old_file = os.path.join(old_dir, entry["path"])
+        
+        if forward:
+            if entry["existed"] and os.path.exists(installed) and not os.path.exists(old_file):
+                os.makedirs(os.path.dirname(old_file), exist_ok=True)
+                os.replace(installed, old_file)
+            if os.path.exists(new_file):
+                os.makedirs(os.path.dirname(installed), exist_ok=True)
+                os.replace(new_file, installed)
+        else:
+            if os.path.exists(installed) and not os.path.exists(new_file):
+                os.makedirs(os.path.dirname(new_file), exist_ok=True)
+                os.replace(installed, new_file)
+            if entry["existed"] and os.path.exists(old_file) and not os.path.exists(installed):
+                os.makedirs(os.path.dirname(installed), exist_ok=True)
+                os.replace(old_file, installed)
+
+
+def recover_interrupted_update(app_directory=None):
+    """
+    Desfaz uma atualização interrompida no meio da ativação.
+    
+    Deve ser chamada na inicialização, antes de importar os módulos da interface,
+    para que uma queda durante a troca nunca deixe uma instalação com versões misturadas.
+    
+    :return: True se uma atualização interrompida foi desfeita
+    """
+    app_directory = app_directory or os.getcwd()
+    journal_path = os.path.join(app_directory, VERSIONS_DIR_NAME, JOURNAL_NAME)
+    journal = read_json(journal_path)
+    if not journal:
+        return False
+    
+    print(f"Atualização para {journal['to']} foi interrompida. Restaurando a versão {journal['from']}...")
+    swap_version_files(app_directory, journal, forward=False)
+    os.remove(journal_path)
+    return True